@@ -21,11 +21,10 @@ Paper: https://doi.org/10.3389/fninf.2018.00014
 from __future__ import annotations
 import copy
 
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from pyneuromatic.core.nm_data import NMData
+import numpy
 
+import pyneuromatic.core.nm_history as nmh
+from pyneuromatic.core.nm_data_list import NMDataList
 from pyneuromatic.core.nm_object import NMObject
 from pyneuromatic.core.nm_object_container import NMObjectContainer
 from pyneuromatic.core.nm_scale import NMScaleX, NMScaleY, _xscale_from_dict, _yscale_from_dict
@@ -63,6 +62,12 @@ class NMChannel(NMObject):
 
     Stores channel-level x/y scale metadata as simple dicts
     and a list of NMData references belonging to this channel.
+
+    Optionally, the epoch arrays of a channel can be packed into one
+    contiguous 2-D matrix of shape (n_epochs, n_points) via matrix_build().
+    Each NMData.nparray then becomes a zero-copy row view of the matrix,
+    so cross-epoch operations (averages, baselines, stats) can run as
+    single vectorised calls on channel.matrix.
     """
 
     # Extend NMObject's special attrs with NMChannel's own
@@ -70,6 +75,7 @@ class NMChannel(NMObject):
         "_NMChannel__thedata",
         "_NMChannel__xscale",
         "_NMChannel__yscale",
+        "_NMChannel__matrix",
     })
 
     def __init__(
@@ -81,9 +87,10 @@ class NMChannel(NMObject):
     ) -> None:
         super().__init__(parent=parent, name=name)
 
-        self.__thedata: list[NMData] = []  # list of NMData refs for this channel
+        self.__thedata: NMDataList = NMDataList()  # list of NMData refs for this channel
         self.__xscale: NMScaleX = _xscale_from_dict(xscale, parent=self)
         self.__yscale: NMScaleY = _yscale_from_dict(yscale, parent=self)
+        self.__matrix: numpy.ndarray | None = None  # see matrix_build()
 
     # override
     def __eq__(self, other: object) -> bool:
@@ -130,11 +137,14 @@ class NMChannel(NMObject):
         result._NMChannel__yscale = copy.deepcopy(self._NMChannel__yscale, memo)
         result._NMChannel__yscale._parent = result
 
+        # __matrix: copied NMData own their arrays, so no shared matrix
+        result._NMChannel__matrix = None
+
         # __thedata: copy list of references
         # If copying within a folder context, try to resolve to copied NMData
         if result._folder is not None:
             from pyneuromatic.core.nm_data import NMData
-            result._NMChannel__thedata = []
+            result._NMChannel__thedata = NMDataList()
             data_container = result._folder.data
             for d in self._NMChannel__thedata:
                 # Check if this NMData was already copied (in memo)
@@ -147,7 +157,7 @@ class NMChannel(NMObject):
                         result._NMChannel__thedata.append(o)
         else:
             # Direct copy: just copy the list of references
-            result._NMChannel__thedata = list(self._NMChannel__thedata)
+            result._NMChannel__thedata = NMDataList(self._NMChannel__thedata)
 
         return result
 
@@ -160,7 +170,7 @@ class NMChannel(NMObject):
         return k
 
     @property
-    def data(self) -> list[NMData]:
+    def data(self) -> NMDataList:
         return self.__thedata
 
     @property
@@ -171,6 +181,109 @@ class NMChannel(NMObject):
     def yscale(self) -> NMScaleY:
         return self.__yscale
 
+    @property
+    def matrix(self) -> numpy.ndarray | None:
+        """Contiguous (n_epochs, n_points) array of this channel's data.
+
+        Row i is shared with data[i].nparray, so in-place changes through
+        either are seen by both. Returns None if matrix_build() has not
+        been called, or if the channel's data list or any of its arrays
+        has since been replaced (the matrix is then released).
+        """
+        if self.__matrix is None:
+            return None
+        if not self.__matrix_ok():
+            self.__matrix = None
+            return None
+        return self.__matrix
+
+    def __matrix_ok(self) -> bool:
+        m = self.__matrix
+        if m is None or len(self.__thedata) != m.shape[0]:
+            return False
+        ptr = m.ctypes.data
+        for i, d in enumerate(self.__thedata):
+            if not d.nparray_loaded:
+                return False
+            a = d.nparray
+            if (
+                a is None
+                or a.base is not m
+                or a.shape != m.shape[1:]
+                or a.ctypes.data != ptr + i * m.strides[0]
+            ):
+                return False
+        return True
+
+    def matrix_build(
+        self,
+        dtype: numpy.dtype | type | None = None,
+        quiet: bool = nmc.QUIET,
+    ) -> numpy.ndarray:
+        """Pack this channel's epoch arrays into one contiguous matrix.
+
+        Copies each data[i].nparray into row i of a new C-contiguous
+        (n_epochs, n_points) array, then replaces each nparray with a
+        view of its row. Calling again when the matrix is still valid
+        returns it without copying.
+
+        Args:
+            dtype: Matrix dtype. If None, the common dtype of the arrays.
+            quiet: If True, suppress history output.
+
+        Returns:
+            The channel matrix.
+
+        Raises:
+            ValueError: If the channel has no data, an NMData has no
+                array, or arrays are not 1-D with equal length.
+        """
+        m = self.matrix
+        if m is not None and (dtype is None or m.dtype == numpy.dtype(dtype)):
+            return m
+        if not self.__thedata:
+            raise ValueError("channel '%s' has no data" % self.name)
+        arrays = []
+        for d in self.__thedata:
+            a = d.nparray
+            if not isinstance(a, numpy.ndarray):
+                raise ValueError("data '%s' has no nparray" % d.name)
+            if a.ndim != 1:
+                raise ValueError(
+                    "data '%s' nparray must be 1-D, got %d-D" % (d.name, a.ndim)
+                )
+            arrays.append(a)
+        n_points = len(arrays[0])
+        for d, a in zip(self.__thedata, arrays):
+            if len(a) != n_points:
+                raise ValueError(
+                    "data '%s' has %d points, expected %d"
+                    % (d.name, len(a), n_points)
+                )
+        if dtype is None:
+            dtype = numpy.result_type(*arrays)
+        m = numpy.empty((len(arrays), n_points), dtype=dtype)
+        for i, a in enumerate(arrays):
+            m[i] = a
+        for i, d in enumerate(self.__thedata):
+            d.nparray = m[i]
+        self.__matrix = m
+        nmh.history(
+            "built %d x %d matrix" % m.shape, path=self.path_str, quiet=quiet
+        )
+        return m
+
+    def matrix_release(self, quiet: bool = nmc.QUIET) -> None:
+        """Give each NMData its own copy of its row and drop the matrix."""
+        m = self.matrix
+        self.__matrix = None
+        if m is None:
+            return None
+        for i, d in enumerate(self.__thedata):
+            d.nparray = m[i].copy()
+        nmh.history("released matrix", path=self.path_str, quiet=quiet)
+        return None
+
 
 class NMChannelContainer(NMObjectContainer):
     """
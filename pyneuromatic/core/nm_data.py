@@ -21,6 +21,8 @@ Paper: https://doi.org/10.3389/fninf.2018.00014
 from __future__ import annotations
 import copy
 import math
+import weakref
+from collections.abc import Callable
 import numpy
 
 from pyneuromatic.core.nm_channel import NMChannel
@@ -38,6 +40,10 @@ NP_ORDER = "C"
 NP_DTYPE = numpy.float64
 NP_FILL_VALUE = numpy.nan
 
+# decoded raw arrays kept alive between accesses (see _decoded_keep)
+_DECODED_KEEP = 4
+_decoded_recent: list[numpy.ndarray] = []
+
 """
 NM class tree:
 
@@ -61,11 +67,33 @@ class NMData(NMObject):
 
     Holds a numpy array of data (yvalues), optional x-array,
     and x/y scale metadata as simple dicts.
+
+    The y-array can be deferred: a loader callable (see
+    _nparray_loader_set()) is called on first access of nparray, e.g. to
+    memory-map a dataset from an HDF5 file only when it is analysed.
+
+    Copies share read-only buffers: a copy of an NMData whose y-array or
+    x-array cannot be written (e.g. a read-only memory map, or the array
+    of another copy) holds a read-only view of the same buffer
+    (nparray_shared is True). Writeable buffers are copied, so in-place
+    changes to the original are never seen by the copy. Assigning a new
+    array (as the main ops do) replaces the view without copying;
+    nparray_own() makes a private, writeable copy for in-place changes.
+
+    The y-array can also be held compactly as raw samples (e.g. int16 ADC
+    values or float32, see nparray_raw_set()) with yscale.scale and
+    yscale.offset. nparray then decodes the raw buffer to float64
+    (raw * scale + offset) on access, as a read-only array kept only
+    while in use or among the few most recently decoded.
     """
 
     # Extend NMObject's special attrs with NMData's own
     _DEEPCOPY_SPECIAL_ATTRS: frozenset[str] = NMObject._DEEPCOPY_SPECIAL_ATTRS | frozenset({
         "_NMData__nparray",
+        "_NMData__nparray_loader",
+        "_NMData__nparray_shared",
+        "_NMData__nparray_raw",
+        "_NMData__nparray_decoded",
         "_NMData__xarray",
         "_NMData__xscale",
         "_NMData__yscale",
@@ -95,6 +123,11 @@ class NMData(NMObject):
                 e = nmu.type_error_str(nparray, "nparray", "numpy.ndarray")
                 raise TypeError(e)
         self.__nparray = nparray
+        self.__nparray_loader: Callable[[], numpy.ndarray] | None = None
+        self.__nparray_shared = False  # read-only view, see nparray_own()
+        self.__nparray_raw: numpy.ndarray | None = None
+        # weakref cache of decoded raw: (scale, offset, ref)
+        self.__nparray_decoded: tuple | None = None
 
         # Optional explicit x-data array
         if xarray is not None:
@@ -102,6 +135,7 @@ class NMData(NMObject):
                 e = nmu.type_error_str(xarray, "xarray", "numpy.ndarray")
                 raise TypeError(e)
         self.__xarray = xarray
+        self.__xarray_monotonic: bool | None = None  # see get_xindex()
 
         # X-scale and Y-scale
         self.__xscale: NMScaleX = _xscale_from_dict(xscale, parent=self)
@@ -125,7 +159,7 @@ class NMData(NMObject):
             return False
         if self.yscale != other.yscale:
             return False
-        if not _eq_arrays(self.__nparray, other.nparray):
+        if not _eq_arrays(self.nparray, other.nparray):
             return False
         if not _eq_arrays(self.__xarray, other.xarray):
             return False
@@ -169,17 +203,13 @@ class NMData(NMObject):
         result._NMData__yscale = copy.deepcopy(self._NMData__yscale, memo)
         result._NMData__yscale._parent = result
 
-        # __nparray: deep copy numpy array (if present)
-        if self._NMData__nparray is not None:
-            result._NMData__nparray = self._NMData__nparray.copy()
-        else:
-            result._NMData__nparray = None
+        # __nparray, __nparray_loader, __nparray_raw: shared if read-only
+        # (a pending loader is shared, so the copy loads its own array)
+        self._nparray_copy_to(result)
+        result._NMData__nparray_decoded = None
 
-        # __xarray: deep copy numpy array (if present)
-        if self._NMData__xarray is not None:
-            result._NMData__xarray = self._NMData__xarray.copy()
-        else:
-            result._NMData__xarray = None
+        # __xarray: shared if read-only (replaced, not written, on change)
+        result._NMData__xarray = _share_or_copy(self._NMData__xarray)
 
         # __dataseries_channel and __dataseries_epoch: copy references
         # If copying within a folder context, try to resolve to copied objects
@@ -218,6 +248,12 @@ class NMData(NMObject):
             k.update({"nparray": self.__nparray.dtype})
         else:
             k.update({"nparray": None})
+        k.update({"nparray loaded": self.nparray_loaded})
+        if isinstance(self.__nparray_raw, numpy.ndarray):
+            k.update({"nparray raw": self.__nparray_raw.dtype})
+        else:
+            k.update({"nparray raw": None})
+        k.update({"nparray shared": self.__nparray_shared})
         ds = self._dataseries
         if isinstance(ds, NMDataSeries):
             k.update({"dataseries": ds.name})
@@ -244,6 +280,10 @@ class NMData(NMObject):
 
     @property
     def nparray(self) -> numpy.ndarray | None:
+        if self.__nparray_raw is not None:
+            return self._nparray_decode()
+        if self.__nparray_loader is not None:
+            self._nparray_load()
         return self.__nparray
 
     @nparray.setter
@@ -253,6 +293,178 @@ class NMData(NMObject):
                 e = nmu.type_error_str(nparray, "nparray", "numpy.ndarray")
                 raise TypeError(e)
         self.__nparray = nparray
+        self.__nparray_loader = None  # explicit array replaces loader
+        self.__nparray_shared = False
+        self.__nparray_raw = None  # and raw samples
+        self.__nparray_decoded = None
+
+    @property
+    def nparray_shared(self) -> bool:
+        """True if nparray is a read-only view shared with another NMData."""
+        return self.__nparray_shared
+
+    def nparray_own(self) -> numpy.ndarray | None:
+        """Return nparray as a private, writeable array.
+
+        If nparray is shared with another NMData, or is otherwise
+        read-only (e.g. a memory-mapped file), it is first replaced with a
+        writeable copy. Use before changing nparray in place:
+
+            >>> d.nparray_own()[:10] = 0
+        """
+        nparray = self.nparray
+        if nparray is None:
+            return None
+        if self.__nparray_raw is not None:
+            self.__nparray = numpy.array(nparray)
+            self.__nparray_shared = False
+            self.__nparray_raw = None
+            self.__nparray_decoded = None
+            return self.__nparray
+        if self.__nparray_shared or not nparray.flags.writeable:
+            self.__nparray = numpy.array(nparray)
+            self.__nparray_shared = False
+        return self.__nparray
+
+    def _nparray_copy_to(self, other: NMData) -> None:
+        """Copy this NMData's nparray to other, sharing read-only buffers.
+
+        A read-only buffer (see _share_or_copy) is not copied: other holds
+        a read-only view of it (other.nparray_shared is True) until
+        assigned a new array or nparray_own() is called. A writeable
+        buffer is copied now, so this NMData's array stays writeable and
+        in-place changes to it (e.g. through a channel matrix) are not
+        seen by other. Raw samples are shared or copied the same way
+        (other decodes with its own yscale scale and offset).
+        """
+        other._NMData__nparray_decoded = None
+        if self.__nparray_raw is not None:
+            other._NMData__nparray_raw = _share_or_copy(self.__nparray_raw)
+            other._NMData__nparray = None
+            other._NMData__nparray_loader = None
+            other._NMData__nparray_shared = False
+            return None
+        other._NMData__nparray_raw = None
+        if self.__nparray_loader is not None:
+            other._NMData__nparray = None
+            other._NMData__nparray_loader = self.__nparray_loader
+            other._NMData__nparray_shared = False
+            return None
+        other._NMData__nparray_loader = None
+        if self.__nparray is None:
+            other._NMData__nparray = None
+            other._NMData__nparray_shared = False
+            return None
+        other._NMData__nparray = _share_or_copy(self.__nparray)
+        other._NMData__nparray_shared = not _writeable(self.__nparray)
+        return None
+
+    @property
+    def nparray_loaded(self) -> bool:
+        """False if nparray is deferred to a loader not yet called."""
+        return self.__nparray_loader is None
+
+    def _nparray_loader_set(
+        self,
+        loader: Callable[[], numpy.ndarray] | None,
+    ) -> None:
+        """Defer nparray to a loader called on first access.
+
+        Args:
+            loader: Callable with no arguments returning a numpy.ndarray
+                (e.g. a read-only numpy.memmap), or None to remove a
+                pending loader.
+        """
+        if loader is not None and not callable(loader):
+            e = nmu.type_error_str(loader, "loader", "callable")
+            raise TypeError(e)
+        if loader is not None:
+            self.__nparray = None
+            self.__nparray_shared = False
+            self.__nparray_raw = None
+            self.__nparray_decoded = None
+        self.__nparray_loader = loader
+
+    def _nparray_load(self) -> None:
+        loader = self.__nparray_loader
+        if loader is None:
+            return
+        nparray = loader()
+        if not isinstance(nparray, numpy.ndarray):
+            e = nmu.type_error_str(nparray, "loader nparray", "numpy.ndarray")
+            raise TypeError(e)
+        self.__nparray = nparray
+        self.__nparray_loader = None
+
+    @property
+    def nparray_raw(self) -> numpy.ndarray | None:
+        """Raw samples decoded by nparray, or None if not compact."""
+        return self.__nparray_raw
+
+    def nparray_raw_set(
+        self,
+        raw: numpy.ndarray,
+        scale: float | int | None = None,
+        offset: float | int | None = None,
+        quiet: bool = nmc.QUIET,
+    ) -> None:
+        """Hold the y-array compactly as raw samples.
+
+        nparray returns raw * yscale.scale + yscale.offset as float64,
+        decoded on access. The decoded array is read-only and is freed
+        once no longer referenced and no longer among the few most
+        recently decoded arrays (so repeated access within an analysis
+        decodes once), leaving only the raw buffer in memory (e.g. a
+        quarter of the float64 size for int16 samples). Assigning
+        nparray, or calling nparray_own(), replaces the raw buffer.
+
+        Args:
+            raw: Integer or floating-point numpy.ndarray (e.g. int16 ADC
+                samples, float32).
+            scale: If given, set yscale.scale.
+            offset: If given, set yscale.offset.
+        """
+        if not isinstance(raw, numpy.ndarray):
+            e = nmu.type_error_str(raw, "raw", "numpy.ndarray")
+            raise TypeError(e)
+        if raw.dtype.kind not in "iuf":
+            raise ValueError("raw dtype: %s" % raw.dtype)
+        if scale is not None:
+            self.__yscale._set_scale(scale, quiet=quiet)
+        if offset is not None:
+            self.__yscale._set_offset(offset, quiet=quiet)
+        self.__nparray = None
+        self.__nparray_loader = None
+        self.__nparray_shared = False
+        self.__nparray_raw = raw
+        self.__nparray_decoded = None
+
+    def _nparray_decode(self) -> numpy.ndarray:
+        scale = self.__yscale.scale
+        offset = self.__yscale.offset
+        if self.__nparray_decoded is not None:
+            dscale, doffset, ref = self.__nparray_decoded
+            if dscale == scale and doffset == offset:
+                nparray = ref()
+                if nparray is not None:
+                    _decoded_keep(nparray)
+                    return nparray
+        nparray = self.__nparray_raw.astype(numpy.float64)
+        if scale != 1:
+            nparray *= scale
+        if offset != 0:
+            nparray += offset
+        nparray.flags.writeable = False
+        self.__nparray_decoded = (scale, offset, weakref.ref(nparray))
+        _decoded_keep(nparray)
+        return nparray
+
+    def _nparray_size(self) -> int | None:
+        """Number of points of nparray, without decoding raw samples."""
+        if self.__nparray_raw is not None:
+            return self.__nparray_raw.size
+        nparray = self.nparray
+        return nparray.size if nparray is not None else None
 
     @property
     def xarray(self) -> numpy.ndarray | None:
@@ -265,6 +477,17 @@ class NMData(NMObject):
                 e = nmu.type_error_str(xarray, "xarray", "numpy.ndarray")
                 raise TypeError(e)
         self.__xarray = xarray
+        self.__xarray_monotonic = None
+
+    def _xarray_monotonic(self) -> bool:
+        """True if xarray is non-decreasing (cached until xarray is set)."""
+        if self.__xarray_monotonic is None:
+            x = self.__xarray
+            self.__xarray_monotonic = bool(
+                x is not None and x.dtype.kind in "iuf"
+                and numpy.all(x[1:] >= x[:-1])
+            )
+        return self.__xarray_monotonic
 
     # =========================================================================
     # Scale properties (delegate to channel when dataseries-linked)
@@ -288,19 +511,35 @@ class NMData(NMObject):
 
     def get_xindex(
         self,
-        xvalue: float,
+        xvalue: float | numpy.ndarray | list | tuple,
         clip: bool = False
-    ) -> int | None:
-        """Convert an xvalue to an array index.
+    ) -> int | numpy.ndarray | None:
+        """Convert an xvalue, or an array of xvalues, to an array index.
+
+        With an xarray, the index is the first point where
+        xarray >= xvalue, found by binary search if xarray is
+        non-decreasing (checked once and cached until xarray is set;
+        replace xarray rather than changing it in place).
 
         Args:
-            xvalue: The x-axis value to find.
-            clip: If True, clip out-of-bounds values to array limits.
+            xvalue: The x-axis value to find, or a sequence/array of them.
+            clip: If True, clip out-of-bounds values to array limits
+                (start/delta x-scale only).
 
         Returns:
-            The corresponding array index, or None if not found.
+            The corresponding array index, or None if not found. For a
+            sequence/array of xvalues, an integer array of indexes with
+            -1 where not found.
         """
-        if not (isinstance(xvalue, (float, int)) and not isinstance(xvalue, bool)):
+        if isinstance(xvalue, (numpy.ndarray, list, tuple)):
+            xv = numpy.asarray(xvalue)
+            if xv.dtype.kind not in "iuf":
+                e = nmu.type_error_str(xvalue, "xvalue", "float array")
+                raise TypeError(e)
+            return self._get_xindexes(xv.astype(numpy.float64), clip)
+
+        if not (isinstance(xvalue, (float, int, numpy.integer))
+                and not isinstance(xvalue, bool)):
             e = nmu.type_error_str(xvalue, "xvalue", "float")
             raise TypeError(e)
 
@@ -310,20 +549,18 @@ class NMData(NMObject):
                     return 0
                 else:
                     return self.__xarray.size - 1
-            indexes = numpy.argwhere(self.__xarray >= xvalue)
-            shape = indexes.shape  # (N, 1)
-            if len(shape) != 2:
+            index = self._get_xindexes(numpy.array([xvalue], dtype=float),
+                                       clip)[0]
+            if index < 0:
                 return None
-            if shape[0] > 0:
-                return indexes[0][0]
-            return None
+            return int(index)
 
         # Use start/delta from xscale
         xscale = self.xscale
         start = xscale.start
         delta = xscale.delta
 
-        points = self.__nparray.size if self.__nparray is not None else None
+        points = self._nparray_size()
         if points is None:
             return None
 
@@ -345,21 +582,67 @@ class NMData(NMObject):
             else:
                 return None
 
+    def _get_xindexes(
+        self,
+        xvalues: numpy.ndarray,
+        clip: bool,
+    ) -> numpy.ndarray:
+        """Vectorised get_xindex(); -1 where not found."""
+        xarray = self.__xarray
+        if isinstance(xarray, numpy.ndarray):
+            n = xarray.size
+            if self._xarray_monotonic():
+                indexes = numpy.searchsorted(xarray, xvalues, side="left")
+            else:
+                # first point >= xvalue, by scan
+                indexes = numpy.full(xvalues.shape, n, dtype=numpy.intp)
+                for j, v in enumerate(xvalues.flat):
+                    found = numpy.flatnonzero(xarray >= v)
+                    if found.size > 0:
+                        indexes.flat[j] = found[0]
+            indexes = numpy.where(indexes >= n, -1, indexes)
+            indexes[numpy.isneginf(xvalues)] = 0
+            indexes[numpy.isposinf(xvalues)] = n - 1
+            return indexes.astype(numpy.intp)
+
+        points = self._nparray_size()
+        if points is None:
+            points = 0
+        xscale = self.xscale
+        with numpy.errstate(invalid="ignore"):
+            f = numpy.round((xvalues - xscale.start) / xscale.delta)
+        f[numpy.isneginf(xvalues)] = 0
+        f[numpy.isposinf(xvalues)] = points - 1
+        nan = numpy.isnan(f)
+        if clip:
+            f = numpy.clip(f, 0, points - 1)
+        else:
+            f[(f < 0) | (f >= points)] = -1
+        f[nan] = -1
+        return f.astype(numpy.intp)
+
     def get_xvalue(
         self,
-        index: int,
+        index: int | numpy.ndarray | list | tuple,
         clip: bool = False
-    ) -> float | None:
-        """Convert an array index to an xvalue.
+    ) -> float | numpy.ndarray | None:
+        """Convert an array index, or an array of indexes, to an xvalue.
 
         Args:
-            index: The array index.
+            index: The array index, or a sequence/array of them.
             clip: If True, clip out-of-bounds indices to array limits.
 
         Returns:
-            The corresponding x-axis value, or None if not computable.
+            The corresponding x-axis value (an array of them for a
+            sequence/array of indexes), or None if not computable.
         """
-        if isinstance(index, int) and not isinstance(index, bool):
+        if isinstance(index, (numpy.ndarray, list, tuple)):
+            i = numpy.asarray(index)
+            if i.dtype.kind not in "iuf":
+                e = nmu.type_error_str(index, "index", "integer array")
+                raise TypeError(e)
+            i = i.astype(numpy.intp)
+        elif isinstance(index, int) and not isinstance(index, bool):
             i = index
         elif isinstance(index, numpy.integer):
             i = int(index)
@@ -369,26 +652,27 @@ class NMData(NMObject):
             e = nmu.type_error_str(index, "index", "integer")
             raise TypeError(e)
 
-        if i < 0:
+        if numpy.any(i < 0):
             if clip:
-                i = 0
+                i = numpy.maximum(i, 0) if isinstance(i, numpy.ndarray) else 0
             else:
                 raise ValueError("negative index: %s" % index)
 
         # Determine points
         if isinstance(self.__xarray, numpy.ndarray):
             points = self.__xarray.size
-        elif self.__nparray is not None:
-            points = self.__nparray.size
         else:
-            points = None
+            points = self._nparray_size()
 
         if points is None:
             return None
 
-        if i >= points:
+        if numpy.any(i >= points):
             if clip:
-                i = points - 1
+                if isinstance(i, numpy.ndarray):
+                    i = numpy.minimum(i, points - 1)
+                else:
+                    i = points - 1
             else:
                 e = "index out of range: %s >= %s" % (index, points)
                 raise ValueError(e)
@@ -478,6 +762,47 @@ def _eq_arrays(a1, a2) -> bool:
     return False
 
 
+def _readonly_view(a: numpy.ndarray) -> numpy.ndarray:
+    """Return a read-only view of a numpy array (no copy)."""
+    v = a.view()
+    v.flags.writeable = False
+    return v
+
+
+def _decoded_keep(a: numpy.ndarray) -> None:
+    """Hold a decoded raw array as the most recently used.
+
+    Only the last _DECODED_KEEP decoded arrays are held, so NMData.nparray
+    of compact data is decoded once per analysis rather than on every
+    access, while memory stays bounded.
+    """
+    for i, r in enumerate(_decoded_recent):
+        if r is a:
+            del _decoded_recent[i]
+            break
+    _decoded_recent.append(a)
+    if len(_decoded_recent) > _DECODED_KEEP:
+        del _decoded_recent[0]
+
+
+def _writeable(a: numpy.ndarray) -> bool:
+    """True if a's buffer can be written through a or any array it views."""
+    while isinstance(a, numpy.ndarray):
+        if a.flags.writeable:
+            return True
+        a = a.base
+    return False
+
+
+def _share_or_copy(a: numpy.ndarray | None) -> numpy.ndarray | None:
+    """Return a read-only view of a if its buffer is read-only, else a copy."""
+    if a is None:
+        return None
+    if _writeable(a):
+        return numpy.array(a)
+    return _readonly_view(a)
+
+
 class NMDataContainer(NMObjectContainer):
     """
     Container of NMData
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+NMDataList module.
+
+Part of pyNeuroMatic, a Python implementation of NeuroMatic for analyzing,
+acquiring and simulating electrophysiology data.
+
+If you use this software in your research, please cite:
+Rothman JS and Silver RA (2018) NeuroMatic: An Integrated Open-Source
+Software Toolkit for Acquisition, Analysis and Simulation of
+Electrophysiological Data. Front. Neuroinform. 12:14.
+doi: 10.3389/fninf.2018.00014
+
+Copyright (c) 2026 The Silver Lab, University College London.
+Licensed under MIT License - see LICENSE file for details.
+
+Original NeuroMatic: https://github.com/SilverLabUCL/NeuroMatic
+Website: https://github.com/SilverLabUCL/pyNeuroMatic
+Paper: https://doi.org/10.3389/fninf.2018.00014
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, SupportsIndex
+
+
+class NMDataList(list):
+    """List of NMData references with an identity index.
+
+    Used for NMChannel.data and NMEpoch.data. Behaves like a list, but
+    keeps a count of its items keyed by id(), so membership tests
+    (``d in channel.data``) are O(1) identity checks rather than a linear
+    scan calling NMData.__eq__ (which compares full arrays). The index is
+    updated by every list method that adds or removes items.
+    """
+
+    def __init__(self, iterable: Iterable = ()) -> None:
+        super().__init__(iterable)
+        self.__ids: dict[int, int] = {}
+        for o in self:
+            self.__link(o)
+
+    def __link(self, o: object) -> None:
+        i = id(o)
+        self.__ids[i] = self.__ids.get(i, 0) + 1
+
+    def __unlink(self, o: object) -> None:
+        i = id(o)
+        n = self.__ids.get(i, 0) - 1
+        if n > 0:
+            self.__ids[i] = n
+        else:
+            self.__ids.pop(i, None)
+
+    def __reindex(self) -> None:
+        self.__ids = {}
+        for o in self:
+            self.__link(o)
+
+    # copy, deepcopy and pickle rebuild the index from the items
+    def __reduce_ex__(self, protocol: SupportsIndex) -> tuple:
+        return (self.__class__, (list(self),))
+
+    def __contains__(self, o: object) -> bool:
+        return id(o) in self.__ids
+
+    def append(self, o: Any) -> None:
+        super().append(o)
+        self.__link(o)
+
+    def extend(self, iterable: Iterable) -> None:
+        items = list(iterable)
+        super().extend(items)
+        for o in items:
+            self.__link(o)
+
+    def __iadd__(self, iterable: Iterable) -> NMDataList:
+        self.extend(iterable)
+        return self
+
+    def __imul__(self, n: SupportsIndex) -> NMDataList:
+        super().__imul__(n)
+        self.__reindex()
+        return self
+
+    def insert(self, index: SupportsIndex, o: Any) -> None:
+        super().insert(index, o)
+        self.__link(o)
+
+    def remove(self, o: Any) -> None:
+        # prefer the identical object; fall back to list equality
+        if id(o) in self.__ids:
+            i = next(i for i, item in enumerate(self) if item is o)
+        else:
+            i = self.index(o)  # raises ValueError if not found
+        del self[i]
+        return None
+
+    def pop(self, index: SupportsIndex = -1) -> Any:
+        o = super().pop(index)
+        self.__unlink(o)
+        return o
+
+    def clear(self) -> None:
+        super().clear()
+        self.__ids = {}
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self.__reindex()
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice):
+            super().__delitem__(index)
+            self.__reindex()
+            return None
+        o = self[index]
+        super().__delitem__(index)
+        self.__unlink(o)
+        return None
@@ -201,7 +201,7 @@ class NMDataSeries(NMObject):
 
         dlist: list = []
         for d in e.data:
-            if d in c.data:
+            if d in c.data:  # identity lookup, see NMDataList
                 if get_keys:
                     dlist.append(d.name)
                 else:
@@ -271,8 +271,14 @@ class NMDataSeries(NMObject):
         if e is None:
             return None
 
-        for d in c.data:
-            if d in e.data:
+        # scan the shorter list; membership in the other is an O(1)
+        # identity lookup (see NMDataList)
+        if len(e.data) <= len(c.data):
+            short, other = e.data, c.data
+        else:
+            short, other = c.data, e.data
+        for d in short:
+            if d in other:
                 return d
         return None
 
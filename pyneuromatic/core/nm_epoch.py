@@ -24,9 +24,9 @@ import copy
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from pyneuromatic.core.nm_data import NMData
     from pyneuromatic.core.nm_folder import NMFolder
 
+from pyneuromatic.core.nm_data_list import NMDataList
 from pyneuromatic.core.nm_object import NMObject
 from pyneuromatic.core.nm_object_container import NMObjectContainer
 from pyneuromatic.core.nm_group import NMGroups
@@ -76,7 +76,7 @@ class NMEpoch(NMObject):
     ) -> None:
         super().__init__(parent=parent, name=name)
 
-        self.__thedata: list[NMData] = []  # list of NMData references
+        self.__thedata: NMDataList = NMDataList()  # list of NMData references
 
         if not isinstance(number, int):
             e = nmu.type_error_str(number, "number", "int")
@@ -138,7 +138,7 @@ class NMEpoch(NMObject):
         if result._folder is not None:
             from pyneuromatic.core.nm_data import NMData
 
-            result._NMEpoch__thedata = []
+            result._NMEpoch__thedata = NMDataList()
             data_container = result._folder.data
             for d in self._NMEpoch__thedata:
                 # Check if this NMData was already copied (in memo)
@@ -151,7 +151,7 @@ class NMEpoch(NMObject):
                         result._NMEpoch__thedata.append(o)
         else:
             # Direct copy: just copy the list of references
-            result._NMEpoch__thedata = list(self._NMEpoch__thedata)
+            result._NMEpoch__thedata = NMDataList(self._NMEpoch__thedata)
 
         return result
 
@@ -172,7 +172,7 @@ class NMEpoch(NMObject):
     #     return k
 
     @property
-    def data(self) -> list[NMData]:
+    def data(self) -> NMDataList:
         return self.__thedata
 
 
@@ -23,7 +23,6 @@ import copy
 import dataclasses
 import datetime
 from typing import Any
-import h5py
 
 from pyneuromatic.core.nm_data import NMData, NMDataContainer
 from pyneuromatic.core.nm_dataseries import NMDataSeries, NMDataSeriesContainer
@@ -273,6 +272,35 @@ class NMFolder(NMObject):
         """Return notes for this folder."""
         return self.__notes
 
+    # override
+    def save(
+        self,
+        path: str = "",
+        compression: str | None = None,
+        quiet: bool = nmc.QUIET,
+    ) -> str:
+        """Save this folder to a native pyNeuroMatic HDF5 file.
+
+        See :func:`pyneuromatic.io.hdf5.write_hdf5`.
+
+        Args:
+            path: Output file path. If empty, uses '<folder name>.h5'.
+            compression: h5py compression filter (e.g. "gzip"), or None.
+            quiet: If True, suppress history output.
+
+        Returns:
+            Path to the saved file as string.
+        """
+        from pyneuromatic.io.hdf5 import write_hdf5
+
+        if not isinstance(path, str):
+            raise TypeError(nmu.type_error_str(path, "path", "string"))
+        if not path:
+            path = self.name + ".h5"
+        filepath = write_hdf5(self, path, compression=compression)
+        nmh.history("saved to '%s'" % filepath, path=self.path_str, quiet=quiet)
+        return str(filepath)
+
     # Metadata - structured key-value data from imported files
 
     @property
@@ -896,11 +924,9 @@ class NMFolder(NMObject):
             for ep_num in ep_nums:
                 name = make_data_name(new_prefix, ch_idx, ep_num)
                 src_data = src_lookup.get((ch_name, ep_num))
-                arr = (
-                    src_data.nparray.copy()
-                    if src_data is not None and src_data.nparray is not None
-                    else np.array([])
-                )
+                # copy the source array, sharing it if read-only
+                # (see NMData._nparray_copy_to)
+                arr = np.array([])
                 # Read xscale/yscale from the source NMData object; the
                 # channel xscale is a separate object not propagated by
                 # build_dataseries
@@ -914,6 +940,8 @@ class NMFolder(NMObject):
                     quiet=True,
                 )
                 if new_data is not None:
+                    if src_data is not None:
+                        src_data._nparray_copy_to(new_data)
                     new_matches[(new_ch_char, ep_num)] = new_data
 
         ds = target.build_dataseries(new_prefix, new_matches, quiet=True)
@@ -1129,31 +1157,167 @@ class NMFolderContainer(NMObjectContainer):
             return f
         return None
 
-    def open_hdf5(self):
-        dataseries = "Record"
-        with h5py.File("nmFolder0.hdf5", "r") as f:
-            # print(f.keys())
-            data = []
-            for k in f.keys():
-                if k[0 : len(dataseries)] == dataseries:
-                    print(k)
-            # for name in f:
-            # print(name)
-            d = f["RecordA0"]
-
-            for i in d.attrs.keys():
-                print(i)
-            # cannot get access to attribute values for keys:
-            # probably need to update h5py to v 2.10
-            # IGORWaveNote
-            # IGORWaveType
-            # print(d.attrs.__getitem__('IGORWaveNote'))
-            # for a in d.attrs:
-            # print(item + ":", d.attrs[item])
-            # print(item + ":", d.attrs.get(item))
-            # print(a.shape)
-            # for k in a.keys():
-            # print(k)
-            # print(a)
-            # pf = f['NMPrefix_Record']
-            # print(pf)
+    def open_hdf5(
+        self,
+        filepath: str,
+        name: str | None = None,
+        prefix: str = "Record",
+        lazy: bool = True,
+        select: bool = False,
+        quiet: bool = nmc.QUIET,
+    ) -> NMFolder | None:
+        """Open an HDF5 file as a new folder.
+
+        Each 1-D numeric dataset becomes an NMData. With lazy=True, arrays
+        are memory-mapped from the file on first access, so large files can
+        be opened without loading them into memory.
+        See :func:`pyneuromatic.io.hdf5.read_hdf5`.
+
+        Args:
+            filepath: Path to the HDF5 file.
+            name: Folder name. If None, uses the next auto-generated name.
+            prefix: Dataseries prefix (default "Record").
+            lazy: If True, defer reading arrays until first access.
+            select: Whether to select the new folder.
+            quiet: If True, suppress history output.
+
+        Returns:
+            The new NMFolder, or None on failure.
+        """
+        from pyneuromatic.io.hdf5 import read_hdf5
+
+        f = self.new(name=name, select=select, quiet=quiet)
+        if f is None:
+            return None
+        read_hdf5(filepath, folder=f, prefix=prefix, lazy=lazy)
+        nmh.history(
+            "opened HDF5 file '%s' as '%s'" % (filepath, f.name),
+            path=self.path_str,
+            quiet=quiet,
+        )
+        return f
+
+    def load_hdf5(
+        self,
+        filepath: str,
+        folders: list[str] | None = None,
+        dataseries: list[str] | None = None,
+        toolfolders: list[str] | None = None,
+        toolresults: bool | list[str] = True,
+        lazy: bool = True,
+        select: bool = False,
+        quiet: bool = nmc.QUIET,
+    ) -> list[NMFolder]:
+        """Load folders from a native pyNeuroMatic HDF5 file.
+
+        Folders whose names already exist are renamed to the next free
+        name. Loads can be partial; see
+        :func:`pyneuromatic.io.hdf5.read_hdf5_folders`.
+
+        Args:
+            filepath: Path to the HDF5 file.
+            folders: Names of folders to load, or None for all.
+            dataseries: Names of dataseries to load, or None for all.
+            toolfolders: Names of toolfolders to load, or None for all.
+            toolresults: True for all, False for none, or list of tools.
+            lazy: If True, defer reading arrays until first access.
+            select: Whether to select the first loaded folder.
+            quiet: If True, suppress history output.
+
+        Returns:
+            List of loaded NMFolders.
+        """
+        from pyneuromatic.io.hdf5 import read_hdf5_folders
+
+        flist = read_hdf5_folders(
+            filepath,
+            folders=folders,
+            dataseries=dataseries,
+            toolfolders=toolfolders,
+            toolresults=toolresults,
+            lazy=lazy,
+        )
+        loaded = []
+        for f in flist:
+            if f.name in self:
+                f._name_set(self._newkey(None), quiet=True)
+            if self._add(f, select=select and not loaded, quiet=quiet):
+                loaded.append(f)
+        nmh.history(
+            "loaded %d folder(s) from '%s'" % (len(loaded), filepath),
+            path=self.path_str,
+            quiet=quiet,
+        )
+        return loaded
+
+    def read_many(
+        self,
+        paths,
+        workers: int | None = None,
+        select: bool = False,
+        quiet: bool = nmc.QUIET,
+        **kwargs,
+    ) -> list[NMFolder]:
+        """Read many recording files in parallel, one new folder per file.
+
+        Folders are added in the order of paths. Folders whose names
+        already exist are renamed to the next free name.
+        See :func:`pyneuromatic.io.batch.read_many`.
+
+        Args:
+            paths: File paths, or a directory of recording files.
+            workers: Number of worker processes (None for os.cpu_count()).
+            select: Whether to select the first new folder.
+            quiet: If True, suppress history output.
+            **kwargs: Passed to each reader (e.g. prefix, compact).
+
+        Returns:
+            List of new NMFolders.
+        """
+        from pyneuromatic.io.batch import read_many
+
+        flist = read_many(paths, workers=workers, container=self,
+                          select=select, **kwargs)
+        nmh.history(
+            "read %d folder(s)" % len(flist),
+            path=self.path_str,
+            quiet=quiet,
+        )
+        return flist
+
+    def save_hdf5(
+        self,
+        filepath: str,
+        folders: list[str] | None = None,
+        compression: str | None = None,
+        quiet: bool = nmc.QUIET,
+    ) -> str:
+        """Save folders to a native pyNeuroMatic HDF5 file.
+
+        Args:
+            filepath: Output file path.
+            folders: Names of folders to save, or None for all.
+            compression: h5py compression filter (e.g. "gzip"), or None.
+            quiet: If True, suppress history output.
+
+        Returns:
+            Path to the saved file as string.
+        """
+        from pyneuromatic.io.hdf5 import write_hdf5
+
+        if folders is None:
+            flist = list(self.values())
+        else:
+            flist = []
+            for name in folders:
+                f = self.get(name)
+                if f is None:
+                    raise KeyError("folder '%s' does not exist" % name)
+                flist.append(f)
+        path = write_hdf5(flist, filepath, compression=compression)
+        nmh.history(
+            "saved %d folder(s) to '%s'" % (len(flist), path),
+            path=self.path_str,
+            quiet=quiet,
+        )
+        return str(path)
@@ -20,6 +20,7 @@ Paper: https://doi.org/10.3389/fninf.2018.00014
 """
 from __future__ import annotations
 import datetime
+from collections.abc import Callable, Iterator
 # import math
 # import matplotlib
 import numpy as np
@@ -642,10 +643,92 @@ class NMManager(NMObject):
             :meth:`run_keys` — same result with object names instead of objects.
             :meth:`run_keys_set` — configure run targets at all tiers at once.
         """
-        elist: list[dict[str, NMObject]] = []
+        return list(self.iter_run_values(dataseries_priority))
+
+    def iter_run_values(
+        self,
+        dataseries_priority: bool = True
+    ) -> Iterator[dict[str, NMObject]]:
+        """Iterate over the current run targets, as run_values().
+
+        Yields the same selection dicts as :meth:`run_values`, in the same
+        order, without building the list. The run targets of each tier are
+        read when iteration starts; the channel x epoch products are
+        expanded as they are reached.
+
+        Args:
+            dataseries_priority: See :meth:`run_values`.
+
+        Yields:
+            Selection dicts mapping tier names to ``NMObject`` instances.
+        """
+        for kind, base, items in self._run_branches(dataseries_priority):
+            if kind in ("toolfolder+data", "data"):
+                for d in items:
+                    yield dict(base, data=d)
+            else:
+                channels, epochs = items
+                for c in channels:
+                    for e in epochs:
+                        yield dict(base, channel=c, epoch=e)
+
+    def iter_run_groups(
+        self,
+        dataseries_priority: bool = True
+    ) -> Iterator[list[dict[str, NMObject]]]:
+        """Iterate over the current run targets grouped by channel.
+
+        Yields the groups of ``_split_targets_by_channel(run_values())``,
+        in the same order, building one group at a time (as used by
+        :meth:`run_tool`).
+
+        Args:
+            dataseries_priority: See :meth:`run_values`.
+
+        Yields:
+            Lists of selection dicts, each for a single ``tool.run_all()``
+            call.
+        """
+        branches = self._run_branches(dataseries_priority)
+        for kind in ("toolfolder+dataseries", "toolfolder+data", "dataseries"):
+            for bkind, base, items in branches:
+                if bkind != kind:
+                    continue
+                if kind == "toolfolder+data":
+                    if items:
+                        yield [dict(base, data=d) for d in items]
+                    continue
+                channels, epochs = items
+                if not epochs:
+                    continue
+                for c in channels:
+                    yield [dict(base, channel=c, epoch=e) for e in epochs]
+        # basic data targets of all folders form the last group
+        group = [
+            dict(base, data=d)
+            for bkind, base, items in branches if bkind == "data"
+            for d in items
+        ]
+        if group:
+            yield group
+
+    def _run_branches(
+        self,
+        dataseries_priority: bool
+    ) -> list[tuple[str, dict, tuple | list]]:
+        """Read the run targets of each tier, without expanding them.
+
+        Returns:
+            List of (kind, base, items) in run_values() order, where kind is
+            "toolfolder+dataseries", "toolfolder+data", "dataseries" or
+            "data", base is the dict of parent tiers, and items is a
+            (channels, epochs) tuple for dataseries kinds, otherwise a list
+            of NMData.
+        """
+        branches: list[tuple[str, dict, tuple | list]] = []
         folders = self.__folders
         if folders is None:
-            return elist
+            return branches
         flist = folders.run_targets
         for f in flist:
             if not isinstance(f, NMFolder):
@@ -662,19 +745,18 @@ class NMManager(NMObject):
                     for ds in tf_dslist:
                         if not isinstance(ds, NMDataSeries):
                             continue
-                        for c in ds.channels.run_targets:
-                            for e in ds.epochs.run_targets:
-                                elist.append({
-                                    "folder": f,
-                                    "toolfolder": tf,
-                                    "dataseries": ds,
-                                    "channel": c,
-                                    "epoch": e,
-                                })
+                        branches.append((
+                            "toolfolder+dataseries",
+                            {"folder": f, "toolfolder": tf, "dataseries": ds},
+                            (ds.channels.run_targets, ds.epochs.run_targets),
+                        ))
                 else:
                     # Toolfolder + data mode
-                    for d in tf.data.run_targets:
-                        elist.append({"folder": f, "toolfolder": tf, "data": d})
+                    branches.append((
+                        "toolfolder+data",
+                        {"folder": f, "toolfolder": tf},
+                        tf.data.run_targets,
+                    ))
 
             # Existing folder-level branches
             dslist = f.dataseries.run_targets
@@ -682,19 +764,16 @@ class NMManager(NMObject):
                 for ds in dslist:
                     if not isinstance(ds, NMDataSeries):
                         continue
-                    for c in ds.channels.run_targets:
-                        for e in ds.epochs.run_targets:
-                            elist.append({
-                                "folder": f,
-                                "dataseries": ds,
-                                "channel": c,
-                                "epoch": e,
-                            })
+                    branches.append((
+                        "dataseries",
+                        {"folder": f, "dataseries": ds},
+                        (ds.channels.run_targets, ds.epochs.run_targets),
+                    ))
             else:
-                dlist = f.data.run_targets
-                for d in dlist:
-                    elist.append({"folder": f, "data": d})
-        return elist
+                branches.append(
+                    ("data", {"folder": f}, f.data.run_targets)
+                )
+        return branches
 
     def run_keys(
         self,
@@ -727,14 +806,22 @@ class NMManager(NMObject):
             :meth:`run_count` — length of this list without building it.
             :meth:`run_keys_set` — configure run targets at all tiers at once.
         """
-        elist = []
-        elist2 = self.run_values(dataseries_priority)
-        for e in elist2:
-            e2 = {}
-            for k, o in e.items():
-                e2[k] = o.name
-            elist.append(e2)
-        return elist
+        return list(self.iter_run_keys(dataseries_priority))
+
+    def iter_run_keys(
+        self,
+        dataseries_priority: bool = True
+    ) -> Iterator[dict[str, str]]:
+        """Iterate over the current run targets, as run_keys().
+
+        Args:
+            dataseries_priority: See :meth:`run_values`.
+
+        Yields:
+            Dicts mapping tier names to object name strings.
+        """
+        for e in self.iter_run_values(dataseries_priority):
+            yield {k: o.name for k, o in e.items()}
 
     def run_count(self, dataseries_priority: bool = True) -> int:
         """
@@ -750,7 +837,13 @@ class NMManager(NMObject):
         Returns:
             Number of run targets
         """
-        return len(self.run_keys(dataseries_priority))
+        count = 0
+        for kind, base, items in self._run_branches(dataseries_priority):
+            if kind in ("toolfolder+data", "data"):
+                count += len(items)
+            else:
+                count += len(items[0]) * len(items[1])
+        return count
 
     def run_keys_set(
         self,
@@ -977,10 +1070,12 @@ class NMManager(NMObject):
         """Run the selected (or named) tool over all current run targets.
 
         Resolves the tool by name, fetches run targets from the project
-        hierarchy via ``run_values()``, and calls ``tool.run_all()`` once per
-        ``(folder, dataseries, channel)`` group so that each invocation of the
-        ``run_init / run / run_finish`` lifecycle sees exactly one channel.
+        hierarchy via ``iter_run_groups()``, and calls ``tool.run_all()`` once
+        per ``(folder, dataseries, channel)`` group so that each invocation of
+        the ``run_init / run / run_finish`` lifecycle sees exactly one channel.
         Data-mode targets (no dataseries) are passed as a single group.
+        Groups are built as they are run, so the first group runs without
+        first expanding all targets.
 
         Stops and returns ``False`` as soon as any group's ``run_all()``
         returns ``False``.
@@ -997,6 +1092,99 @@ class NMManager(NMObject):
             ValueError: If no tool is selected.
             KeyError: If the named tool is not in the toolkit.
         """
+        tname, tool = self._tool_get(toolname)
+
+        result = True
+        empty = True
+        for group in self.iter_run_groups():
+            empty = False
+            if not tool.run_all(group, run_keys=self.__run_config):
+                result = False
+                break
+        if empty:
+            print("nothing to run")
+        nmch.add_nm_command("run_tool(%r)" % tname)
+        return result
+
+    def run_tool_files(
+        self,
+        paths,
+        toolname: str = "selected",
+        prefetch: int = 2,
+        processes: bool = False,
+        callback: Callable | None = None,
+        keep: bool = False,
+        **kwargs,
+    ) -> dict[str, dict]:
+        """Run a tool over many recording files, reading ahead of the analysis.
+
+        Each file is read into a new folder while the next ``prefetch``
+        files are read in the background (see
+        :func:`pyneuromatic.io.batch.iter_folders`), so reading overlaps
+        analysis. For each folder, the run targets are set by
+        :meth:`run_keys_set` with the current run configuration, its
+        ``"folder"`` key replaced by the new folder, and :meth:`run_tool`
+        is called. Then ``callback(folder)`` is called (e.g. to write the
+        results to disk) and, unless ``keep`` is True, the folder is
+        removed, so at most ``prefetch + 1`` files are held at once.
+
+        Args:
+            paths: File paths, or a directory of recording files.
+            toolname: Name of the tool to run, or ``"selected"`` (default).
+            prefetch: Number of files to read ahead.
+            processes: If True, read in worker processes rather than
+                threads.
+            callback: Optional function called as ``callback(folder)``
+                after the tool has run on each folder.
+            keep: If True, keep the folders in :attr:`folders`.
+            **kwargs: Passed to each reader (e.g. prefix, compact).
+
+        Returns:
+            Dict of file path -> the folder's ``toolresults`` (the results
+            are kept when the folder is removed).
+
+        Raises:
+            ValueError: If no run configuration has been set (see
+                :meth:`run_keys_set`) or no tool is selected.
+            KeyError: If the named tool is not in the toolkit.
+        """
+        from pyneuromatic.io.batch import iter_folders
+
+        self._tool_get(toolname)  # fail before reading any file
+        if self.__run_config is None:
+            raise ValueError("no run configuration; call run_keys_set() first")
+        if callback is not None and not callable(callback):
+            raise TypeError(nmu.type_error_str(callback, "callback",
+                                               "callable"))
+        run = dict(self.__run_config)
+        folders = self.__folders
+        results: dict[str, dict] = {}
+        try:
+            for path, folder in iter_folders(paths, prefetch=prefetch,
+                                             processes=processes, **kwargs):
+                if folder.name in folders:
+                    folder._name_set(folders._newkey(None), quiet=True)
+                folders._add(folder, select=False, quiet=True)
+                try:
+                    self.run_keys_set(dict(run, folder=folder.name),
+                                      max_targets=None)
+                    self.run_tool(toolname)
+                    if callback is not None:
+                        callback(folder)
+                finally:
+                    results[str(path)] = folder.toolresults
+                    if not keep:
+                        folders.pop(folder.name, quiet=True)
+                folder = None
+        finally:
+            try:  # restore the run configuration
+                self.run_keys_set(run, max_targets=None)
+            except (KeyError, ValueError):
+                self.__run_config = run
+        return results
+
+    def _tool_get(self, toolname: str) -> tuple[str, "NMTool"]:
+        """Resolve toolname ("selected" or a toolkit key) to (key, tool)."""
         from pyneuromatic.tools.nm_tool import NMTool
 
         tname: str | None = toolname
@@ -1013,18 +1201,7 @@ class NMManager(NMObject):
         tool = self.__toolkit[tname]
         if not isinstance(tool, NMTool):
             raise TypeError("tool '%s' is not an instance of NMTool" % toolname)
-
-        targets = self.run_values()
-        if not targets:
-            print("nothing to run")
-        groups = _split_targets_by_channel(targets)
-        result = True
-        for group in groups:
-            if not tool.run_all(group, run_keys=self.__run_config):
-                result = False
-                break
-        nmch.add_nm_command("run_tool(%r)" % tname)
-        return result
+        return tname, tool
 
     # Workspace methods
 
@@ -1079,6 +1256,54 @@ class NMManager(NMObject):
         nmh.history(f"Saved workspace to '{path}'")
         return str(path)
 
+    # override
+    def save(
+        self,
+        path: str = "",
+        compression: str | None = None,
+        quiet: bool = nmc.QUIET,
+    ) -> str:
+        """Save all folders to a native pyNeuroMatic HDF5 file.
+
+        Args:
+            path: Output file path. If empty, uses '<manager name>.h5'.
+            compression: h5py compression filter (e.g. "gzip"), or None.
+            quiet: If True, suppress history output.
+
+        Returns:
+            Path to the saved file as string.
+        """
+        if not isinstance(path, str):
+            raise TypeError(nmu.type_error_str(path, "path", "string"))
+        if not path:
+            path = self.name + ".h5"
+        return self.__folders.save_hdf5(
+            path, compression=compression, quiet=quiet
+        )
+
+    def load(
+        self,
+        path: str,
+        lazy: bool = True,
+        quiet: bool = nmc.QUIET,
+    ) -> list[NMFolder]:
+        """Load all folders from a native pyNeuroMatic HDF5 file.
+
+        The first loaded folder is selected. For partial loads use
+        NMFolderContainer.load_hdf5().
+
+        Args:
+            path: Path to the HDF5 file.
+            lazy: If True, defer reading arrays until first access.
+            quiet: If True, suppress history output.
+
+        Returns:
+            List of loaded NMFolders.
+        """
+        return self.__folders.load_hdf5(
+            path, lazy=lazy, select=True, quiet=quiet
+        )
+
     def available_tools(self) -> list[str]:
         """List all tools available in the registry."""
         return self._tool_registry.keys()
@@ -447,12 +447,15 @@ def find_level_crossings(
     xend: float = math.inf,
     x_interp: bool = True,
     ignore_nans: bool = True,
+    refractory: float = 0,
 ) -> tuple:
     """Find crossings of a y-axis level in a data array.
 
     A crossing is detected wherever the signal transitions across *ylevel*
     (i.e. ``np.diff(yarray > ylevel)`` is True). For each crossing, the
-    nearest sample index and interpolated xvalue are returned.
+    nearest sample index and interpolated xvalue are returned. All
+    crossings are interpolated at once with array arithmetic, so the cost
+    does not depend on the number of crossings.
 
     Args:
         yarray:      1-D numpy array of yvalues to search.
@@ -485,6 +488,11 @@ def find_level_crossings(
                      If False, a NaN sample acts as ``False`` in the
                      ``y > ylevel`` comparison, which silently blocks
                      detection of crossings that span a NaN gap.
+        refractory:  Minimum x-interval between crossings (>= 0). A
+                     crossing less than *refractory* after the last kept
+                     crossing (in search order) is dropped, as for a dead
+                     time after each spike. Default 0 (keep all
+                     crossings).
 
     Returns:
         Tuple ``(indexes, xvalues)`` of numpy arrays:
@@ -496,10 +504,12 @@ def find_level_crossings(
 
     Raises:
         TypeError:  If *func_name* is not a string, *yarray*/*xarray* is
-                    not a numpy ndarray, or *xbgn*/*xend* is a bool.
+                    not a numpy ndarray, *xbgn*/*xend* is a bool, or
+                    *refractory* is not a number.
         ValueError: If *func_name* does not contain ``"level"``, *ylevel*
                     is inf/nan, *xstart*/*xdelta* is inf/nan, *xbgn*/*xend*
-                    is NaN, or *xarray* size differs from *yarray*.
+                    is NaN, *refractory* is negative or NaN, or *xarray*
+                    size differs from *yarray*.
     """
     if not isinstance(func_name, str):
         raise TypeError(nmu.type_error_str(func_name, "func_name", "string"))
@@ -561,6 +571,13 @@ def find_level_crossings(
     if math.isnan(xend):
         raise ValueError("xend: '%s'" % xend)
 
+    if isinstance(refractory, bool) or not isinstance(refractory,
+                                                      (int, float)):
+        raise TypeError(nmu.type_error_str(refractory, "refractory", "float"))
+    refractory = float(refractory)
+    if math.isnan(refractory) or refractory < 0:
+        raise ValueError("refractory: '%s'" % refractory)
+
     backward = xbgn > xend
     x_low  = min(xbgn, xend)
     x_high = max(xbgn, xend)
@@ -587,7 +604,7 @@ def find_level_crossings(
     # If x[i] < x_low the crossing is definitely before the window; if
     # x[i-1] > x_high it is definitely after.  Convert the window to an
     # index range (with floor/ceil so boundary crossings are never missed),
-    # then keep the precise x_cross check inside the loop.
+    # then keep the precise x_cross check below.
     if not found_xarray:
         i_low  = (max(0, math.floor((x_low  - xstart) / xdelta))
                   if not math.isinf(x_low)  else 0)
@@ -606,63 +623,88 @@ def find_level_crossings(
     y_slice  = yarray[i_low: i_high + 1]
 
     level_crossings = np.diff(y_slice > ylevel, prepend=False)
-    locations = np.argwhere(level_crossings)
-    if len(locations.shape) != 2:
-        raise RuntimeError("locations shape should be 2")
-    locations = locations[:, 0]
+    i = np.flatnonzero(level_crossings) + i_offset  # global index in yarray
+    if i_offset == 0:
+        i = i[i > 0]
+
+    y0 = yarray[i - 1]
+    y1 = yarray[i]
+
+    if f == "level+":
+        rising = y1 > y0
+        i, y0, y1 = i[rising], y0[rising], y1[rising]
+    elif f == "level-":
+        falling = y1 < y0
+        i, y0, y1 = i[falling], y0[falling], y1[falling]
+
+    if found_xarray:
+        xa = xarray[i - 1]
+        xb = xarray[i]
+        dx = xb - xa
+    else:
+        xa = xstart + (i - 1) * xdelta
+        xb = xstart + i * xdelta
+        dx = xdelta
 
-    indexes = []
-    xvalues = []
+    # Interpolated crossing x — used for window check and nearest-sample logic
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dy = y1 - y0
+        m = dy / dx
+        b = y1 - m * xb
+        x_cross = (ylevel - b) / m
 
-    for i_local in locations:
-        if i_local == 0 and i_offset == 0:
-            continue
+    # Precise window check (guards against floor/ceil boundary cases)
+    inside = (x_low <= x_cross) & (x_cross <= x_high)
+    if not np.all(inside):
+        i, xa, xb, x_cross = i[inside], xa[inside], xb[inside], x_cross[inside]
 
-        i = i_local + i_offset   # global index in yarray
+    if i.size == 0:
+        return (np.array([]), np.array([]))
 
-        y0 = yarray[i - 1]
-        y1 = yarray[i]
+    nearest_a = np.abs(x_cross - xa) <= np.abs(x_cross - xb)
+    indexes = np.where(nearest_a, i - 1, i)
+    if orig_indices is not None:
+        indexes = orig_indices[indexes]
+    xvalues = x_cross if x_interp else np.where(nearest_a, xa, xb)
 
-        if f == "level+":
-            if y1 <= y0:
-                continue
-        elif f == "level-":
-            if y1 >= y0:
-                continue
+    if backward:
+        indexes = indexes[::-1]
+        xvalues = xvalues[::-1]
 
-        if found_xarray:
-            xa = xarray[i - 1]
-            xb = xarray[i]
-            dx = xb - xa
-        else:
-            xa = xstart + (i - 1) * xdelta
-            xb = xstart + i * xdelta
-            dx = xdelta
+    if refractory > 0 and xvalues.size > 1:
+        keep = _refractory_mask(-xvalues if backward else xvalues, refractory)
+        indexes = indexes[keep]
+        xvalues = xvalues[keep]
 
-        # Interpolated crossing x — used for window check and nearest-sample logic
-        dy = y1 - y0
-        m = dy / dx
-        b = y1 - m * xb
-        x_cross = (ylevel - b) / m
+    return (indexes, xvalues)
 
-        # Precise window check (guards against floor/ceil boundary cases)
-        if not (x_low <= x_cross <= x_high):
-            continue
 
-        if abs(x_cross - xa) <= abs(x_cross - xb):
-            idx = int(orig_indices[i - 1]) if orig_indices is not None else i - 1
-            indexes.append(idx)
-            xvalues.append(x_cross if x_interp else xa)
-        else:
-            idx = int(orig_indices[i]) if orig_indices is not None else i
-            indexes.append(idx)
-            xvalues.append(x_cross if x_interp else xb)
+def _refractory_mask(u: np.ndarray, refractory: float) -> np.ndarray:
+    """Mask of the positions kept after a refractory period.
 
-    if backward:
-        indexes.reverse()
-        xvalues.reverse()
+    The first position is kept, then each next kept position is the first
+    at least *refractory* after the last kept one. Rather than walking the
+    positions, the chain of kept positions is found by pointer doubling
+    (O(n log n) array operations).
+
+    Args:
+        u: Ascending positions (e.g. crossing x-values or sample indexes).
+        refractory: Refractory period (> 0), in the units of *u*.
 
-    return (np.array(indexes), np.array(xvalues))
+    Returns:
+        Boolean mask of the kept positions.
+    """
+    n = u.size
+    # nxt[i]: the crossing kept after crossing i (n = none)
+    nxt = np.append(np.searchsorted(u, u + refractory, side="left"), n)
+    keep = np.zeros(n + 1, dtype=bool)
+    keep[0] = True
+    jump = nxt
+    while not keep[n]:
+        # keep holds the first 2**k crossings of the chain; jump = nxt**(2**k)
+        keep[jump[keep]] = True
+        jump = jump[jump]
+    return keep[:n]
 
 
 # =========================================================================
@@ -671,6 +713,8 @@ def find_level_crossings(
 
 _VALID_EVENT_POLARITIES: frozenset[str] = frozenset({"negative", "positive"})
 _VALID_SLIDING_MODES: frozenset[str] = frozenset({"threshold", "nstdv"})
+# number of baseline positions evaluated at a time (bounds temporary memory)
+_EVENT_BLOCK_SIZE = 2**20
 
 
 def find_events_sliding_baseline(
@@ -695,6 +739,14 @@ def find_events_sliding_baseline(
     crosses the detection level. After a detection, the search resumes at
     t_event + *refractory*.
 
+    The window averages for all t0 come from cumulative sums (O(n) for
+    any window size) and the detection test is evaluated as an array mask,
+    so only the chain of detections after each refractory jump is
+    resolved separately (see _refractory_mask). Positions whose detection
+    point lies within the round-off bound of the sums of the detection
+    level are retested with the exact window mean and stdv, so results
+    are the same as testing each window with np.mean and np.std.
+
     Args:
         yarray: 1-D numpy array of y-values.
         xstart: X-value of the first sample.
@@ -789,39 +841,160 @@ def find_events_sliding_baseline(
     neg      = (polarity == "negative")
     use_nstdv = (mode == "nstdv")
 
-    events: list[float] = []
-    t0_idx = i0
-
-    while t0_idx <= i1:
-        det_idx = t0_idx + dt_pts
-        if det_idx > i1 or det_idx >= n:
-            break
+    # baseline midpoints t0 whose detection point t0 + dt_pts is searched
+    t0_last = min(i1, n - 1) - dt_pts
+    if t0_last < i0:
+        return []
 
-        if avg_ihalf == 0:
-            y_avg = yf[t0_idx]
-            y_std = 0.0
-        else:
-            ibsl_lo = max(0, t0_idx - avg_ihalf)
-            ibsl_hi = min(n - 1, t0_idx + avg_ihalf)
-            yf_window = yf[ibsl_lo: ibsl_hi + 1]
-            y_avg = float(np.mean(yf_window))
-            y_std = float(np.std(yf_window)) if use_nstdv else 0.0
-
-        nstdv = threshold
-        det_offset = (nstdv * y_std) if use_nstdv else threshold
+    # Evaluate the detection test at every t0, one block at a time, with
+    # the baseline mean (and stdv) of each window from cumulative sums
+    stats = _RollingStats(yf, use_nstdv) if avg_ihalf > 0 else None
+    crossed = np.empty(t0_last - i0 + 1, dtype=bool)
+    for b0 in range(i0, t0_last + 1, _EVENT_BLOCK_SIZE):
+        t0 = np.arange(b0, min(b0 + _EVENT_BLOCK_SIZE, t0_last + 1))
+        y_det = yf[t0 + dt_pts]
+        if stats is None:
+            # single-point baseline, whose stdv is 0
+            det_offset = 0.0 if use_nstdv else threshold
+            det_level = (yf[t0] - det_offset) if neg else (yf[t0] + det_offset)
+            crossed[b0 - i0: b0 - i0 + t0.size] = (
+                (y_det < det_level) if neg else (y_det > det_level)
+            )
+            continue
+        lo = np.maximum(t0 - avg_ihalf, 0)
+        hi = np.minimum(t0 + avg_ihalf, n - 1) + 1
+        y_avg, y_std = stats.window(lo, hi)
+        avg_tol, std_tol = stats.tolerance(lo, hi, y_avg)
+        det_offset = (threshold * y_std) if use_nstdv else threshold
         det_level = (y_avg - det_offset) if neg else (y_avg + det_offset)
-        y_det = yf[det_idx]
-        crossed = (y_det < det_level) if neg else (y_det > det_level)
-
-        if crossed:
-            events.append(xstart + det_idx * xdelta)
-            if max_events > 0 and len(events) >= max_events:
-                break
-            t0_idx = det_idx + max(1, ref_pts)
+        tol = (avg_tol + threshold * std_tol) if use_nstdv else avg_tol
+        tol = tol + 4 * np.finfo(float).eps * np.abs(det_level)
+        # on flat or quantized traces y_det can equal the exact level, where
+        # the round-off of the sums would decide the strict test, so such
+        # positions are retested with the exact window mean and stdv
+        near = np.flatnonzero(np.abs(y_det - det_level) <= tol)
+        if near.size:
+            y_avg_near, y_std_near = _window_mean_std(
+                yf, t0[near] - avg_ihalf, 2 * avg_ihalf + 1, use_nstdv)
+            det_offset = (
+                (threshold * y_std_near) if use_nstdv else threshold)
+            det_level[near] = ((y_avg_near - det_offset) if neg
+                               else (y_avg_near + det_offset))
+        crossed[b0 - i0: b0 - i0 + t0.size] = (
+            (y_det < det_level) if neg else (y_det > det_level)
+        )
+
+    # After a detection at t0, the search resumes at t0 + dt_pts + ref_pts
+    # (at least one point on), so the first crossing t0 is kept, then each
+    # first crossing t0 at least that step after the last kept one
+    t0_crossed = np.flatnonzero(crossed) + i0
+    if t0_crossed.size == 0:
+        return []
+    step = dt_pts + max(1, ref_pts)
+    t0_events = t0_crossed[_refractory_mask(t0_crossed, step)]
+    if max_events > 0:
+        t0_events = t0_events[:max_events]
+    return (xstart + (t0_events + dt_pts) * xdelta).tolist()
+
+
+class _RollingStats:
+    """Mean and stdv of any window of an array, from cumulative sums.
+
+    Sums are taken about the array mean to limit round-off in the
+    sum-of-squares. Non-finite values are counted separately, so that
+    windows containing them give the same NaN/inf results as np.mean and
+    np.std.
+    """
+
+    def __init__(self, yarray: np.ndarray, stdv: bool = True) -> None:
+        finite = np.isfinite(yarray)
+        self.__all_finite = bool(finite.all())
+        if self.__all_finite:
+            y = yarray
         else:
-            t0_idx += 1
+            y = np.where(finite, yarray, 0.0)
+            self.__nans = _cumsum0(np.isnan(yarray))
+            self.__pinfs = _cumsum0(yarray == math.inf)
+            self.__ninfs = _cumsum0(yarray == -math.inf)
+        self.__offset = float(np.mean(y)) if y.size else 0.0
+        self.__max_abs = float(np.max(np.abs(y))) if y.size else 0.0
+        y = y - self.__offset
+        self.__sum = _cumsum0(y)
+        self.__sum2 = _cumsum0(y * y) if stdv else None
+        # bounds on the round-off of any prefix sum (sequential summation)
+        eps = np.finfo(float).eps
+        self.__sum_err = 2 * y.size * eps * float(np.sum(np.abs(y)))
+        self.__sum2_err = (2 * y.size * eps * float(np.sum(y * y))
+                           if stdv else 0.0)
+
+    def window(
+        self,
+        lo: np.ndarray,
+        hi: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray | float]:
+        """Mean and stdv of yarray[lo:hi] for each (lo, hi) pair.
+
+        Returns:
+            Tuple (mean, stdv) of arrays; stdv is 0.0 if not computed.
+        """
+        count = hi - lo
+        mean = (self.__sum[hi] - self.__sum[lo]) / count
+        std: np.ndarray | float = 0.0
+        if self.__sum2 is not None:
+            var = (self.__sum2[hi] - self.__sum2[lo]) / count - mean * mean
+            std = np.sqrt(np.maximum(var, 0.0))
+        mean = mean + self.__offset
+        if not self.__all_finite:
+            nans = self.__nans[hi] - self.__nans[lo]
+            pinfs = self.__pinfs[hi] - self.__pinfs[lo]
+            ninfs = self.__ninfs[hi] - self.__ninfs[lo]
+            mean[pinfs > 0] = math.inf
+            mean[ninfs > 0] = -math.inf
+            mean[(nans > 0) | ((pinfs > 0) & (ninfs > 0))] = math.nan
+            if self.__sum2 is not None:
+                std[(nans > 0) | (pinfs > 0) | (ninfs > 0)] = math.nan
+        return mean, std
+
+    def tolerance(
+        self,
+        lo: np.ndarray,
+        hi: np.ndarray,
+        mean: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Bounds on |mean - np.mean| and |stdv - np.std| from window().
+
+        Covers the round-off of the prefix sums and of np.mean/np.std on
+        the window itself, with a safety factor of 2.
+
+        Returns:
+            Tuple (mean tolerance, stdv tolerance) of arrays.
+        """
+        eps = np.finfo(float).eps
+        count = hi - lo
+        mean_tol = 2 * (
+            (self.__sum_err + 2 * count * count * eps * self.__max_abs)
+            / count
+            + 2 * eps * (np.abs(mean) + abs(self.__offset))
+        )
+        if self.__sum2 is None:
+            return mean_tol, np.zeros_like(mean_tol)
+        # |sqrt(a) - sqrt(b)| <= sqrt(|a - b|), also when the variance is 0
+        mean_dev = np.abs(mean - self.__offset)
+        var_tol = 2 * (
+            (self.__sum2_err + 16 * count * count * eps * self.__max_abs ** 2)
+            / count
+            + 2 * mean_dev * mean_tol + 2 * mean_tol * mean_tol
+        )
+        return mean_tol, np.sqrt(var_tol)
+
 
-    return events
+def _cumsum0(a: np.ndarray) -> np.ndarray:
+    """Cumulative sum with a leading 0, so sum(a[i:j]) = c[j] - c[i]."""
+    c = np.empty(a.size + 1, dtype=np.float64 if a.dtype.kind == "f"
+                 else np.int64)
+    c[0] = 0
+    np.cumsum(a, out=c[1:])
+    return c
 
 
 def find_event_onset(
@@ -988,6 +1161,251 @@ def find_event_peak(
     return None
 
 
+def find_event_onsets(
+    yarray: np.ndarray,
+    xstart: float,
+    xdelta: float,
+    t_events: np.ndarray | list[float],
+    polarity: str,
+    avg: float,
+    nstdv: float,
+    limit: float,
+) -> np.ndarray:
+    """Onsets of many events at once (batched :func:`find_event_onset`).
+
+    Gives the same onsets as calling :func:`find_event_onset` for each
+    event, but all events are searched together, with the sliding-window
+    statistics of each round of search positions computed as arrays.
+
+    Args:
+        yarray: 1-D numpy array of y-values.
+        xstart: X-value of the first sample.
+        xdelta: Sample interval (must be > 0).
+        t_events: X-times of the detected events.
+        polarity: ``"negative"`` or ``"positive"``.
+        avg: Sliding window size (x-units, >= 0). 0 uses a 1-sample window.
+        nstdv: Number of standard deviations for the detection level (>= 0).
+        limit: Maximum backward search distance from each event (x-units,
+            > 0).
+
+    Returns:
+        Array of onset x-times, NaN where no onset was found within *limit*.
+
+    Raises:
+        TypeError: If yarray is not a numpy ndarray or params have wrong types.
+        ValueError: If polarity is invalid or limit <= 0.
+    """
+    yf, neg, event_idx, avg_pts, limit_pts = _event_search_args(
+        yarray, xstart, xdelta, t_events, polarity, avg, limit)
+    onsets = np.full(event_idx.size, math.nan)
+    if event_idx.size == 0 or yf.size == 0:
+        return onsets
+    ilo = np.maximum(event_idx - limit_pts, 0)
+    found = _event_window_search(yf, ilo, event_idx, avg_pts, neg, nstdv,
+                                 peak=False)
+    ok = found >= 0
+    onsets[ok] = float(xstart) + found[ok] * xdelta
+    return onsets
+
+
+def find_event_peaks(
+    yarray: np.ndarray,
+    xstart: float,
+    xdelta: float,
+    t_events: np.ndarray | list[float],
+    polarity: str,
+    avg: float,
+    nstdv: float,
+    limit: float,
+) -> np.ndarray:
+    """Peaks of many events at once (batched :func:`find_event_peak`).
+
+    Gives the same peaks as calling :func:`find_event_peak` for each event
+    (see :func:`find_event_onsets`).
+
+    Args:
+        yarray: 1-D numpy array of y-values.
+        xstart: X-value of the first sample.
+        xdelta: Sample interval (must be > 0).
+        t_events: X-times of the detected events.
+        polarity: ``"negative"`` or ``"positive"``.
+        avg: Sliding window size (x-units, >= 0). 0 uses a 1-sample window.
+        nstdv: Number of standard deviations for the detection level (>= 0).
+        limit: Maximum forward search distance from each event (x-units,
+            > 0).
+
+    Returns:
+        Array of peak x-times, NaN where no peak was found within *limit*.
+
+    Raises:
+        TypeError: If yarray is not a numpy ndarray or params have wrong types.
+        ValueError: If polarity is invalid or limit <= 0.
+    """
+    yf, neg, event_idx, avg_pts, limit_pts = _event_search_args(
+        yarray, xstart, xdelta, t_events, polarity, avg, limit)
+    peaks = np.full(event_idx.size, math.nan)
+    if event_idx.size == 0 or yf.size == 0:
+        return peaks
+    ihi = np.minimum(event_idx + limit_pts, yf.size - 1)
+    found = _event_window_search(yf, event_idx, ihi, avg_pts, neg, nstdv,
+                                 peak=True)
+    ok = found >= 0
+    peaks[ok] = float(xstart) + found[ok] * xdelta
+    return peaks
+
+
+def _event_search_args(
+    yarray: np.ndarray,
+    xstart: float,
+    xdelta: float,
+    t_events: np.ndarray | list[float],
+    polarity: str,
+    avg: float,
+    limit: float,
+) -> tuple[np.ndarray, bool, np.ndarray, int, int]:
+    """Validate batched onset/peak arguments and convert them to points.
+
+    Returns:
+        Tuple (float y-values, negative polarity, event sample indexes,
+        window points, limit points).
+    """
+    if not isinstance(yarray, np.ndarray):
+        raise TypeError(nmu.type_error_str(yarray, "yarray", "numpy.ndarray"))
+    if not isinstance(polarity, str) or polarity not in _VALID_EVENT_POLARITIES:
+        raise ValueError(
+            "polarity must be one of %s, got %r"
+            % (sorted(_VALID_EVENT_POLARITIES), polarity)
+        )
+    if isinstance(xdelta, bool) or not isinstance(xdelta, (int, float)):
+        raise TypeError(nmu.type_error_str(xdelta, "xdelta", "float"))
+    xdelta = float(xdelta)
+    if xdelta <= 0:
+        raise ValueError("xdelta must be > 0, got %g" % xdelta)
+    if isinstance(limit, bool) or not isinstance(limit, (int, float)):
+        raise TypeError(nmu.type_error_str(limit, "limit", "float"))
+    limit = float(limit)
+    if limit <= 0:
+        raise ValueError("limit must be > 0, got %g" % limit)
+
+    yf = yarray.astype(float, copy=False)
+    t = np.asarray(t_events, dtype=float).ravel()
+    n = yf.size
+    # np.rint rounds half to even, as round() does
+    event_idx = np.clip(np.rint((t - float(xstart)) / xdelta), 0,
+                        max(n - 1, 0)).astype(np.intp)
+    avg_pts = max(1, round(float(avg) / xdelta)) if avg > 0 else 1
+    limit_pts = max(1, round(limit / xdelta))
+    return yf, polarity == "negative", event_idx, avg_pts, limit_pts
+
+
+def _event_window_search(
+    yf: np.ndarray,
+    ilo: np.ndarray,
+    ihi: np.ndarray,
+    avg_pts: int,
+    neg: bool,
+    nstdv: float,
+    peak: bool,
+) -> np.ndarray:
+    """Search ranges [ilo, ihi] for the onset/peak window test.
+
+    Onsets step backward from ihi, peaks forward from ilo, stopping at the
+    first sample that passes (see _event_window_test). All ranges are
+    stepped together, a few samples per round, with the number of samples
+    per round doubling, so the test is evaluated about as often as the
+    one-event-at-a-time search would.
+
+    Returns:
+        Array of the found sample indexes, -1 where none.
+    """
+    found = np.full(ilo.size, -1, dtype=np.intp)
+    active = np.arange(ilo.size)
+    step0 = 0
+    nsteps = 8
+    while active.size:
+        steps = np.arange(step0, step0 + nsteps)
+        if peak:
+            pos = ilo[active, None] + steps
+            valid = pos <= ihi[active, None]
+        else:
+            pos = ihi[active, None] - steps
+            valid = pos >= ilo[active, None]
+        pos = np.where(valid, pos, 0)
+        passed = valid & _event_window_test(
+            yf, pos.ravel(), avg_pts, neg, nstdv, peak).reshape(pos.shape)
+        hit = passed.any(axis=1)
+        first = passed.argmax(axis=1)
+        found[active[hit]] = pos[hit, first[hit]]
+        active = active[~hit & valid[:, -1]]  # not found, range not done
+        step0 += nsteps
+        nsteps *= 2
+    return found
+
+
+def _event_window_test(
+    yf: np.ndarray,
+    positions: np.ndarray,
+    avg_pts: int,
+    neg: bool,
+    nstdv: float,
+    peak: bool,
+) -> np.ndarray:
+    """Onset/peak window test at each sample position.
+
+    Onsets test the window of *avg_pts* ending at each sample, peaks the
+    window starting at each sample, against the level mean -/+ nstdv *
+    stdv (as find_event_onset and find_event_peak).
+    """
+    wlo = positions if peak else positions - avg_pts + 1
+    y_avg, y_std = _window_mean_std(yf, wlo, avg_pts)
+
+    y_det = (y_avg - nstdv * y_std) if neg else (y_avg + nstdv * y_std)
+    y = yf[positions]
+    if peak == neg:  # peaks of negative events, onsets of positive events
+        return y < y_det
+    return y > y_det
+
+
+def _window_mean_std(
+    yf: np.ndarray,
+    wlo: np.ndarray,
+    width: int,
+    stdv: bool = True,
+) -> tuple[np.ndarray, np.ndarray]:
+    """np.mean and np.std of yf[wlo:wlo + width] at each window start.
+
+    Windows are clipped at the array ends. Full windows are computed a
+    block at a time from a sliding window view, which gives the same
+    values as np.mean and np.std of each window.
+
+    Returns:
+        Tuple (mean, stdv) of arrays; stdv is all 0 if *stdv* is False.
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    n = yf.size
+    # windows cut off by an array end are computed one at a time
+    full = (wlo >= 0) & (wlo + width <= n)
+    y_avg = np.empty(wlo.size)
+    y_std = np.zeros(wlo.size)
+    i_full = np.flatnonzero(full)
+    if i_full.size:
+        windows = sliding_window_view(yf, width)
+        block = max(1, _EVENT_BLOCK_SIZE // width)
+        for b in range(0, i_full.size, block):
+            i = i_full[b: b + block]
+            rows = windows[wlo[i]]
+            y_avg[i] = rows.mean(axis=1)
+            if stdv:
+                y_std[i] = rows.std(axis=1)
+    for i in np.flatnonzero(~full):
+        w = yf[max(0, wlo[i]): min(n, wlo[i] + width)]
+        y_avg[i] = np.mean(w)
+        if stdv:
+            y_std[i] = np.std(w)
+    return y_avg, y_std
+
+
 # =========================================================================
 # Linear regression
 # =========================================================================
@@ -1713,11 +2131,20 @@ def stability_test(
 # Template matching
 # =========================================================================
 
+_VALID_MATCH_METHODS: frozenset[str] = frozenset({"auto", "direct", "fft"})
+# template length from which method="auto" correlates via FFT (np.correlate
+# is faster for shorter templates)
+_MATCH_FFT_POINTS = 192
+# smallest FFT size of the block (overlap-save) correlation
+_MATCH_FFT_MIN_SIZE = 2**12
+
 
 def match_template(
     data: np.ndarray,
     template: np.ndarray,
     circular: bool = False,
+    method: str = "auto",
+    chunk_size: int | None = None,
 ) -> np.ndarray:
     """Sliding template matching (Clements & Bekkers 1997).
 
@@ -1753,6 +2180,15 @@ def match_template(
             active positions equals ``len(data)``.  If False (default), only
             positions ``0`` to ``len(data) - len(template)`` are computed;
             the remaining tail is set to zero.
+        method: How the data-template cross products are computed:
+            ``"direct"`` (``np.correlate``, O(n·m)), ``"fft"`` (block
+            FFT correlation, O(n·log m)) or ``"auto"`` (default; FFT for
+            templates of at least ``_MATCH_FFT_POINTS`` points).  Results
+            agree to rounding error.
+        chunk_size: If given, the criterion is computed for this many
+            positions at a time, each block reading ``len(template) - 1``
+            points past its end, so temporary memory is bounded for long
+            traces.  Default None computes all positions at once.
 
     Returns:
         1-D float64 numpy array of length ``len(data)``.  Each value is the
@@ -1762,76 +2198,283 @@ def match_template(
     Raises:
         TypeError: If *data* or *template* is not a numpy ndarray.
         ValueError: If *data* or *template* is not 1-D, if *template* has
-            fewer than 2 points, or if *template* is longer than *data*.
+            fewer than 2 points, if *template* is longer than *data*, if
+            *method* is invalid or if *chunk_size* < 1.
     """
     if not isinstance(data, np.ndarray):
         raise TypeError(nmu.type_error_str(data, "data", "NumPy ndarray"))
-    if not isinstance(template, np.ndarray):
-        raise TypeError(nmu.type_error_str(template, "template", "NumPy ndarray"))
     if data.ndim != 1:
         raise ValueError("data must be 1-D, got shape %s" % str(data.shape))
-    if template.ndim != 1:
-        raise ValueError("template must be 1-D, got shape %s" % str(template.shape))
+    _match_template_check(template, len(data), "template")
+    _match_args_check(method, chunk_size)
+    return _match_templates(data, [template], circular, method, chunk_size)[0]
 
-    n = len(data)
-    m = len(template)
 
-    if m < 2:
-        raise ValueError("template must have at least 2 points, got %d" % m)
-    if m > n:
-        raise ValueError(
-            "template length (%d) exceeds data length (%d)" % (m, n)
+def match_template_bank(
+    data: np.ndarray,
+    templates: list[np.ndarray] | tuple[np.ndarray, ...] | np.ndarray,
+    circular: bool = False,
+    method: str = "auto",
+    chunk_size: int | None = None,
+) -> np.ndarray:
+    """Template matching with a bank of templates in a single pass.
+
+    Computes the :func:`match_template` criterion of each template.  The
+    templates share each block of data: the prefix sums of the data
+    windows are computed once for all templates, and with the FFT method
+    the data spectrum is computed once and multiplied by each template
+    spectrum, so K templates cost little more than one.  Templates may
+    differ in length.  Use :func:`match_template_best` to reduce the
+    criteria to the best-matching template at each position.
+
+    Args:
+        data: 1-D numpy array of recorded values.
+        templates: Sequence of 1-D numpy arrays, or a 2-D array with one
+            template per row.  Each must have at least 2 points and be no
+            longer than *data*.
+        circular: As for :func:`match_template`.
+        method: As for :func:`match_template`; with ``"auto"`` the FFT is
+            used for templates of at least ``_MATCH_FFT_POINTS`` points.
+        chunk_size: As for :func:`match_template`.
+
+    Returns:
+        2-D float64 numpy array of shape ``(len(templates), len(data))``;
+        row k is ``match_template(data, templates[k], ...)``.
+
+    Raises:
+        TypeError: If *data* or a template is not a numpy ndarray, or
+            *templates* is not a sequence or ndarray.
+        ValueError: As for :func:`match_template`, or if *templates* is
+            empty.
+    """
+    if not isinstance(data, np.ndarray):
+        raise TypeError(nmu.type_error_str(data, "data", "NumPy ndarray"))
+    if data.ndim != 1:
+        raise ValueError("data must be 1-D, got shape %s" % str(data.shape))
+    if isinstance(templates, np.ndarray):
+        if templates.ndim != 2:
+            raise ValueError(
+                "templates array must be 2-D, got shape %s"
+                % str(templates.shape)
+            )
+        templates = list(templates)
+    elif not isinstance(templates, (list, tuple)):
+        raise TypeError(
+            nmu.type_error_str(templates, "templates", "list of NumPy ndarrays")
         )
+    if len(templates) == 0:
+        raise ValueError("templates must not be empty")
+    for i, template in enumerate(templates):
+        _match_template_check(template, len(data), "templates[%d]" % i)
+    _match_args_check(method, chunk_size)
+    return _match_templates(data, templates, circular, method, chunk_size)
 
-    data = data.astype(float, copy=False)
-    template = template.astype(float, copy=False)
 
-    tsum = float(np.sum(template))
-    tsumsqr = float(np.sum(template ** 2))
-    pnts = float(m)
-    denom = tsumsqr - tsum * tsum / pnts
+def match_template_best(
+    criteria: np.ndarray,
+    polarity: str = "positive",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Best-matching template at each position of a template bank.
 
-    if denom == 0.0:
-        return np.zeros(n)
+    Args:
+        criteria: 2-D array of criteria from :func:`match_template_bank`,
+            one row per template.
+        polarity: ``"positive"`` selects the largest criterion,
+            ``"negative"`` the smallest (most negative).
 
-    if circular:
-        passes = n
-        ext = np.concatenate([data, data[:m - 1]])
-    else:
-        passes = n - m + 1
-        ext = data
+    Returns:
+        Tuple ``(criterion, index)``: the criterion of the best template
+        at each position (float64) and the row of that template (int).
+        Ties go to the first template.
 
-    # Sliding window sums via prefix sums
-    cs = np.concatenate([[0.0], np.cumsum(ext)])
-    dsum = cs[m:m + passes] - cs[:passes]
+    Raises:
+        TypeError: If *criteria* is not a numpy ndarray.
+        ValueError: If *criteria* is not 2-D with at least one row, or
+            *polarity* is invalid.
+    """
+    if not isinstance(criteria, np.ndarray):
+        raise TypeError(nmu.type_error_str(criteria, "criteria", "NumPy ndarray"))
+    if criteria.ndim != 2 or criteria.shape[0] == 0:
+        raise ValueError(
+            "criteria must be 2-D with at least one row, got shape %s"
+            % str(criteria.shape)
+        )
+    if not isinstance(polarity, str) or polarity not in _VALID_EVENT_POLARITIES:
+        raise ValueError(
+            "polarity must be one of %s, got %r"
+            % (sorted(_VALID_EVENT_POLARITIES), polarity)
+        )
+    if polarity == "negative":
+        index = np.argmin(criteria, axis=0)
+    else:
+        index = np.argmax(criteria, axis=0)
+    criterion = np.take_along_axis(criteria, index[np.newaxis], axis=0)[0]
+    return criterion.astype(float, copy=False), index
 
-    cssq = np.concatenate([[0.0], np.cumsum(ext ** 2)])
-    dsumsqr = cssq[m:m + passes] - cssq[:passes]
 
-    # Cross-product sum: dtsum[i] = sum(ext[i:i+m] * template)
-    dtsum = np.correlate(ext, template, mode="valid")[:passes]
+def _match_template_check(template, n: int, name: str) -> None:
+    """Validate a template for data of *n* points (see match_template)."""
+    if not isinstance(template, np.ndarray):
+        raise TypeError(nmu.type_error_str(template, name, "NumPy ndarray"))
+    if template.ndim != 1:
+        raise ValueError("%s must be 1-D, got shape %s"
+                         % (name, str(template.shape)))
+    m = len(template)
+    if m < 2:
+        raise ValueError("%s must have at least 2 points, got %d" % (name, m))
+    if m > n:
+        raise ValueError(
+            "%s length (%d) exceeds data length (%d)" % (name, m, n)
+        )
 
-    # Optimal scale and offset (Clements & Bekkers 1997, Eq. 3-4)
-    scale = (dtsum - tsum * dsum / pnts) / denom
-    offset = (dsum - scale * tsum) / pnts
 
-    # Sum of squared errors (Eq. 5)
-    sse = (
-        dsumsqr
-        + scale ** 2 * tsumsqr
-        + pnts * offset ** 2
-        - 2.0 * (scale * dtsum + offset * dsum - scale * offset * tsum)
-    )
+def _match_args_check(method: str, chunk_size: int | None) -> None:
+    """Validate the method and chunk_size of match_template."""
+    if not isinstance(method, str) or method not in _VALID_MATCH_METHODS:
+        raise ValueError(
+            "method must be one of %s, got %r"
+            % (sorted(_VALID_MATCH_METHODS), method)
+        )
+    if chunk_size is not None:
+        if isinstance(chunk_size, bool) or not isinstance(chunk_size, int):
+            raise TypeError(nmu.type_error_str(chunk_size, "chunk_size", "int"))
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1, got %d" % chunk_size)
 
-    se = np.sqrt(np.maximum(sse, 0.0) / (pnts - 1.0))
-    safe_se = np.where(se == 0.0, 1.0, se)
-    detect = np.where(se == 0.0, 0.0, scale / safe_se)
 
-    result = np.zeros(n)
-    result[:passes] = detect
+def _match_templates(
+    data: np.ndarray,
+    templates: list[np.ndarray],
+    circular: bool,
+    method: str,
+    chunk_size: int | None,
+) -> np.ndarray:
+    """Criteria of validated templates (see match_template_bank)."""
+    n = len(data)
+    result = np.zeros((len(templates), n))
+
+    # per-template constants; a constant template (denom = 0) gives zeros
+    tpls = []  # (row, template, m, tsum, denom, passes)
+    for k, template in enumerate(templates):
+        template = template.astype(float, copy=False)
+        m = len(template)
+        tsum = float(np.sum(template))
+        tsumsqr = float(np.sum(template ** 2))
+        denom = tsumsqr - tsum * tsum / float(m)
+        if denom != 0.0:
+            passes = n if circular else n - m + 1
+            tpls.append((k, template, m, tsum, denom, passes))
+    if not tpls:
+        return result
+
+    if method == "auto":
+        use_fft = [t[2] >= _MATCH_FFT_POINTS for t in tpls]
+    else:
+        use_fft = [method == "fft"] * len(tpls)
+    # row of each FFT template in spectra (and in the block correlations)
+    fft_rows = {}
+    for i, fft in enumerate(use_fft):
+        if fft:
+            fft_rows[i] = len(fft_rows)
+    spectra = None
+    if fft_rows:
+        # FFT size of the block correlation: the template spectra are
+        # computed once and each FFT yields nfft - m + 1 cross products
+        m_fft = max(tpls[i][2] for i in fft_rows)
+        m_fft_min = min(tpls[i][2] for i in fft_rows)
+        nfft = max(_MATCH_FFT_MIN_SIZE, 1 << int(8 * m_fft - 1).bit_length())
+        padded = np.zeros((len(fft_rows), nfft))
+        for i, j in fft_rows.items():
+            padded[j, :tpls[i][2]] = tpls[i][1]
+        spectra = np.conj(np.fft.rfft(padded, axis=1))
+    m_max = max(t[2] for t in tpls)
+    passes_max = max(t[5] for t in tpls)
+    if chunk_size is None:
+        chunk_size = passes_max
+
+    for p0 in range(0, passes_max, chunk_size):
+        p1 = min(p0 + chunk_size, passes_max)
+        # the points of windows p0 to p1 - 1 (wrapping if circular)
+        end = p1 + m_max - 1
+        if end <= n:
+            ext = data[p0:end]
+        elif circular:
+            ext = np.concatenate([data[p0:], data[:end - n]])
+        else:
+            ext = data[p0:]
+        ext = ext.astype(float, copy=False)
+
+        # Sliding window sums via prefix sums (shared by all templates)
+        cs = _cumsum0(ext)
+        cssq = _cumsum0(ext ** 2)
+        window_sums = {}  # m -> (dsum, sxx), shared by templates of length m
+
+        # Cross-product sums of the FFT templates (one data FFT per block)
+        if spectra is not None:
+            npass_fft = max(min(p1 - p0, len(ext) - m_fft_min + 1), 0)
+            dtsums = _correlate_fft(ext, spectra, m_fft, npass_fft)
+
+        for i, (k, template, m, tsum, denom, passes) in enumerate(tpls):
+            npass = min(p1, passes) - p0
+            if npass <= 0:
+                continue
+            pnts = float(m)
+            if m not in window_sums:
+                dsum = cs[m:m + npass] - cs[:npass]
+                # sum of squared deviations of the data window
+                sxx = cssq[m:m + npass] - cssq[:npass]
+                sxx -= dsum * dsum / pnts
+                window_sums[m] = (dsum, sxx)
+            dsum, sxx = window_sums[m]
+
+            # Cross-product sum: dtsum[i] = sum(ext[i:i+m] * template)
+            if i in fft_rows:
+                dtsum = dtsums[fft_rows[i], :npass]
+            else:
+                dtsum = np.correlate(ext[:npass + m - 1], template,
+                                     mode="valid")
+
+            # Optimal scale (Clements & Bekkers 1997, Eq. 3), with the
+            # offset eliminated: sxt = sum((data - mean) * template)
+            sxt = dtsum - (tsum / pnts) * dsum
+            scale = sxt / denom
+
+            # Sum of squared errors (Eq. 5): sxx - scale * sxt
+            se = sxt
+            se *= -scale
+            se += sxx
+            np.maximum(se, 0.0, out=se)
+            se /= pnts - 1.0
+            np.sqrt(se, out=se)
+            np.divide(scale, se, out=result[k, p0:p0 + npass], where=se != 0.0)
     return result
 
 
+def _correlate_fft(
+    x: np.ndarray,
+    spectra: np.ndarray,
+    m: int,
+    passes: int,
+) -> np.ndarray:
+    """Correlation of *x* with a bank of templates via FFT.
+
+    Overlap-save: *x* is transformed in blocks of ``nfft`` points that
+    overlap by ``m - 1`` (*m* is the longest template), each giving
+    ``nfft - m + 1`` cross products per template.  *spectra* holds
+    ``conj(rfft(template, nfft))`` per row, so each block of *x* is
+    transformed once for all templates.  Row k of the result equals
+    ``np.correlate(x, templates[k], "valid")[:passes]`` to rounding error.
+    """
+    nfft = 2 * (spectra.shape[1] - 1)
+    step = nfft - m + 1
+    out = np.empty((spectra.shape[0], passes))
+    for p0 in range(0, passes, step):
+        p1 = min(p0 + step, passes)
+        block = np.fft.rfft(x[p0:p1 + m - 1], nfft)
+        out[:, p0:p1] = np.fft.irfft(block * spectra, nfft, axis=1)[:, :p1 - p0]
+    return out
+
+
 # ---------------------------------------------------------------------------
 # Curve-fitting functions
 # ---------------------------------------------------------------------------
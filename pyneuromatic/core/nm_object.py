@@ -32,6 +32,15 @@ import pyneuromatic.core.nm_history as nmh
 import pyneuromatic.core.nm_configurations as nmc
 import pyneuromatic.core.nm_utilities as nmu
 
+# Incremented when an NMObject whose path may be cached is renamed or
+# re-parented; cached paths of other generations are stale (see path)
+_path_generation: int = 0
+
+
+def _path_changed() -> None:
+    global _path_generation
+    _path_generation += 1
+
 
 class NMObject(object):
     """
@@ -56,6 +65,8 @@ class NMObject(object):
         - path: list of names, e.g. ['nm', 'folder0', 'recordA0']
         - path_str: dotted string, e.g. 'nm.folder0.recordA0'
         - path_objects: list of NMObject references
+    path and path_str are cached, and recomputed after any NMObject
+    in the tree is renamed or re-parented.
 
     Known children of NMObject:
         NMChannel, NMData, NMDataSeries, NMEpoch, NMFolder, NMManager,
@@ -117,6 +128,8 @@ class NMObject(object):
         self.__created = datetime.datetime.now().isoformat(" ", "seconds")
         self.__parent: object | None = parent
         self.__name: str = "NMObject0"
+        # (generation, path, path_str), see path
+        self.__path_cache: tuple[int, tuple[str, ...], str] | None = None
         self._container = None  # set by NMObjectContainer when added
         self.__copy_of: NMObject | None = None
 
@@ -261,6 +274,10 @@ class NMObject(object):
 
     @_parent.setter
     def _parent(self, parent: object) -> None:
+        # getattr: attributes may be unset while deep-copying
+        if (getattr(self, "_NMObject__path_cache", None) is not None
+                and parent is not getattr(self, "_NMObject__parent", None)):
+            _path_changed()
         self.__parent = parent
 
     # @property
@@ -290,11 +307,7 @@ class NMObject(object):
         Returns:
             List of NMObject names from root to this object.
         """
-        result: list[str] = []
-        if isinstance(self.__parent, NMObject):
-            result.extend(self.__parent.path)
-        result.append(self.__name)
-        return result
+        return list(self.__path_cached()[1])
 
     @property
     def path_str(self) -> str:
@@ -305,7 +318,19 @@ class NMObject(object):
         Returns:
             Dotted string path from root to this object.
         """
-        return ".".join(self.path) if self.path else self.__name
+        return self.__path_cached()[2]
+
+    def __path_cached(self) -> tuple[int, tuple[str, ...], str]:
+        cache = self.__path_cache
+        if cache is not None and cache[0] == _path_generation:
+            return cache
+        if isinstance(self.__parent, NMObject):
+            path = self.__parent.__path_cached()[1] + (self.__name,)
+        else:
+            path = (self.__name,)
+        cache = (_path_generation, path, ".".join(path))
+        self.__path_cache = cache
+        return cache
 
     @property
     def path_objects(self) -> list[NMObject]:
@@ -353,6 +378,8 @@ class NMObject(object):
         if not newname or not nmu.name_ok(newname):
             raise ValueError("newname: %s" % newname)
         oldname = self.__name
+        if newname != oldname and self.__path_cache is not None:
+            _path_changed()
         self.__name = newname
         h = nmh.history_change_str("name", oldname, self.__name)
         nmh.history(h, path=self.path_str, quiet=quiet)
@@ -127,6 +127,7 @@ class NMObjectContainer(NMObject, MutableMapping):
     # Extend NMObject's special attrs with NMObjectContainer's own
     _DEEPCOPY_SPECIAL_ATTRS: frozenset[str] = NMObject._DEEPCOPY_SPECIAL_ATTRS | frozenset({
         "_NMObjectContainer__map",
+        "_NMObjectContainer__keys",
         "_NMObjectContainer__sets",
     })
 
@@ -179,6 +180,9 @@ class NMObjectContainer(NMObject, MutableMapping):
         # self.__name_seq_format
 
         self.__map: dict[str, NMObject] = {}  # where NMObjects are stored/mapped
+        # lower-case key -> key, for O(1) case-insensitive lookups
+        # kept in sync with __map by every method that adds/removes keys
+        self.__keys: dict[str, str] = {}
 
         self.__sets = NMSets(
             name="NMObjectContainerSets",
@@ -314,9 +318,8 @@ class NMObjectContainer(NMObject, MutableMapping):
     ) -> bool:
         # Check if NMObject is in container
         if isinstance(nmobject, NMObject):
-            for o in self.__map.values():
-                if nmobject is o:
-                    return True
+            key = self.__keys.get(nmobject.name.lower())
+            return key is not None and self.__map[key] is nmobject
         return False
 
     # keys() NO OVERRIDE
@@ -430,6 +433,7 @@ class NMObjectContainer(NMObject, MutableMapping):
             copied_obj._parent = result  # update parent to new container
             copied_obj._container = result  # link back to new container
             result._NMObjectContainer__map[key] = copied_obj
+        result._NMObjectContainer__keys = dict(self._NMObjectContainer__keys)
 
         # __sets: deep copy the sets and update resolve function
         result._NMObjectContainer__sets = copy.deepcopy(
@@ -474,6 +478,7 @@ class NMObjectContainer(NMObject, MutableMapping):
                 self._selected_name_set(None, quiet=quiet)
         self.sets.remove_from_all(actual_key)
         o = self.__map.pop(actual_key)
+        del self.__keys[actual_key.lower()]
         o._container = None
         nmh.history("removed '%s'" % actual_key, path=self.path_str, quiet=quiet)
         if self._nm_cmd_path is not None:
@@ -510,6 +515,7 @@ class NMObjectContainer(NMObject, MutableMapping):
         self.selected_name = None
         self.sets.empty_all()
         self.__map.clear()
+        self.__keys.clear()
         nmh.history("cleared all: %s" % names, path=self.path_str, quiet=quiet)
         if self._nm_cmd_path is not None:
             nmch.add_nm_command('%s.clear()' % self._nm_cmd_path)
@@ -527,16 +533,16 @@ class NMObjectContainer(NMObject, MutableMapping):
         key = self._getkey(nmobject.name)
         if key is None:
             key = self._newkey(nmobject.name)
+            self.__keys[key.lower()] = key
         self.__map[key] = nmobject
-        self.__update_nmobject_references()
+        self.__update_nmobject_reference(nmobject)
         nmh.history("updated '%s'" % key, path=self.path_str, quiet=quiet)
         if self._nm_cmd_path is not None:
             nmch.add_nm_command('%s.update(%r)' % (self._nm_cmd_path, nmobject.name))
 
-    def __update_nmobject_references(self):
-        for o in self.__map.values():
-            o._container = self
-            o._parent = self._parent
+    def __update_nmobject_reference(self, nmobject: NMObject) -> None:
+        nmobject._container = self
+        nmobject._parent = self._parent
 
     # override MutableMapping mixin method
     # Sentinel value to distinguish "no default provided" from "default is None"
@@ -580,10 +586,7 @@ class NMObjectContainer(NMObject, MutableMapping):
         if not isinstance(key, str):
             e = nmu.type_error_str(key, "key", "string or None")
             raise TypeError(e)
-        for k in self.__map.keys():
-            if k.lower() == key.lower():  # keys are case insensitive
-                return k  # return key from self.__map
-        return None
+        return self.__keys.get(key.lower())  # keys are case insensitive
 
     def _newkey(
         self,
@@ -596,9 +599,8 @@ class NMObjectContainer(NMObject, MutableMapping):
             raise TypeError(e)
         if not newkey or not nmu.name_ok(newkey):
             raise ValueError("newkey: %s" % newkey)
-        for k in self.__map.keys():
-            if k.lower() == newkey.lower():  # keys are case insensitive
-                raise KeyError("key name '%s' already exists" % newkey)
+        if newkey.lower() in self.__keys:  # keys are case insensitive
+            raise KeyError("key name '%s' already exists" % newkey)
         return newkey
 
     def rename(
@@ -628,6 +630,8 @@ class NMObjectContainer(NMObject, MutableMapping):
         # self.__map = new_map  # reference change
         self.__map.clear()
         self.__map.update(new_map)
+        del self.__keys[key.lower()]
+        self.__keys[actual_newname.lower()] = actual_newname
         self.__sets.rename_item(key, actual_newname)
         nmh.history(
             "renamed '%s' as '%s'" % (key, actual_newname),
@@ -692,7 +696,8 @@ class NMObjectContainer(NMObject, MutableMapping):
         # c.name = newkey  # double history
         c._name_set(newname=newkey, quiet=True)  # no history
         self.__map[c.name] = c
-        self.__update_nmobject_references()
+        self.__keys[c.name.lower()] = c.name
+        self.__update_nmobject_reference(c)
         nmh.history(
             "duplicated '%s' as '%s'" % (key, c.name),
             path=self.path_str, quiet=quiet,
@@ -730,7 +735,8 @@ class NMObjectContainer(NMObject, MutableMapping):
         if not isinstance(newkey, str) or len(newkey) == 0:
             return False
         self.__map[newkey] = nmobject
-        self.__update_nmobject_references()
+        self.__keys[newkey.lower()] = newkey
+        self.__update_nmobject_reference(nmobject)
         if len(self.__map) == 1:
             select = True  # select first entry
         if isinstance(select, bool) and select:
@@ -32,10 +32,15 @@ import pyneuromatic.core.nm_utilities as nmu
 
 
 class NMScaleY:
-    """Y-scale metadata: label and units.
+    """Y-scale metadata: label, units, and raw scale/offset.
 
     Provides property-based access with validation and optional history
     logging. Used by NMData and NMChannel for y-axis scale parameters.
+
+    scale and offset convert raw samples to y-values
+    (y = raw * scale + offset). They are applied only to NMData holding a
+    compact raw buffer (see NMData.nparray_raw_set), e.g. int16 ADC
+    samples, and are included in to_dict() only when not 1 and 0.
     """
 
     _path_suffix: str = "yscale"
@@ -45,19 +50,31 @@ class NMScaleY:
         parent: object | None = None,
         label: str = "",
         units: str = "",
+        scale: float | int = 1.0,
+        offset: float | int = 0.0,
     ) -> None:
         self._parent = parent
         self._label: str = str(label) if label else ""
         self._units: str = str(units) if units else ""
+        self._scale: float | int = 1.0
+        self._offset: float | int = 0.0
+        self._set_scale(scale, log=False)
+        self._set_offset(offset, log=False)
 
     def __repr__(self) -> str:
-        return "NMScaleY(label='%s', units='%s')" % (self._label, self._units)
+        if self._scale == 1 and self._offset == 0:
+            return "NMScaleY(label='%s', units='%s')" % (self._label, self._units)
+        return "NMScaleY(label='%s', units='%s', scale=%s, offset=%s)" % (
+            self._label, self._units, self._scale, self._offset
+        )
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, NMScaleY):
             return (
                 self._label == other._label
                 and self._units == other._units
+                and self._scale == other._scale
+                and self._offset == other._offset
             )
         if isinstance(other, dict):
             return self.to_dict() == other
@@ -144,10 +161,74 @@ class NMScaleY:
                 quiet=quiet,
             )
 
+    # --- scale, offset (raw sample conversion) ---
+
+    @property
+    def scale(self) -> float | int:
+        return self._scale
+
+    @scale.setter
+    def scale(self, value: float | int) -> None:
+        self._set_scale(value)
+
+    def _set_scale(
+        self,
+        value: float | int,
+        log: bool = True,
+        quiet: bool = nmc.QUIET,
+    ) -> None:
+        if not isinstance(value, (float, int)) or isinstance(value, bool):
+            raise TypeError(nmu.type_error_str(value, "scale", "number"))
+        if isinstance(value, float) and (math.isinf(value) or math.isnan(value)):
+            raise ValueError("scale: %s" % value)
+        if value == 0:
+            raise ValueError("scale cannot be zero")
+        if value == self._scale:
+            return
+        self._scale = value
+        if log:
+            nmh.history(
+                "set scale=%s" % value,
+                path=self.path_str,
+                quiet=quiet,
+            )
+
+    @property
+    def offset(self) -> float | int:
+        return self._offset
+
+    @offset.setter
+    def offset(self, value: float | int) -> None:
+        self._set_offset(value)
+
+    def _set_offset(
+        self,
+        value: float | int,
+        log: bool = True,
+        quiet: bool = nmc.QUIET,
+    ) -> None:
+        if not isinstance(value, (float, int)) or isinstance(value, bool):
+            raise TypeError(nmu.type_error_str(value, "offset", "number"))
+        if isinstance(value, float) and (math.isinf(value) or math.isnan(value)):
+            raise ValueError("offset: %s" % value)
+        if value == self._offset:
+            return
+        self._offset = value
+        if log:
+            nmh.history(
+                "set offset=%s" % value,
+                path=self.path_str,
+                quiet=quiet,
+            )
+
     # --- serialization ---
 
     def to_dict(self) -> dict:
-        return {"label": self._label, "units": self._units}
+        d: dict = {"label": self._label, "units": self._units}
+        if self._scale != 1 or self._offset != 0:
+            d["scale"] = self._scale
+            d["offset"] = self._offset
+        return d
 
 
 class NMScaleX(NMScaleY):
@@ -292,4 +373,6 @@ def _yscale_from_dict(
         parent=parent,
         label=d.get("label", ""),
         units=d.get("units", ""),
+        scale=d.get("scale", 1.0),
+        offset=d.get("offset", 0.0),
     )
@@ -6,7 +6,18 @@ Part of pyNeuroMatic, a Python implementation of NeuroMatic for analyzing,
 acquiring and simulating electrophysiology data.
 
 Public API:
+    ABFFollower: Read sweeps of an ABF file as they are acquired
     read_axograph: Read Axograph files (.axgx, .axgd)
+    iter_folders: Read recording files one at a time, reading ahead
+    read_many: Read many recording files in parallel, one folder per file
+    read_hdf5: Read HDF5 files (.h5, .hdf5), memory-mapped on demand
+    write_hdf5: Save NMFolders to native pyNeuroMatic HDF5 files
+    read_hdf5_folders: Load NMFolders from native pyNeuroMatic HDF5 files
+    set_import_cache: Cache parsed imports on disk (see io.cache)
+    toolresults_table: Flatten a tool's results into table columns
+    write_table: Write table columns to .npz, .csv or .parquet
+    write_ibw: Write NMData to Igor binary wave files (.ibw)
+    write_pxp: Write NMFolder data to Igor packed experiment files (.pxp)
 
 Example:
     >>> from pyneuromatic.io import read_axograph
@@ -14,7 +25,33 @@ Example:
 """
 from pyneuromatic.io.abf import read_abf
 from pyneuromatic.io.axograph import read_axograph
+from pyneuromatic.io.batch import iter_folders, read_many
+from pyneuromatic.io.cache import set_import_cache
+from pyneuromatic.io.follow import ABFFollower
+from pyneuromatic.io.hdf5 import read_hdf5, read_hdf5_folders, write_hdf5
+from pyneuromatic.io.igor_binary import write_ibw, write_pxp
 from pyneuromatic.io.igor_text import write_itx
 from pyneuromatic.io.pxp import read_pxp
+from pyneuromatic.io.results import (
+    results_table, toolfolder_table, toolresults_table, write_table
+)
 
-__all__ = ["read_abf", "read_axograph", "read_pxp", "write_itx"]
+__all__ = [
+    "ABFFollower",
+    "iter_folders",
+    "read_abf",
+    "read_axograph",
+    "read_hdf5",
+    "read_hdf5_folders",
+    "read_many",
+    "read_pxp",
+    "results_table",
+    "set_import_cache",
+    "toolfolder_table",
+    "toolresults_table",
+    "write_hdf5",
+    "write_ibw",
+    "write_itx",
+    "write_pxp",
+    "write_table",
+]
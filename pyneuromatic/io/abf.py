@@ -12,13 +12,17 @@ References:
     - pyabf library: https://github.com/swharden/pyABF
 """
 from __future__ import annotations
+import functools
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:
     from pyneuromatic.core.nm_folder import NMFolder
 
 from pyneuromatic.io.base import make_data_name
+from pyneuromatic.io.cache import get_import_cache
 import pyneuromatic.core.nm_utilities as nmu
 
 
@@ -27,6 +31,8 @@ def read_abf(
     folder: "NMFolder | None" = None,
     prefix: str = "Record",
     make_dataseries: bool = True,
+    compact: bool = False,
+    lazy: bool = False,
 ) -> "NMFolder":
     """Read an Axon Binary Format file into an NMFolder.
 
@@ -38,6 +44,16 @@ def read_abf(
         folder: Optional existing folder to add data to. If None, creates new.
         prefix: Prefix for data names (default "Record").
         make_dataseries: If True, automatically create dataseries from data.
+        compact: If True, keep the raw ADC samples (int16, or float32 for
+            floating-point files) with the channel gain and offset as
+            yscale scale/offset (see NMData.nparray_raw_set), rather than
+            the scaled float32 values of pyabf.
+        lazy: If True, read only the file header; NMData, dataseries,
+            channels and epochs are created from it, and the samples of
+            each sweep are read from a memory map of the file when its
+            nparray is first accessed.
+            If this pyabf does not expose the raw sample layout, compact
+            and lazy are ignored and the scaled data are read.
 
     Returns:
         NMFolder containing the imported data.
@@ -59,6 +75,17 @@ def read_abf(
     if not filepath.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
 
+    # serve repeated reads from the import cache (see io.cache)
+    cache = get_import_cache() if folder is None else None
+    if cache is not None:
+        cache_key = cache.key(
+            filepath, "read_abf", prefix=prefix,
+            make_dataseries=make_dataseries, compact=compact,
+        )
+        cached = cache.get(cache_key, lazy=lazy, filepath=filepath)
+        if cached is not None:
+            return cached
+
     # Import here to avoid circular imports
     from pyneuromatic.core.nm_folder import NMFolder
 
@@ -72,24 +99,21 @@ def read_abf(
         folder = NMFolder(name=folder_name)
 
     # Load the ABF file
-    abf = pyabf.ABF(str(filepath), loadData=True)
+    abf = pyabf.ABF(str(filepath), loadData=not (compact or lazy))
+    layout = _abf_raw_layout(abf) if compact or lazy else None
+    if layout is None and (compact or lazy):
+        # this pyabf does not expose the raw sample layout, so load the
+        # scaled data through its public interface instead
+        abf = pyabf.ABF(str(filepath))
+    if layout is None:
+        raw = None
+    elif lazy:
+        raw = _abf_memmap(abf, filepath, layout[0])
+    else:
+        raw = _read_abf_raw(abf, filepath, layout[0])
 
     # Store metadata
-    folder.metadata["root"] = {
-        "FileFormat": f"ABF{abf.abfVersionString}",
-        "AcqMode": abf.protocol,
-        "NumWaves": abf.sweepCount,
-        "NumChannels": abf.channelCount,
-        "SamplesPerWave": abf.sweepPointCount,
-        "SampleInterval": abf.dataSecPerPoint * 1000,  # sec -> ms
-        "SampleRate": abf.sampleRate,
-        "WavePrefix": prefix,
-        "xLabel": "ms",
-        "Creator": abf.creator,
-    }
-
-    if abf.abfDateTime:
-        folder.metadata["root"]["FileDateTime"] = str(abf.abfDateTime)
+    folder.metadata["root"] = _abf_metadata(abf, prefix)
 
     # x-scaling: convert seconds to ms
     x_start = 0.0
@@ -100,7 +124,8 @@ def read_abf(
     matches = {}
     for sweep in range(abf.sweepCount):
         for channel in range(abf.channelCount):
-            abf.setSweep(sweep, channel=channel)
+            if raw is None:
+                abf.setSweep(sweep, channel=channel)
 
             name = make_data_name(prefix, channel, sweep)
 
@@ -119,7 +144,22 @@ def read_abf(
                 continue
 
             # Set y data
-            data.nparray = abf.sweepY.copy()
+            if raw is None:
+                data.nparray = abf.sweepY.copy()
+            else:
+                n = abf.sweepPointCount
+                samples = raw[sweep * n:(sweep + 1) * n, channel]
+                gain = layout[1][channel]
+                offset = layout[2][channel]
+                if compact:
+                    data.nparray_raw_set(
+                        samples if lazy else samples.copy(),
+                        scale=gain, offset=offset, quiet=True,
+                    )
+                else:
+                    data._nparray_loader_set(functools.partial(
+                        _abf_sweep_y, samples, gain, offset
+                    ))
 
             ch_char = nmu.channel_char(channel)
             if ch_char:
@@ -129,4 +169,86 @@ def read_abf(
     if make_dataseries and matches:
         folder.build_dataseries(prefix, matches)
 
+    if cache is not None and not lazy:
+        cache.put(cache_key, folder)
+
     return folder
+
+
+def _abf_metadata(abf, prefix: str) -> dict:
+    """Folder metadata of an ABF file (from its pyabf header)."""
+    metadata = {
+        "FileFormat": f"ABF{abf.abfVersionString}",
+        "AcqMode": abf.protocol,
+        "NumWaves": abf.sweepCount,
+        "NumChannels": abf.channelCount,
+        "SamplesPerWave": abf.sweepPointCount,
+        "SampleInterval": abf.dataSecPerPoint * 1000,  # sec -> ms
+        "SampleRate": abf.sampleRate,
+        "WavePrefix": prefix,
+        "xLabel": "ms",
+        "Creator": abf.creator,
+    }
+    if abf.abfDateTime:
+        metadata["FileDateTime"] = str(abf.abfDateTime)
+    return metadata
+
+
+def _abf_raw_layout(
+    abf,
+) -> tuple[np.dtype, list[float], list[float]] | None:
+    """Sample dtype and per-channel gains and offsets of an ABF.
+
+    pyabf keeps these in private attributes (_dtype, _dataGain and
+    _dataOffset), which it uses to scale the samples to float32 (see
+    pyabf.ABF._loadAndScaleData). Returns None if this pyabf does not
+    have them, in which case the raw samples cannot be read.
+    """
+    try:
+        dtype = np.dtype(abf._dtype)
+        gains = [float(abf._dataGain[c]) for c in range(abf.channelCount)]
+        offsets = [float(abf._dataOffset[c])
+                   for c in range(abf.channelCount)]
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+    if dtype != np.int16:  # float data is not scaled
+        gains = [1.0] * abf.channelCount
+        offsets = [0.0] * abf.channelCount
+    return dtype, gains, offsets
+
+
+def _read_abf_raw(abf, filepath: Path, dtype: np.dtype) -> np.ndarray:
+    """Read the unscaled ADC samples of an ABF as (points, channels).
+
+    Reads the data section the way pyabf does (see
+    pyabf.ABF._loadAndScaleData), but without converting to float32.
+    """
+    with open(filepath, "rb") as fb:
+        fb.seek(abf.dataByteStart)
+        raw = np.fromfile(fb, dtype=dtype, count=abf.dataPointCount)
+    return raw.reshape(-1, abf.channelCount)
+
+
+def _abf_memmap(abf, filepath: Path, dtype: np.dtype) -> np.memmap:
+    """Memory-map the unscaled ADC samples of an ABF as (points, channels).
+
+    Nothing is read until a slice of the map is accessed.
+    """
+    points = abf.dataPointCount // abf.channelCount
+    return np.memmap(
+        filepath, dtype=dtype, mode="r", offset=abf.dataByteStart,
+        shape=(points, abf.channelCount),
+    )
+
+
+def _abf_sweep_y(
+    samples: np.ndarray,
+    gain: float,
+    offset: float,
+) -> np.ndarray:
+    """Scale raw samples to float32 y-values, as pyabf sweepY."""
+    y = samples.astype(np.float32)
+    if gain != 1.0 or offset != 0.0:
+        y = np.multiply(y, gain)
+        y = np.add(y, offset)
+    return y
@@ -12,6 +12,7 @@ References:
     - axographio Python library
 """
 from __future__ import annotations
+import functools
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -19,6 +20,7 @@ if TYPE_CHECKING:
     from pyneuromatic.core.nm_folder import NMFolder
 
 from pyneuromatic.io.base import parse_units_from_label, make_data_name
+from pyneuromatic.io.cache import get_import_cache
 import pyneuromatic.core.nm_utilities as nmu
 
 
@@ -27,6 +29,8 @@ def read_axograph(
     folder: "NMFolder | None" = None,
     prefix: str = "Record",
     make_dataseries: bool = True,
+    compact: bool = False,
+    lazy: bool = False,
 ) -> "NMFolder":
     """Read an Axograph file into an NMFolder.
 
@@ -35,6 +39,13 @@ def read_axograph(
         folder: Optional existing folder to add data to. If None, creates new.
         prefix: Prefix for data names (default "Record").
         make_dataseries: If True, automatically create dataseries from data.
+        compact: If True, keep integer and float32 columns as raw samples
+            with yscale scale/offset (see NMData.nparray_raw_set) rather
+            than converting to float64.
+        lazy: If True, parse only the column headers and map the file
+            into memory: column samples are read (and byte-swapped) when
+            an nparray is first accessed, so only analysed data occupies
+            memory. With compact, the raw samples are memory-mapped views.
 
     Returns:
         NMFolder containing the imported data.
@@ -53,6 +64,17 @@ def read_axograph(
     if not filepath.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
 
+    # serve repeated reads from the import cache (see io.cache)
+    cache = get_import_cache() if folder is None else None
+    if cache is not None:
+        cache_key = cache.key(
+            filepath, "read_axograph", prefix=prefix,
+            make_dataseries=make_dataseries, compact=compact,
+        )
+        cached = cache.get(cache_key, lazy=lazy, filepath=filepath)
+        if cached is not None:
+            return cached
+
     # Import here to avoid circular imports
     from pyneuromatic.core.nm_folder import NMFolder
 
@@ -67,20 +89,21 @@ def read_axograph(
         folder = NMFolder(name=folder_name)
 
     # Read the file
-    columns = _read_axograph_file(filepath)
+    columns = _read_axograph_file(filepath, compact=compact, lazy=lazy)
 
     if not columns:
         return folder
 
     # First column is typically time (x-axis)
     time_col = columns[0]
+    time_data = _column_data(time_col)
     x_start = 0.0
     x_delta = 1.0
     x_units = "ms"
 
-    if len(time_col["data"]) > 1:
-        x_start = float(time_col["data"][0])
-        x_delta = float(time_col["data"][1] - time_col["data"][0])
+    if len(time_data) > 1:
+        x_start = float(time_data[0])
+        x_delta = float(time_data[1] - time_data[0])
 
     # Parse time units
     parsed = parse_units_from_label(time_col["title"])
@@ -112,14 +135,7 @@ def read_axograph(
         epoch = col["epoch"]
         name = make_data_name(prefix, channel, epoch)
 
-        # Build y data and scale
-        y_data = col["data"]
         parsed = parse_units_from_label(col["title"])
-
-        # Apply scale if needed
-        if parsed.scale != 1.0:
-            y_data = y_data * parsed.scale
-
         xscale = {"start": x_start, "delta": x_delta, "units": x_units}
         yscale = {"label": parsed.label, "units": parsed.units}
 
@@ -128,7 +144,26 @@ def read_axograph(
         if data is None:
             continue
 
-        data.nparray = y_data
+        if col["data"] is None and compact:
+            # raw samples, units scale folded into scale/offset
+            data.nparray_raw_set(
+                col["raw"],
+                scale=col["scale"] * parsed.scale,
+                offset=col["offset"] * parsed.scale,
+                quiet=True,
+            )
+        elif col["data"] is None:
+            # lazy: decode memory-mapped samples on first access
+            data._nparray_loader_set(functools.partial(
+                _decode_column, col["raw"], col["scale"], col["offset"],
+                parsed.scale,
+            ))
+        else:
+            y_data = col["data"]
+            # Apply scale if needed
+            if parsed.scale != 1.0:
+                y_data = y_data * parsed.scale
+            data.nparray = y_data
 
         ch_char = nmu.channel_char(channel)
         if ch_char:
@@ -138,17 +173,95 @@ def read_axograph(
     if make_dataseries and matches:
         folder.build_dataseries(prefix, matches)
 
+    if cache is not None and not lazy:
+        cache.put(cache_key, folder)
+
     return folder
 
 
-def _read_axograph_file(filepath: Path) -> list[dict]:
+def _raw_column(
+    title: str,
+    raw,
+    scale: float,
+    offset: float,
+    compact: bool,
+    lazy: bool = False,
+) -> dict:
+    """Column dict for raw samples (data = raw * scale + offset).
+
+    If compact or lazy, 'data' is None and the raw samples are kept with
+    their 'scale' and 'offset': in native byte order if compact, or as
+    read from the file (a memory-mapped view) if lazy.
+    """
+    import numpy as np
+
+    if compact or lazy:
+        if not lazy:
+            raw = np.ascontiguousarray(raw, dtype=raw.dtype.newbyteorder("="))
+        return {"title": title, "data": None, "raw": raw,
+                "scale": scale, "offset": offset}
+    return {"title": title, "data": _decode_column(raw, scale, offset)}
+
+
+def _decode_column(raw, scale: float, offset: float, unit_scale: float = 1.0):
+    """Return raw * scale + offset (* unit_scale) in native byte order.
+
+    Integer samples are converted to float64; floating-point samples keep
+    their precision.
+    """
+    if raw.dtype.kind == "f":
+        data = raw.astype(raw.dtype.newbyteorder("="))
+    else:
+        data = raw.astype(float)
+    if scale != 1:
+        data = data * scale
+    if offset != 0:
+        data = data + offset
+    if unit_scale != 1:
+        data = data * unit_scale
+    return data
+
+
+def _column_data(col: dict):
+    """Return the float values of a column dict."""
+    if col["data"] is not None:
+        return col["data"]
+    return _decode_column(col["raw"], col["scale"], col["offset"])
+
+
+def _read_samples(f, mm, dtype: str, count: int):
+    """Read count samples of dtype at the current position of f.
+
+    If mm (a numpy.memmap of the whole file) is given, skip over the
+    samples and return a view of them in mm instead of reading them.
+    """
+    import numpy as np
+
+    nbytes = count * np.dtype(dtype).itemsize
+    if mm is None:
+        return np.frombuffer(f.read(nbytes), dtype=dtype)
+    pos = f.tell()
+    f.seek(nbytes, 1)
+    return mm[pos:pos + nbytes].view(dtype)
+
+
+def _read_axograph_file(
+    filepath: Path,
+    compact: bool = False,
+    lazy: bool = False,
+) -> list[dict]:
     """Read raw column data from an Axograph file.
 
     Args:
         filepath: Path to the Axograph file.
+        compact: If True, keep raw samples (see _raw_column).
+        lazy: If True, read only the column headers; raw samples are
+            views of a read-only memory map of the file.
 
     Returns:
-        List of column dicts with 'title' and 'data' keys.
+        List of column dicts with 'title' and 'data' keys ('data' is None
+        for compact or lazy columns, which have 'raw', 'scale' and
+        'offset').
 
     Raises:
         ValueError: If file format is not recognized.
@@ -157,6 +270,7 @@ def _read_axograph_file(filepath: Path) -> list[dict]:
     import numpy as np
 
     columns: list[dict] = []
+    mm = np.memmap(filepath, dtype=np.uint8, mode="r") if lazy else None
 
     with open(filepath, "rb") as f:
         # Read header
@@ -166,10 +280,10 @@ def _read_axograph_file(filepath: Path) -> list[dict]:
         header_lower = header.lower()
         if header_lower == b"axgr":
             # Classic Axograph format
-            columns = _read_axograph_classic(f)
+            columns = _read_axograph_classic(f, compact=compact, mm=mm)
         elif header_lower == b"axgx":
             # Axograph X format
-            columns = _read_axograph_x(f)
+            columns = _read_axograph_x(f, compact=compact, mm=mm)
         else:
             raise ValueError(
                 f"Unrecognized Axograph file format. "
@@ -179,7 +293,7 @@ def _read_axograph_file(filepath: Path) -> list[dict]:
     return columns
 
 
-def _read_axograph_classic(f) -> list[dict]:
+def _read_axograph_classic(f, compact: bool = False, mm=None) -> list[dict]:
     """Read classic Axograph format (AxGr).
 
     Format versions 1 and 2.
@@ -188,6 +302,7 @@ def _read_axograph_classic(f) -> list[dict]:
     import numpy as np
 
     columns: list[dict] = []
+    lazy = mm is not None  # memory-mapped samples (see _read_samples)
 
     # Read version and column count
     version_data = f.read(4)
@@ -213,15 +328,18 @@ def _read_axograph_classic(f) -> list[dict]:
             # Data column: read scale factor and data
             scale_factor = struct.unpack(">f", f.read(4))[0]
             # Read short integers
-            raw_data = np.frombuffer(f.read(num_points * 2), dtype=">i2")
-            data = raw_data.astype(float) * scale_factor
+            raw_data = _read_samples(f, mm, ">i2", num_points)
+            columns.append(
+                _raw_column(title, raw_data, scale_factor, 0.0, compact, lazy)
+            )
+            continue
 
         columns.append({"title": title, "data": data})
 
     return columns
 
 
-def _read_axograph_x(f) -> list[dict]:
+def _read_axograph_x(f, compact: bool = False, mm=None) -> list[dict]:
     """Read Axograph X format (AxGx).
 
     Format version 3+.
@@ -230,6 +348,7 @@ def _read_axograph_x(f) -> list[dict]:
     import numpy as np
 
     columns: list[dict] = []
+    lazy = mm is not None  # memory-mapped samples (see _read_samples)
 
     # Read version
     version = struct.unpack(">i", f.read(4))[0]
@@ -252,21 +371,37 @@ def _read_axograph_x(f) -> list[dict]:
         # Read data based on type
         if data_type == 4:
             # Short integers (no scale)
-            raw_data = np.frombuffer(f.read(num_points * 2), dtype=">i2")
-            data = raw_data.astype(float)
+            raw_data = _read_samples(f, mm, ">i2", num_points)
+            columns.append(
+                _raw_column(title, raw_data, 1.0, 0.0, compact, lazy)
+            )
+            continue
 
         elif data_type == 5:
             # Long integers (no scale)
-            raw_data = np.frombuffer(f.read(num_points * 4), dtype=">i4")
-            data = raw_data.astype(float)
+            raw_data = _read_samples(f, mm, ">i4", num_points)
+            columns.append(
+                _raw_column(title, raw_data, 1.0, 0.0, compact, lazy)
+            )
+            continue
 
         elif data_type == 6:
             # Float
-            data = np.frombuffer(f.read(num_points * 4), dtype=">f4")
+            data = _read_samples(f, mm, ">f4", num_points)
+            if compact or lazy:
+                columns.append(
+                    _raw_column(title, data, 1.0, 0.0, compact, lazy)
+                )
+                continue
 
         elif data_type == 7:
             # Double
-            data = np.frombuffer(f.read(num_points * 8), dtype=">f8")
+            data = _read_samples(f, mm, ">f8", num_points)
+            if lazy:
+                columns.append(
+                    _raw_column(title, data, 1.0, 0.0, compact, lazy)
+                )
+                continue
 
         elif data_type == 9:
             # Series (start + delta, for x-axis)
@@ -278,8 +413,11 @@ def _read_axograph_x(f) -> list[dict]:
             # Scaled short: scale + offset + raw short data
             scale = struct.unpack(">d", f.read(8))[0]
             offset = struct.unpack(">d", f.read(8))[0]
-            raw_data = np.frombuffer(f.read(num_points * 2), dtype=">i2")
-            data = raw_data.astype(float) * scale + offset
+            raw_data = _read_samples(f, mm, ">i2", num_points)
+            columns.append(
+                _raw_column(title, raw_data, scale, offset, compact, lazy)
+            )
+            continue
 
         else:
             raise ValueError(
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Batch import of recording files.
+
+Reads many ABF, Axograph and PXP files in a pool of worker processes, one
+NMFolder per file (read_many), or one file at a time with the next files
+read ahead in the background (iter_folders), so that reading overlaps
+analysis.
+
+Part of pyNeuroMatic, a Python implementation of NeuroMatic for analyzing,
+acquiring and simulating electrophysiology data.
+"""
+from __future__ import annotations
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pyneuromatic.core.nm_utilities as nmu
+
+if TYPE_CHECKING:
+    from pyneuromatic.core.nm_folder import NMFolder, NMFolderContainer
+
+# file suffix -> reader function name (in pyneuromatic.io)
+READERS: dict[str, str] = {
+    ".abf": "read_abf",
+    ".axgx": "read_axograph",
+    ".axgd": "read_axograph",
+    ".pxp": "read_pxp",
+}
+
+
+def read_many(
+    paths: str | Path | Iterable[str | Path],
+    workers: int | None = None,
+    container: "NMFolderContainer | None" = None,
+    select: bool = False,
+    **kwargs: Any,
+) -> list["NMFolder"]:
+    """Read many recording files, one NMFolder per file.
+
+    Files are decoded in a pool of worker processes; each NMFolder
+    (with its arrays) is pickled back to the calling process. Folders are
+    returned, and added to container, in the order of paths regardless
+    of which worker finishes first.
+
+    Args:
+        paths: File paths, or a directory (all files with a supported
+            suffix, .abf .axgx .axgd .pxp, in sorted order).
+        workers: Number of worker processes. Default None uses
+            os.cpu_count(). 0 or 1 reads in the calling process. Files
+            read with lazy=True are always read in the calling process,
+            since their memory maps cannot be shared with workers.
+        container: Optional NMFolderContainer (e.g. NMManager.folders) to
+            add the folders to. Folders whose names already exist are
+            renamed to the next free name.
+        select: Whether to select the first added folder.
+        **kwargs: Passed to each reader (e.g. prefix, compact, lazy).
+
+    Returns:
+        List of NMFolders, one per file.
+
+    Raises:
+        FileNotFoundError: If a file does not exist.
+        ValueError: If a file suffix is not supported.
+    """
+    jobs = _jobs(paths, kwargs)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif isinstance(workers, bool) or not isinstance(workers, int):
+        raise TypeError(nmu.type_error_str(workers, "workers", "integer"))
+    elif workers < 0:
+        raise ValueError("workers: %s" % workers)
+    workers = min(workers, len(jobs))
+
+    if workers <= 1 or kwargs.get("lazy", False):
+        folders = [_read_file(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            folders = list(executor.map(_read_file, jobs))
+
+    if container is not None:
+        for i, f in enumerate(folders):
+            if f.name in container:
+                f._name_set(container._newkey(None), quiet=True)
+            container._add(f, select=select and i == 0, quiet=True)
+    return folders
+
+
+def iter_folders(
+    paths: str | Path | Iterable[str | Path],
+    prefetch: int = 2,
+    processes: bool = False,
+    **kwargs: Any,
+) -> Iterator[tuple[Path, "NMFolder"]]:
+    """Read recording files one at a time, reading ahead in the background.
+
+    While the caller works on one folder, the next prefetch files are read
+    in background threads (or worker processes). At most prefetch reads
+    are queued, so at most prefetch + 1 folders are held at once, as long
+    as the caller drops each folder before asking for the next.
+
+    Args:
+        paths: File paths, or a directory of recording files (see
+            read_many).
+        prefetch: Number of files to read ahead. 0 reads each file when it
+            is asked for.
+        processes: If True, read in worker processes rather than threads
+            (for readers that hold the GIL while decoding). Files read
+            with lazy=True are always read in threads.
+        **kwargs: Passed to each reader (e.g. prefix, compact, lazy).
+
+    Yields:
+        (file path, NMFolder), in the order of paths.
+
+    Raises:
+        FileNotFoundError: If a file does not exist.
+        ValueError: If a file suffix is not supported.
+    """
+    jobs = _jobs(paths, kwargs)
+    if isinstance(prefetch, bool) or not isinstance(prefetch, int):
+        raise TypeError(nmu.type_error_str(prefetch, "prefetch", "integer"))
+    if prefetch < 0:
+        raise ValueError("prefetch: %s" % prefetch)
+    return _iter_folders(jobs, prefetch, processes)
+
+
+def _iter_folders(
+    jobs: list[tuple[str, Path, dict]],
+    prefetch: int,
+    processes: bool,
+) -> Iterator[tuple[Path, "NMFolder"]]:
+    if prefetch == 0 or not jobs:
+        for job in jobs:
+            yield job[1], _read_file(job)
+        return
+    if processes and not jobs[0][2].get("lazy", False):
+        executor = ProcessPoolExecutor(max_workers=prefetch)
+    else:
+        executor = ThreadPoolExecutor(max_workers=prefetch,
+                                      thread_name_prefix="nm_prefetch")
+    remaining = iter(jobs)
+    pending: deque = deque()
+    try:
+        for job in remaining:
+            pending.append((job[1], executor.submit(_read_file, job)))
+            if len(pending) >= prefetch:
+                break
+        while pending:
+            path, future = pending.popleft()
+            folder = future.result()
+            job = next(remaining, None)
+            if job is not None:  # keep prefetch reads queued
+                pending.append((job[1], executor.submit(_read_file, job)))
+            yield path, folder
+            folder = None  # do not hold the folder while waiting
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _jobs(
+    paths: str | Path | Iterable[str | Path],
+    kwargs: dict,
+) -> list[tuple[str, Path, dict]]:
+    """Resolve paths to (reader name, file path, kwargs) jobs."""
+    if isinstance(paths, (str, Path)):
+        path = Path(paths)
+        if path.is_dir():
+            paths = sorted(
+                p for p in path.iterdir()
+                if p.suffix.lower() in READERS and p.is_file()
+            )
+        else:
+            paths = [path]
+    jobs = []
+    for p in paths:
+        if not isinstance(p, (str, Path)):
+            raise TypeError(nmu.type_error_str(p, "path", "string or Path"))
+        p = Path(p)
+        reader = READERS.get(p.suffix.lower())
+        if reader is None:
+            raise ValueError("unsupported file type: %s" % p)
+        if not p.exists():
+            raise FileNotFoundError(f"File not found: {p}")
+        jobs.append((reader, p, kwargs))
+    return jobs
+
+
+def _read_file(job: tuple[str, Path, dict]) -> "NMFolder":
+    """Read one file (runs in a worker process)."""
+    import pyneuromatic.io as nmio
+
+    reader, filepath, kwargs = job
+    return getattr(nmio, reader)(filepath, **kwargs)
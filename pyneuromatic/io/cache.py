@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk import cache for parsed recording files.
+
+read_abf, read_axograph and read_pxp check the import cache (if one is
+set with set_import_cache) before parsing a file. A hit is read back from
+a native pyNeuroMatic HDF5 file holding the decoded arrays, scales,
+dataseries and folder metadata, which is much faster than re-parsing the
+original file. Entries are keyed on the file's path, size and modification
+time (or, optionally, a hash of its contents) plus the reader arguments,
+and the least recently used entries are deleted when the cache exceeds
+its size limit.
+
+Part of pyNeuroMatic, a Python implementation of NeuroMatic for analyzing,
+acquiring and simulating electrophysiology data.
+
+Example:
+    >>> from pyneuromatic.io.cache import set_import_cache
+    >>> set_import_cache("~/.pyneuromatic/cache", max_size=2**30)
+    >>> folder = read_abf("cell1.abf")  # parsed, then cached
+    >>> folder = read_abf("cell1.abf")  # read from the cache
+"""
+from __future__ import annotations
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pyneuromatic.core.nm_utilities as nmu
+
+if TYPE_CHECKING:
+    from pyneuromatic.core.nm_folder import NMFolder
+
+# bump to invalidate existing entries when the cached format changes
+_CACHE_VERSION = 1
+_SUFFIX = ".h5"
+
+_import_cache: ImportCache | None = None
+
+
+class ImportCache:
+    """Directory of cached imports, with LRU eviction.
+
+    Each entry is a native pyNeuroMatic HDF5 file (see write_hdf5) named
+    by its key. An entry's modification time records when it was last
+    used, so eviction deletes the entries with the oldest times.
+
+    Args:
+        directory: Cache directory (created if it does not exist).
+        max_size: Size limit in bytes for all entries together.
+        hash_content: If True, key entries on a hash of the file contents
+            rather than its path, size and modification time (so renamed
+            or copied files hit, at the cost of reading each file once).
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_size: int = 2**30,
+        hash_content: bool = False,
+    ) -> None:
+        try:
+            import h5py  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "h5py is required for the import cache. "
+                "Install it with: pip install h5py"
+            )
+        if isinstance(max_size, bool) or not isinstance(max_size, int):
+            raise TypeError(nmu.type_error_str(max_size, "max_size",
+                                               "integer"))
+        if max_size < 0:
+            raise ValueError("max_size: %s" % max_size)
+        self.__directory = Path(directory).expanduser()
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__max_size = max_size
+        self.__hash_content = bool(hash_content)
+
+    @property
+    def directory(self) -> Path:
+        return self.__directory
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cache entries."""
+        return sum(st.st_size for _, st in self._entries())
+
+    def key(self, filepath: str | Path, reader: str, **params: Any) -> str:
+        """Return the cache key of a file read by reader with params."""
+        filepath = Path(filepath).resolve()
+        h = hashlib.sha1()
+        h.update(repr((_CACHE_VERSION, reader, sorted(params.items())))
+                 .encode("utf-8"))
+        if self.__hash_content:
+            with open(filepath, "rb") as f:
+                for block in iter(lambda: f.read(2**20), b""):
+                    h.update(block)
+        else:
+            st = filepath.stat()
+            h.update(repr((str(filepath), st.st_size, st.st_mtime_ns))
+                     .encode("utf-8"))
+        return h.hexdigest()
+
+    def get(
+        self,
+        key: str,
+        lazy: bool = False,
+        filepath: str | Path | None = None,
+    ) -> "NMFolder | None":
+        """Return the cached NMFolder of key, or None if not cached.
+
+        With lazy=True, arrays are memory-mapped from the cache entry
+        (see hdf5_array) as the entry is read, so samples are still read
+        from disk on demand, but a later eviction of the entry does not
+        affect the folder.
+
+        Args:
+            key: Cache key (see key()).
+            lazy: If True, memory-map arrays rather than read them.
+            filepath: The file being read. If given, the folder is named
+                after it, as the readers name new folders (with
+                hash_content, a hit may come from a copied or renamed
+                file).
+        """
+        from pyneuromatic.io.hdf5 import read_hdf5_folders
+
+        path = self.__directory / (key + _SUFFIX)
+        try:
+            folders = read_hdf5_folders(path, lazy=lazy)
+            if not folders:
+                return None
+            folder = folders[0]
+            if lazy:
+                for owner in [folder, *folder.toolfolders.values()]:
+                    for d in owner.data.values():
+                        d._nparray_load()
+        except (OSError, ValueError, KeyError):
+            return None  # missing, evicted or partly written entry
+        os.utime(path)  # mark as recently used
+        if filepath is not None:
+            folder.name = _folder_name(filepath)
+        return folder
+
+    def put(self, key: str, folder: "NMFolder") -> Path:
+        """Cache folder under key, then evict entries over the size limit."""
+        from pyneuromatic.io.hdf5 import write_hdf5
+
+        path = self.__directory / (key + _SUFFIX)
+        # write to a temporary file so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.__directory)
+        os.close(fd)
+        try:
+            write_hdf5(folder, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Path | None = None) -> int:
+        """Delete least recently used entries until within max_size.
+
+        Returns:
+            Number of entries deleted.
+        """
+        entries = sorted(self._entries(), key=lambda e: e[1].st_mtime_ns)
+        size = sum(st.st_size for _, st in entries)
+        count = 0
+        for path, st in entries:
+            if size <= self.__max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            size -= st.st_size
+            count += 1
+        return count
+
+    def clear(self) -> None:
+        """Delete all cache entries."""
+        for path, _ in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        entries = []
+        for path in self.__directory.glob("*" + _SUFFIX):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                pass  # deleted by another process
+        return entries
+
+
+def _folder_name(filepath: str | Path) -> str:
+    """Folder name of a file, as given by the readers."""
+    import re
+
+    folder_name = re.sub(r"[^a-zA-Z0-9_]", "_", Path(filepath).stem)
+    if folder_name and not folder_name[0].isalpha():
+        folder_name = "F" + folder_name
+    return folder_name
+
+
+def set_import_cache(
+    directory: str | Path | None,
+    max_size: int = 2**30,
+    hash_content: bool = False,
+) -> ImportCache | None:
+    """Set (or with directory=None, turn off) the import cache.
+
+    Args:
+        directory: Cache directory, or None to turn off caching.
+        max_size: Size limit in bytes (default 1 GiB).
+        hash_content: If True, key entries on file contents.
+
+    Returns:
+        The new ImportCache, or None.
+    """
+    global _import_cache
+    if directory is None:
+        _import_cache = None
+    else:
+        _import_cache = ImportCache(directory, max_size=max_size,
+                                    hash_content=hash_content)
+    return _import_cache
+
+
+def get_import_cache() -> ImportCache | None:
+    """Return the import cache, or None if caching is off."""
+    return _import_cache
@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+"""
+Follow recording files that are still being acquired.
+
+ABFFollower keeps a cursor into an episodic ABF file: each poll() reads
+only the sweeps completed since the last poll, adds them to an NMFolder
+as new epochs of its dataseries, then runs registered tools (and calls
+registered functions) on just the new epochs.
+
+Part of pyNeuroMatic, a Python implementation of NeuroMatic for analyzing,
+acquiring and simulating electrophysiology data.
+
+Example:
+    >>> follower = ABFFollower("cell1.abf")
+    >>> follower.add_tool(nm.toolkit["stats"])
+    >>> follower.follow(interval=0.5, idle=30)  # until 30 s without sweeps
+"""
+from __future__ import annotations
+import struct
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from pyneuromatic.io.abf import _abf_metadata, _abf_raw_layout, _abf_sweep_y
+from pyneuromatic.io.base import make_data_name
+import pyneuromatic.core.nm_utilities as nmu
+
+if TYPE_CHECKING:
+    from pyneuromatic.core.nm_folder import NMFolder
+    from pyneuromatic.tools.nm_tool import NMTool
+
+# ABF2 section map (see pyabf.abf2.headerV2): 18 sections of
+# (uint32 block index, uint32 bytes, int64 count) after the file header
+_ABF2_SECTION_MAP = struct.Struct("<" + "IIq" * 18)
+_ABF2_SECTION_MAP_OFFSET = 76
+_ABF2_DATA_SECTION = 10
+_ABF_BLOCK_SIZE = 512
+
+
+class ABFFollower:
+    """Incremental reader of an ABF file that is still being acquired.
+
+    The number of completed sweeps is taken from the file size, so a
+    sweep is read once all its samples (for all channels) are in the
+    file. Only episodic recordings with fixed-length sweeps can be
+    followed.
+
+    Args:
+        filepath: Path to the ABF file.
+        folder: Optional existing folder to add data to. If None, creates
+            new (named after the file, as read_abf).
+        prefix: Prefix for data names and the dataseries (default
+            "Record").
+        compact: If True, keep the raw ADC samples with yscale
+            scale/offset (see read_abf).
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ImportError: If pyabf is not installed.
+    """
+
+    def __init__(
+        self,
+        filepath: str | Path,
+        folder: "NMFolder | None" = None,
+        prefix: str = "Record",
+        compact: bool = False,
+    ) -> None:
+        try:
+            import pyabf  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "pyabf is required to read ABF files. "
+                "Install it with: pip install pyabf"
+            )
+        filepath = Path(filepath)
+        if not filepath.exists():
+            raise FileNotFoundError(f"File not found: {filepath}")
+
+        # Import here to avoid circular imports
+        from pyneuromatic.core.nm_folder import NMFolder
+
+        if folder is None:
+            import re
+
+            folder_name = re.sub(r"[^a-zA-Z0-9_]", "_", filepath.stem)
+            if folder_name and not folder_name[0].isalpha():
+                folder_name = "F" + folder_name
+            folder = NMFolder(name=folder_name)
+
+        self.__filepath = filepath
+        self.__folder = folder
+        self.__prefix = prefix
+        self.__compact = bool(compact)
+        self.__abf = None  # pyabf header, re-parsed until final
+        self.__final = False  # header parsed from a complete file
+        self.__sweeps = 0  # sweeps read so far (the cursor)
+        self.__tools: list[NMTool] = []
+        self.__callbacks: list[Callable] = []
+
+    @property
+    def filepath(self) -> Path:
+        return self.__filepath
+
+    @property
+    def folder(self) -> "NMFolder":
+        return self.__folder
+
+    @property
+    def prefix(self) -> str:
+        return self.__prefix
+
+    @property
+    def sweep_count(self) -> int:
+        """Number of sweeps read so far."""
+        return self.__sweeps
+
+    def add_tool(self, tool: "NMTool") -> None:
+        """Run tool on the new epochs of each poll, one channel at a time.
+
+        Each channel's new epochs are passed to tool.run_all() as a list
+        of targets, as NMManager.run_tool() does for a run group.
+        """
+        from pyneuromatic.tools.nm_tool import NMTool
+
+        if not isinstance(tool, NMTool):
+            raise TypeError(nmu.type_error_str(tool, "tool", "NMTool"))
+        if tool not in self.__tools:
+            self.__tools.append(tool)
+
+    def remove_tool(self, tool: "NMTool") -> None:
+        if tool in self.__tools:
+            self.__tools.remove(tool)
+
+    def add_callback(self, func: Callable) -> None:
+        """Call func(follower, epochs) after each poll with new sweeps.
+
+        epochs is the list of new NMEpochs.
+        """
+        if not callable(func):
+            raise TypeError(nmu.type_error_str(func, "func", "callable"))
+        if func not in self.__callbacks:
+            self.__callbacks.append(func)
+
+    def remove_callback(self, func: Callable) -> None:
+        if func in self.__callbacks:
+            self.__callbacks.remove(func)
+
+    def poll(self) -> list:
+        """Read the sweeps completed since the last poll.
+
+        Returns:
+            List of the new NMEpochs (empty if there are no new sweeps).
+
+        Raises:
+            RuntimeError: If pyabf does not expose the raw sample layout.
+        """
+        abf = self.__header()
+        if abf is None:
+            return []
+        dtype, gains, offsets = _abf_layout(abf)
+        channels = abf.channelCount
+        points = abf.sweepPointCount
+        sweep_bytes = _abf_sweep_bytes(abf)
+        if sweep_bytes <= 0:
+            return []  # sweep length not in the header yet
+
+        size = self.__filepath.stat().st_size
+        nsweeps = max(size - abf.dataByteStart, 0) // sweep_bytes
+        if self.__final:
+            nsweeps = min(nsweeps, abf.sweepCount)
+        if nsweeps <= self.__sweeps:
+            return []
+
+        first = self.__sweeps
+        with open(self.__filepath, "rb") as f:
+            f.seek(abf.dataByteStart + first * sweep_bytes)
+            raw = np.fromfile(f, dtype=dtype,
+                              count=(nsweeps - first) * points * channels)
+        raw = raw.reshape(-1, channels)
+
+        x_delta = abf.dataSecPerPoint * 1000  # sec -> ms
+        matches = {}
+        for sweep in range(first, nsweeps):
+            for channel in range(channels):
+                name = make_data_name(self.__prefix, channel, sweep)
+                xscale = {"start": 0.0, "delta": x_delta, "units": "ms"}
+                yscale = {}
+                if channel < len(abf.adcNames):
+                    yscale["label"] = abf.adcNames[channel]
+                if channel < len(abf.adcUnits):
+                    yscale["units"] = abf.adcUnits[channel]
+                data = self.__folder.data.new(
+                    name, xscale=xscale, yscale=yscale if yscale else None,
+                    quiet=True,
+                )
+                if data is None:
+                    continue
+                i = (sweep - first) * points
+                samples = raw[i:i + points, channel].copy()
+                gain = gains[channel]
+                offset = offsets[channel]
+                if self.__compact:
+                    data.nparray_raw_set(samples, scale=gain, offset=offset,
+                                         quiet=True)
+                else:
+                    data.nparray = _abf_sweep_y(samples, gain, offset)
+                ch_char = nmu.channel_char(channel)
+                if ch_char:
+                    matches[(ch_char, sweep)] = data
+        self.__sweeps = nsweeps
+        self.__folder.metadata["root"]["NumWaves"] = nsweeps
+
+        ds = self.__folder.build_dataseries(self.__prefix, matches)
+        if ds is None:
+            return []
+
+        # the epochs holding the new data (new epochs are last)
+        new_data = set(id(d) for d in matches.values())
+        epochs = [
+            ds.epochs[e] for e in ds.epochs
+            if any(id(d) in new_data for d in ds.epochs[e].data)
+        ]
+        for tool in self.__tools:
+            for cname in ds.channels:
+                channel = ds.channels[cname]
+                targets = [
+                    {"folder": self.__folder, "dataseries": ds,
+                     "channel": channel, "epoch": e}
+                    for e in epochs
+                    if any(d in channel.data for d in e.data)
+                ]
+                if targets:
+                    tool.run_all(targets)
+        for func in self.__callbacks:
+            func(self, epochs)
+        return epochs
+
+    def follow(
+        self,
+        interval: float = 1.0,
+        idle: float | None = None,
+        max_sweeps: int | None = None,
+    ) -> int:
+        """Poll the file until it stops growing.
+
+        Args:
+            interval: Seconds between polls.
+            idle: Stop after this many seconds without new sweeps, or None
+                to poll until max_sweeps (or KeyboardInterrupt).
+            max_sweeps: Stop once this many sweeps have been read.
+
+        Returns:
+            Number of sweeps read.
+        """
+        last = time.monotonic()
+        try:
+            while True:
+                if self.poll():
+                    last = time.monotonic()
+                if max_sweeps is not None and self.__sweeps >= max_sweeps:
+                    break
+                if idle is not None and time.monotonic() - last >= idle:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        return self.__sweeps
+
+    def __header(self):
+        """Parse the ABF header once it is in the file (None until then).
+
+        A header read during acquisition can have a zero or stale data
+        point count (and so sweep length and sweep count), so the header
+        is parsed again on each poll until the final header is known.
+        """
+        if self.__final:
+            return self.__abf
+        import pyabf
+
+        final = False
+        try:
+            abf = pyabf.ABF(str(self.__filepath), loadData=False)
+            final = _abf_header_final(abf, self.__filepath)
+        except (struct.error, ValueError, IndexError, EOFError):
+            # sections written after the data (e.g. the synch array)
+            abf = _abf_header_partial(self.__filepath)
+            if abf is None:
+                return self.__abf
+        self.__abf = abf
+        self.__final = final
+        root = _abf_metadata(abf, self.__prefix)
+        if not final:
+            root["NumWaves"] = self.__sweeps
+        self.__folder.metadata["root"] = root
+        return abf
+
+
+def _abf_layout(abf) -> tuple[np.dtype, list[float], list[float]]:
+    """Sample dtype and per-channel gains and offsets of a pyabf header.
+
+    Raises:
+        RuntimeError: If pyabf does not expose them (see _abf_raw_layout).
+    """
+    layout = _abf_raw_layout(abf)
+    if layout is None:
+        raise RuntimeError(
+            "ABFFollower reads raw samples using pyabf's _dtype, _dataGain "
+            "and _dataOffset, which this pyabf version does not have"
+        )
+    return layout
+
+
+def _abf_sweep_bytes(abf) -> int:
+    """Bytes per sweep (all channels) given by a pyabf header."""
+    itemsize = _abf_layout(abf)[0].itemsize
+    return abf.sweepPointCount * abf.channelCount * itemsize
+
+
+def _abf_header_final(abf, filepath: Path) -> bool:
+    """True if abf is the header of a complete file.
+
+    The final header gives a data section of whole sweeps that is all in
+    the file (during acquisition its point count is zero or stale).
+    """
+    sweep_bytes = _abf_sweep_bytes(abf)
+    if sweep_bytes <= 0 or abf.sweepCount <= 0 or abf.dataPointCount <= 0:
+        return False
+    itemsize = _abf_layout(abf)[0].itemsize
+    data_bytes = abf.dataPointCount * itemsize
+    if data_bytes != abf.sweepCount * sweep_bytes:
+        return False
+    return abf.dataByteStart + data_bytes <= filepath.stat().st_size
+
+
+def _abf_header_partial(filepath: Path):
+    """pyabf header of an ABF2 file whose later sections are not written.
+
+    Parses a sparse copy of the file: the bytes before the data section,
+    padded with zeros to the length given by the section map.
+    """
+    import pyabf
+
+    with open(filepath, "rb") as f:
+        head = f.read(_ABF2_SECTION_MAP_OFFSET + _ABF2_SECTION_MAP.size)
+        if len(head) < _ABF2_SECTION_MAP_OFFSET + _ABF2_SECTION_MAP.size:
+            return None
+        if head[:4] != b"ABF2":
+            return None  # ABF1 headers are not supported
+        sections = _ABF2_SECTION_MAP.unpack_from(
+            head, _ABF2_SECTION_MAP_OFFSET)
+        ends = [
+            sections[i] * _ABF_BLOCK_SIZE + sections[i + 1] * sections[i + 2]
+            for i in range(0, len(sections), 3)
+        ]
+        data_start = sections[3 * _ABF2_DATA_SECTION] * _ABF_BLOCK_SIZE
+        f.seek(0)
+        head = f.read(data_start)
+    if len(head) < data_start:
+        return None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir) / filepath.name
+        with open(tmp, "wb") as f:
+            f.write(head)
+            f.truncate(max(ends + [data_start]))
+        try:
+            return pyabf.ABF(str(tmp), loadData=False)
+        except (struct.error, ValueError, IndexError, EOFError):
+            return None
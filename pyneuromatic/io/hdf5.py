@@ -0,0 +1,864 @@
+# -*- coding: utf-8 -*-
+"""
+HDF5 (.h5, .hdf5) file reader and native pyNeuroMatic HDF5 format.
+
+Reads 1-D numeric datasets into NMData. Data arrays are not read on import:
+each NMData is given a loader that memory-maps its dataset on first access
+of NMData.nparray, so only the samples actually analysed are paged in from
+disk.
+
+write_hdf5() and read_hdf5_folders() save and load whole NMFolder trees
+(data, dataseries, toolfolders, notes, metadata and toolresults) in a
+native format that supports compression and partial loads.
+
+Part of pyNeuroMatic, a Python implementation of NeuroMatic for analyzing,
+acquiring and simulating electrophysiology data.
+
+References:
+    - h5py library: https://www.h5py.org
+    - Igor Pro HDF5 wave attributes: IGORWaveScaling, IGORWaveUnits
+"""
+from __future__ import annotations
+import functools
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyneuromatic.core.nm_folder import NMFolder
+
+import numpy
+
+import pyneuromatic.core.nm_utilities as nmu
+
+
+def read_hdf5(
+    filepath: str | Path,
+    folder: "NMFolder | None" = None,
+    prefix: str = "Record",
+    make_dataseries: bool = True,
+    lazy: bool = True,
+) -> "NMFolder":
+    """Read the 1-D numeric datasets of an HDF5 file into an NMFolder.
+
+    Datasets in the file's root group become NMData of the same name.
+    Datasets named with the NeuroMatic pattern {prefix}{channel}{epoch}
+    (e.g. RecordA0) are also linked into a dataseries.
+
+    X/y scaling is read from dataset attributes ``xstart``, ``xdelta``,
+    ``xlabel``, ``xunits``, ``ylabel`` and ``yunits``, or from the Igor Pro
+    attributes ``IGORWaveScaling`` and ``IGORWaveUnits``.
+
+    Args:
+        filepath: Path to the HDF5 file.
+        folder: Optional existing folder to add data to. If None, creates new.
+        prefix: Prefix for dataseries names (default "Record").
+        make_dataseries: If True, automatically create dataseries from data.
+        lazy: If True (default), defer reading each array until its
+            NMData.nparray is first accessed (see hdf5_array()).
+            If False, read all arrays into memory now.
+
+    Returns:
+        NMFolder containing the imported data.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        OSError: If the file is not a valid HDF5 file.
+    """
+    import h5py
+
+    filepath = Path(filepath)
+
+    if not filepath.exists():
+        raise FileNotFoundError(f"File not found: {filepath}")
+
+    # Import here to avoid circular imports
+    from pyneuromatic.core.nm_folder import NMFolder
+
+    # Create or use provided folder
+    if folder is None:
+        import re
+
+        folder_name = re.sub(r"[^a-zA-Z0-9_]", "_", filepath.stem)
+        if folder_name and not folder_name[0].isalpha():
+            folder_name = "F" + folder_name
+        folder = NMFolder(name=folder_name)
+
+    folder.metadata["root"] = {
+        "FileFormat": "HDF5",
+        "WavePrefix": prefix,
+    }
+
+    # Process datasets; build matches dict as we go
+    matches = {}
+    with h5py.File(filepath, "r") as f:
+        for name, dset in f.items():
+            if not isinstance(dset, h5py.Dataset):
+                continue
+            if dset.ndim != 1 or dset.dtype.kind not in "iuf":
+                continue
+            if not nmu.name_ok(name) or name in folder.data:
+                continue
+
+            xscale, yscale = _scales_from_attrs(dset.attrs)
+
+            data = folder.data.new(name, xscale=xscale, yscale=yscale)
+            if data is None:
+                continue
+
+            if lazy:
+                loader = functools.partial(hdf5_array, filepath, name)
+                data._nparray_loader_set(loader)
+            else:
+                data.nparray = dset[()]
+
+            parsed = nmu.parse_data_name(name)
+            if parsed is None:
+                continue
+            wave_prefix, channel_char, epoch_num = parsed
+            if wave_prefix != prefix:
+                continue
+            matches[(channel_char, epoch_num)] = data
+
+    # Optionally create dataseries directly from the matches dict
+    if make_dataseries and matches:
+        folder.build_dataseries(prefix, matches)
+
+    return folder
+
+
+def hdf5_array(
+    filepath: str | Path,
+    dataset: str,
+) -> numpy.ndarray:
+    """Return an HDF5 dataset as a numpy array, memory-mapped if possible.
+
+    Contiguous, uncompressed datasets are returned as a read-only
+    numpy.memmap of the file, so slices are read from disk on demand and
+    untouched samples never occupy memory. Chunked or compressed datasets
+    cannot be mapped and are read into memory.
+
+    Args:
+        filepath: Path to the HDF5 file.
+        dataset: Path of the dataset within the file (e.g. "RecordA0").
+
+    Returns:
+        numpy.memmap (read-only) or numpy.ndarray.
+
+    Raises:
+        KeyError: If the dataset does not exist.
+    """
+    import h5py
+
+    with h5py.File(filepath, "r") as f:
+        dset = f[dataset]
+        if not isinstance(dset, h5py.Dataset):
+            raise KeyError("not a dataset: %s" % dataset)
+        offset = None
+        if dset.chunks is None and dset.compression is None:
+            offset = dset.id.get_offset()
+        if offset is None or dset.size == 0:
+            return dset[()]
+        dtype = dset.dtype
+        shape = dset.shape
+    return numpy.memmap(filepath, mode="r", dtype=dtype, shape=shape,
+                        offset=offset)
+
+
+def _scales_from_attrs(attrs) -> tuple[dict, dict]:
+    """Build NMData xscale/yscale dicts from HDF5 dataset attributes."""
+    xscale: dict = {}
+    yscale: dict = {}
+
+    # Igor Pro HDF5 export: rows of [delta, offset], row 1 is the x dimension
+    if "IGORWaveScaling" in attrs:
+        scaling = numpy.asarray(attrs["IGORWaveScaling"])
+        if scaling.ndim == 2 and scaling.shape[0] > 1 and scaling.shape[1] == 2:
+            delta, start = float(scaling[1][0]), float(scaling[1][1])
+            if delta != 0:
+                xscale["delta"] = delta
+            xscale["start"] = start
+    if "IGORWaveUnits" in attrs:
+        units = [_attr_str(u) for u in numpy.atleast_1d(attrs["IGORWaveUnits"])]
+        if len(units) > 0 and units[0]:
+            yscale["units"] = units[0]
+        if len(units) > 1 and units[1]:
+            xscale["units"] = units[1]
+
+    # pyNeuroMatic attributes take priority
+    for key, attr in (("start", "xstart"), ("delta", "xdelta")):
+        if attr in attrs:
+            xscale[key] = float(attrs[attr])
+    for scale, key, attr in (
+        (xscale, "label", "xlabel"),
+        (xscale, "units", "xunits"),
+        (yscale, "label", "ylabel"),
+        (yscale, "units", "yunits"),
+    ):
+        if attr in attrs:
+            scale[key] = _attr_str(attrs[attr])
+
+    if xscale.get("delta") == 0:
+        del xscale["delta"]
+    return xscale, yscale
+
+
+def _attr_str(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8").rstrip("\x00")
+    return str(value).rstrip("\x00")
+
+
+# =========================================================================
+# Native pyNeuroMatic HDF5 format
+#
+# /                         attrs: NMFileFormat, NMFileVersion
+#   <folder>/               attrs: notes, metadata
+#     data/<name>           NMData arrays; attrs: xscale, yscale, notes
+#     xarray/<name>         optional NMData x-arrays
+#     dataseries/<name>     attrs: channels, epochs, channel_sets,
+#                           epoch_sets, epoch_groups
+#     toolfolders/<name>/   data/, xarray/ and dataseries/ as above
+#     toolresults/<tool>/<idx>/
+#                           attrs: date; records/<column> datasets
+#                           (one row per dict of scalars; attrs: key,
+#                           kind, none) and
+#                           arrays/<n> datasets (one per array)
+#
+# Container attrs (data, dataseries, toolfolders): sets, selected_name.
+# JSON strings are used for all non-array attributes.
+# =========================================================================
+
+NM_FILE_FORMAT = "pyNeuroMatic"
+NM_FILE_VERSION = 1
+
+
+def is_nm_hdf5(filepath: str | Path) -> bool:
+    """Return True if filepath is a native pyNeuroMatic HDF5 file."""
+    import h5py
+
+    try:
+        with h5py.File(filepath, "r") as f:
+            return _attr_str(f.attrs.get("NMFileFormat", "")) == NM_FILE_FORMAT
+    except OSError:
+        return False
+
+
+def write_hdf5(
+    folders: "NMFolder | list[NMFolder]",
+    filepath: str | Path,
+    compression: str | None = None,
+    compression_opts: int | None = None,
+    chunks: bool | int | None = None,
+) -> Path:
+    """Write NMFolders to a native pyNeuroMatic HDF5 file.
+
+    Saves the whole folder tree: NMData arrays with their scales and notes,
+    dataseries (channels, epochs, sets and groups), toolfolders, folder
+    notes and metadata, and toolresults. Each toolresults entry is stored
+    in columnar form: dicts of scalars become rows of a table with one
+    dataset per key, arrays are stored as datasets.
+
+    Uncompressed, unchunked arrays (the default) are stored contiguously,
+    so read_hdf5_folders() can memory-map them.
+
+    Args:
+        folders: NMFolder, or list of NMFolders, to save.
+        filepath: Output file path (.h5, .hdf5). Overwritten if it exists.
+        compression: h5py compression filter for arrays (e.g. "gzip",
+            "lzf"), or None for no compression.
+        compression_opts: Compression level for "gzip" (0-9).
+        chunks: Chunk size in samples, True for automatic chunking, or None.
+            Compressed arrays are always chunked.
+
+    Returns:
+        Path to the written file.
+    """
+    from pyneuromatic.core.nm_folder import NMFolder
+
+    if isinstance(folders, NMFolder):
+        folders = [folders]
+    if not isinstance(folders, list):
+        raise TypeError(nmu.type_error_str(folders, "folders", "NMFolder or list"))
+    for folder in folders:
+        if not isinstance(folder, NMFolder):
+            raise TypeError(nmu.type_error_str(folder, "folder", "NMFolder"))
+
+    dset_kwargs: dict = {}
+    if compression is not None:
+        dset_kwargs["compression"] = compression
+        if compression_opts is not None:
+            dset_kwargs["compression_opts"] = compression_opts
+        dset_kwargs["chunks"] = chunks if chunks else True
+    elif chunks:
+        dset_kwargs["chunks"] = chunks
+
+    filepath = Path(filepath)
+    # write to a temporary file, then replace filepath, since filepath may
+    # be the file that lazily loaded arrays (see hdf5_array) still read
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", prefix=filepath.name + ".",
+                               dir=filepath.parent)
+    os.close(fd)
+    try:
+        # keep the mode of an existing file (mkstemp files are 0o600)
+        if filepath.exists():
+            mode = stat.S_IMODE(filepath.stat().st_mode)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp, mode)
+        _write_hdf5_file(tmp, folders, dset_kwargs)
+        os.replace(tmp, filepath)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return filepath
+
+
+def _write_hdf5_file(filepath: str, folders: list, dset_kwargs: dict) -> None:
+    import h5py
+
+    with h5py.File(filepath, "w", track_order=True) as f:
+        f.attrs["NMFileFormat"] = NM_FILE_FORMAT
+        f.attrs["NMFileVersion"] = NM_FILE_VERSION
+        for folder in folders:
+            g = f.create_group(folder.name, track_order=True)
+            g.attrs["notes"] = _json_dumps(list(folder.notes))
+            g.attrs["metadata"] = _json_dumps(folder.metadata)
+            _write_data_tree(g, folder, dset_kwargs)
+            tfs = g.create_group("toolfolders", track_order=True)
+            _write_container_attrs(tfs, folder.toolfolders)
+            for tf in folder.toolfolders.values():
+                _write_data_tree(
+                    tfs.create_group(tf.name, track_order=True), tf, dset_kwargs
+                )
+            _write_toolresults(g.create_group("toolresults", track_order=True), folder.toolresults)
+
+
+def hdf5_contents(filepath: str | Path) -> dict[str, dict[str, list]]:
+    """List what a native pyNeuroMatic HDF5 file holds, without loading it.
+
+    Returns:
+        Dict mapping folder names to {"data": [...], "dataseries": [...],
+        "toolfolders": [...], "toolresults": [...]} name lists.
+
+    Raises:
+        ValueError: If the file is not a native pyNeuroMatic HDF5 file.
+    """
+    import h5py
+
+    if not is_nm_hdf5(filepath):
+        raise ValueError("not a pyNeuroMatic HDF5 file: %s" % filepath)
+    contents: dict[str, dict[str, list]] = {}
+    with h5py.File(filepath, "r") as f:
+        for fname, g in f.items():
+            contents[fname] = {
+                "data": list(g["data"].keys()),
+                "dataseries": list(g["dataseries"].keys()),
+                "toolfolders": list(g["toolfolders"].keys()),
+                "toolresults": list(g["toolresults"].keys()),
+            }
+    return contents
+
+
+def read_hdf5_folders(
+    filepath: str | Path,
+    folders: list[str] | None = None,
+    dataseries: list[str] | None = None,
+    toolfolders: list[str] | None = None,
+    toolresults: bool | list[str] = True,
+    lazy: bool = True,
+) -> "list[NMFolder]":
+    """Read NMFolders from a native pyNeuroMatic HDF5 file.
+
+    Loads can be partial: only the requested folders, dataseries,
+    toolfolders and toolresults are read. With lazy=True, arrays are not
+    read until first accessed (memory-mapped where stored contiguously;
+    see hdf5_array()), so reopening a large session is fast.
+
+    Args:
+        filepath: Path to the HDF5 file.
+        folders: Names of folders to load, or None for all.
+        dataseries: Names of dataseries to load, or None for all. When
+            given, only the NMData linked to these dataseries are loaded.
+        toolfolders: Names of toolfolders to load, or None for all.
+        toolresults: True for all toolresults, False for none, or a list
+            of tool names (e.g. ["stats"]).
+        lazy: If True, defer reading arrays until first access.
+
+    Returns:
+        List of new NMFolders (without parent), in file order.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not a native pyNeuroMatic HDF5 file.
+        KeyError: If a requested folder does not exist.
+    """
+    import h5py
+    from pyneuromatic.core.nm_folder import NMFolder
+
+    filepath = Path(filepath)
+    if not filepath.exists():
+        raise FileNotFoundError(f"File not found: {filepath}")
+    if not is_nm_hdf5(filepath):
+        raise ValueError("not a pyNeuroMatic HDF5 file: %s" % filepath)
+
+    result: list[NMFolder] = []
+    with h5py.File(filepath, "r") as f:
+        fnames = list(f.keys())
+        if folders is not None:
+            for fname in folders:
+                if fname not in f:
+                    raise KeyError("folder '%s' does not exist" % fname)
+            fnames = [n for n in fnames if n in folders]
+        for fname in fnames:
+            g = f[fname]
+            folder = NMFolder(name=fname)
+            folder.notes._entries.extend(_json_loads(g.attrs.get("notes", "[]")))
+            folder.metadata.update(_json_loads(g.attrs.get("metadata", "{}")))
+            _read_data_tree(g, folder, filepath, dataseries, lazy)
+            tfs = g["toolfolders"]
+            for tfname, tg in tfs.items():
+                if toolfolders is not None and tfname not in toolfolders:
+                    continue
+                tf = folder.toolfolders.new(name=tfname, quiet=True)
+                _read_data_tree(tg, tf, filepath, None, lazy)
+            _read_container_attrs(tfs, folder.toolfolders)
+            if toolresults:
+                tools = None if toolresults is True else toolresults
+                _read_toolresults(g["toolresults"], folder, tools)
+            result.append(folder)
+    return result
+
+
+def _write_data_tree(g, owner, dset_kwargs: dict) -> None:
+    """Write data/, xarray/ and dataseries/ of an NMFolder or NMToolFolder."""
+    data_g = g.create_group("data", track_order=True)
+    xarray_g = g.create_group("xarray", track_order=True)
+    _write_container_attrs(data_g, owner.data)
+    for name, d in owner.data.items():
+        raw = d.nparray_raw
+        # compact data: write the raw samples (yscale has scale/offset)
+        nparray = raw if raw is not None else d.nparray
+        if nparray is None:
+            nparray = numpy.array([], dtype=numpy.float64)
+        if nparray.dtype.kind in "OUS":
+            dset = data_g.create_dataset(
+                name, data=[str(v) for v in nparray],
+                dtype=_h5py_string_dtype(),
+            )
+            dset.attrs["dtype"] = "object"
+        elif nparray.size == 0:
+            dset = data_g.create_dataset(name, data=nparray)
+        else:
+            dset = data_g.create_dataset(name, data=nparray, **dset_kwargs)
+        if raw is not None:
+            dset.attrs["raw"] = True
+        dset.attrs["xscale"] = _json_dumps(d.xscale.to_dict())
+        dset.attrs["yscale"] = _json_dumps(d.yscale.to_dict())
+        dset.attrs["notes"] = _json_dumps(list(d.notes))
+        if d.xarray is not None:
+            xarray_g.create_dataset(name, data=d.xarray, **dset_kwargs)
+
+    ds_g = g.create_group("dataseries", track_order=True)
+    _write_container_attrs(ds_g, owner.dataseries)
+    for name, ds in owner.dataseries.items():
+        dg = ds_g.create_group(name)
+        channels = []
+        for c in ds.channels.values():
+            channels.append({
+                "name": c.name,
+                "xscale": c.xscale.to_dict(),
+                "yscale": c.yscale.to_dict(),
+                "data": [d.name for d in c.data],
+            })
+        epochs = []
+        for e in ds.epochs.values():
+            epochs.append({
+                "name": e.name,
+                "number": e.number,
+                "data": [d.name for d in e.data],
+            })
+        dg.attrs["channels"] = _json_dumps(channels)
+        dg.attrs["epochs"] = _json_dumps(epochs)
+        dg.attrs["channel_sets"] = _json_dumps(_sets_to_dict(ds.channels.sets))
+        dg.attrs["epoch_sets"] = _json_dumps(_sets_to_dict(ds.epochs.sets))
+        dg.attrs["epoch_groups"] = _json_dumps(dict(ds.epochs.groups._map))
+        dg.attrs["channel_selected"] = _json_dumps(ds.channels.selected_name)
+        dg.attrs["epoch_selected"] = _json_dumps(ds.epochs.selected_name)
+
+
+def _read_data_tree(
+    g,
+    owner,
+    filepath: Path,
+    dataseries: list[str] | None,
+    lazy: bool,
+) -> None:
+    """Read data/, xarray/ and dataseries/ into an NMFolder or NMToolFolder."""
+    from pyneuromatic.core.nm_channel import NMChannel
+    from pyneuromatic.core.nm_epoch import NMEpoch
+
+    data_g = g["data"]
+    xarray_g = g["xarray"]
+    ds_g = g["dataseries"]
+
+    # Partial load: only data linked to the requested dataseries
+    names: list[str] | None = None
+    if dataseries is not None:
+        keep: set[str] = set()
+        for dsname in dataseries:
+            if dsname not in ds_g:
+                continue
+            for c in _json_loads(ds_g[dsname].attrs["channels"]):
+                keep.update(c["data"])
+        names = [n for n in data_g.keys() if n in keep]
+    else:
+        names = list(data_g.keys())
+
+    for name in names:
+        dset = data_g[name]
+        d = owner.data.new(
+            name,
+            xscale=_json_loads(dset.attrs.get("xscale", "{}")),
+            yscale=_json_loads(dset.attrs.get("yscale", "{}")),
+            quiet=True,
+        )
+        if d is None:
+            continue
+        d.notes._entries.extend(_json_loads(dset.attrs.get("notes", "[]")))
+        if _attr_str(dset.attrs.get("dtype", "")) == "object":
+            d.nparray = numpy.array(dset.asstr()[()], dtype=object)
+        elif dset.attrs.get("raw", False):
+            d.nparray_raw_set(dset[()], quiet=True)
+        elif lazy:
+            loader = functools.partial(hdf5_array, filepath, dset.name)
+            d._nparray_loader_set(loader)
+        else:
+            d.nparray = dset[()]
+        if name in xarray_g:
+            d.xarray = xarray_g[name][()]
+    _read_container_attrs(data_g, owner.data)
+
+    for dsname, dg in ds_g.items():
+        if dataseries is not None and dsname not in dataseries:
+            continue
+        ds = owner.dataseries.new(name=dsname, quiet=True)
+        if ds is None:
+            continue
+        for c in _json_loads(dg.attrs["channels"]):
+            channel = NMChannel(
+                parent=ds, name=c["name"],
+                xscale=c["xscale"], yscale=c["yscale"],
+            )
+            ds.channels._add(channel, quiet=True)
+            for n in c["data"]:
+                d = owner.data.get(n)
+                if d is not None:
+                    channel.data.append(d)
+        for e in _json_loads(dg.attrs["epochs"]):
+            epoch = NMEpoch(parent=ds, name=e["name"], number=e["number"])
+            ds.epochs._add(epoch, quiet=True)
+            for n in e["data"]:
+                d = owner.data.get(n)
+                if d is not None:
+                    epoch.data.append(d)
+        _sets_from_dict(ds.channels.sets, _json_loads(dg.attrs["channel_sets"]))
+        _sets_from_dict(ds.epochs.sets, _json_loads(dg.attrs["epoch_sets"]))
+        for ename, group in _json_loads(dg.attrs["epoch_groups"]).items():
+            if ename in ds.epochs:
+                ds.epochs.groups.assign(ename, group, quiet=True)
+        for container, attr in (
+            (ds.channels, "channel_selected"),
+            (ds.epochs, "epoch_selected"),
+        ):
+            selected = _json_loads(dg.attrs.get(attr, "null"))
+            if selected is None or selected in container:
+                container._selected_name_set(selected, quiet=True)
+    _read_container_attrs(ds_g, owner.dataseries)
+
+
+def _write_container_attrs(g, container) -> None:
+    g.attrs["sets"] = _json_dumps(_sets_to_dict(container.sets))
+    g.attrs["selected_name"] = _json_dumps(container.selected_name)
+
+
+def _read_container_attrs(g, container) -> None:
+    _sets_from_dict(container.sets, _json_loads(g.attrs.get("sets", "{}")))
+    selected = _json_loads(g.attrs.get("selected_name", "null"))
+    if selected is None or selected in container:
+        container._selected_name_set(selected, quiet=True)
+
+
+def _sets_to_dict(sets) -> dict:
+    from pyneuromatic.core.nm_sets import NMSets
+
+    d: dict = {}
+    for key, value in sets.items():
+        if NMSets.tuple_is_equation(value):
+            d[key] = {"equation": list(value)}
+        else:
+            d[key] = list(value)
+    return d
+
+
+def _sets_from_dict(sets, d: dict) -> None:
+    """Restore sets; items missing after a partial load are dropped."""
+    equations = {}
+    for key, value in d.items():
+        if isinstance(value, dict):
+            equations[key] = tuple(value["equation"])
+            continue
+        items = [n for n in value if n in sets._nmobjects_dict]
+        sets._setitem(key, items)
+    for key, value in equations.items():
+        sets._setitem(key, value)
+
+
+# --- toolresults: columnar storage ---
+
+
+def _write_toolresults(g, toolresults: dict) -> None:
+    for tool, entries in toolresults.items():
+        tg = g.create_group(tool)
+        for idx, entry in enumerate(entries):
+            eg = tg.create_group(str(idx))
+            eg.attrs["date"] = str(entry.get("date", ""))
+            records, arrays, other = _flatten_results(entry.get("results"))
+            _write_records(eg.create_group("records"), records)
+            ag = eg.create_group("arrays")
+            for i, (path, arr, is_list) in enumerate(arrays):
+                dset = ag.create_dataset(str(i), data=arr)
+                dset.attrs["path"] = _json_dumps(path)
+                dset.attrs["list"] = is_list
+            eg.attrs["other"] = _json_dumps(other)
+
+
+def _read_toolresults(g, folder, tools: list[str] | None) -> None:
+    for tool, tg in g.items():
+        if tools is not None and tool not in tools:
+            continue
+        entries = []
+        for idx in sorted(tg.keys(), key=int):
+            eg = tg[idx]
+            items: list[tuple[list, object]] = []
+            items.extend(_read_records(eg["records"]))
+            for dset in eg["arrays"].values():
+                arr = dset[()]
+                if bool(dset.attrs.get("list", False)):
+                    arr = arr.tolist()
+                items.append((_json_loads(dset.attrs["path"]), arr))
+            for path, value in _json_loads(eg.attrs.get("other", "[]")):
+                items.append((path, value))
+            entries.append({
+                "date": _attr_str(eg.attrs.get("date", "")),
+                "results": _unflatten_results(items),
+            })
+        folder.toolresults[tool] = entries
+
+
+def _is_scalar(value) -> bool:
+    return value is None or isinstance(
+        value, (bool, int, float, str, numpy.bool_, numpy.number)
+    )
+
+
+def _flatten_results(
+    results,
+) -> tuple[list[tuple[list, dict]], list[tuple[list, numpy.ndarray, bool]], list]:
+    """Split nested results into records, arrays and other leaves.
+
+    Returns:
+        records: (path, dict of scalars) — rows of the columnar table.
+        arrays: (path, array, was_list) — numeric arrays and scalar lists.
+        other: [path, value] — remaining leaves, stored as JSON.
+    """
+    records: list[tuple[list, dict]] = []
+    arrays: list[tuple[list, numpy.ndarray, bool]] = []
+    other: list = []
+
+    def walk(obj, path: list) -> None:
+        if isinstance(obj, dict):
+            scalars = {k: v for k, v in obj.items()
+                       if isinstance(k, str) and _is_scalar(v)}
+            if scalars or not obj:
+                records.append((path, scalars))
+            for k, v in obj.items():
+                if k not in scalars:
+                    walk(v, path + [k])
+        elif isinstance(obj, numpy.ndarray) and obj.dtype.kind in "biuf":
+            arrays.append((path, obj, False))
+        elif (isinstance(obj, (list, tuple)) and
+              all(isinstance(v, (int, float)) and not isinstance(v, bool)
+                  for v in obj)):
+            arrays.append((path, numpy.asarray(obj, dtype=float
+                           if any(isinstance(v, float) for v in obj)
+                           else numpy.int64), True))
+        elif isinstance(obj, (list, tuple)):
+            for i, v in enumerate(obj):
+                walk(v, path + [i])
+        else:
+            other.append([path, obj])
+
+    walk(results, [])
+    return records, arrays, other
+
+
+def _unflatten_results(items: list[tuple[list, object]]):
+    """Rebuild nested results from (path, value) leaves."""
+    root: dict = {"": None}
+
+    def node_set(parent, key, value) -> None:
+        if isinstance(parent, list):
+            while len(parent) <= key:
+                parent.append(None)
+            if isinstance(value, dict) and isinstance(parent[key], dict):
+                parent[key].update(value)
+            else:
+                parent[key] = value
+        else:
+            if isinstance(value, dict) and isinstance(parent.get(key), dict):
+                parent[key].update(value)
+            else:
+                parent[key] = value
+
+    def node_child(parent, key, next_key):
+        if isinstance(parent, list):
+            current = parent[key] if key < len(parent) else None
+        else:
+            current = parent.get(key)
+        if current is None:
+            current = [] if isinstance(next_key, int) else {}
+            node_set(parent, key, current)
+        return current
+
+    for path, value in sorted(items, key=lambda item: len(item[0])):
+        parent, key = root, ""
+        for p in path:
+            parent = node_child(parent, key, p)
+            key = p
+        node_set(parent, key, value)
+    return root[""]
+
+
+def _write_records(g, records: list[tuple[list, dict]]) -> None:
+    n = len(records)
+    g.attrs["n"] = n
+    str_dtype = _h5py_string_dtype()
+    g.create_dataset("_path", data=[_json_dumps(p) for p, _ in records],
+                     dtype=str_dtype)
+    g.create_dataset("_keys", data=[_json_dumps(list(r.keys()))
+                                    for _, r in records], dtype=str_dtype)
+    columns: dict[str, list] = {}
+    for i, (_, r) in enumerate(records):
+        for k, v in r.items():
+            columns.setdefault(k, [None] * n)[i] = v
+    for k, values in columns.items():
+        present = [v for v in values if v is not None]
+        if all(isinstance(v, (bool, numpy.bool_)) for v in present):
+            kind = "bool"
+        elif all(isinstance(v, (int, numpy.integer)) and
+                 not isinstance(v, (bool, numpy.bool_)) and
+                 _INT64_MIN <= v <= _INT64_MAX for v in present):
+            kind = "int"
+        elif all(isinstance(v, (int, float, numpy.number)) and
+                 not isinstance(v, (bool, numpy.bool_)) for v in present):
+            kind = "float"
+        else:
+            kind = "str"
+        name = _column_name(k)
+        if kind == "str":
+            data = [_json_dumps(v) for v in values]
+            dset = g.create_dataset(name, data=data, dtype=str_dtype)
+        elif kind == "int":
+            data = numpy.array([0 if v is None else int(v) for v in values],
+                               dtype=numpy.int64)
+            dset = g.create_dataset(name, data=data)
+        else:
+            data = numpy.array(
+                [numpy.nan if v is None else float(v) for v in values],
+                dtype=numpy.float64,
+            )
+            dset = g.create_dataset(name, data=data)
+        dset.attrs["key"] = _json_dumps(k)
+        dset.attrs["kind"] = kind
+        dset.attrs["none"] = numpy.array(
+            [i for i, v in enumerate(values) if v is None], dtype=numpy.int64
+        )
+
+
+_INT64_MIN = -2**63
+_INT64_MAX = 2**63 - 1
+
+
+def _column_name(key: str) -> str:
+    """HDF5 dataset name of a records column.
+
+    "%" and "/" are percent-encoded, as is a leading "_" or "." (so no
+    column is named "_path" or "_keys"). The key itself is kept in the
+    dataset's "key" attribute.
+    """
+    name = str(key).replace("%", "%25").replace("/", "%2F")
+    if not name:
+        return "%"
+    if name[0] in "_.":
+        name = "%%%02X" % ord(name[0]) + name[1:]
+    return name
+
+
+def _read_records(g) -> list[tuple[list, dict]]:
+    paths = [_json_loads(p) for p in g["_path"].asstr()[()]]
+    keys = [_json_loads(k) for k in g["_keys"].asstr()[()]]
+    columns: dict[str, list] = {}
+    for name, dset in g.items():
+        if name in ("_path", "_keys"):
+            continue
+        k = _json_loads(dset.attrs["key"])
+        kind = _attr_str(dset.attrs["kind"])
+        if kind == "str":
+            values = [_json_loads(v) for v in dset.asstr()[()]]
+        elif kind == "bool":
+            values = [bool(v) for v in dset[()]]
+        elif kind == "int":
+            values = [int(v) for v in dset[()]]
+        else:
+            values = [float(v) for v in dset[()]]
+        for i in dset.attrs["none"]:
+            values[int(i)] = None
+        columns[k] = values
+    records = []
+    for i, (path, rkeys) in enumerate(zip(paths, keys)):
+        records.append((path, {k: columns[k][i] for k in rkeys}))
+    return records
+
+
+def _h5py_string_dtype():
+    import h5py
+
+    return h5py.string_dtype(encoding="utf-8")
+
+
+def _json_default(value):
+    if isinstance(value, numpy.ndarray):
+        return value.tolist()
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _json_dumps(value) -> str:
+    import json
+
+    return json.dumps(value, default=_json_default)
+
+
+def _json_loads(value):
+    import json
+
+    return json.loads(_attr_str(value))
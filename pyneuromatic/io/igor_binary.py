@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Igor binary wave (.ibw) and packed experiment (.pxp) file writer.
+
+Writes NMData arrays as Igor binary waves (version 5, little-endian), one
+.ibw file per wave, or bundles the waves of an NMFolder into a packed
+experiment file. Array buffers are written directly (no text formatting),
+with x-scaling and units taken from NMScaleX and y-units from NMScaleY.
+
+Part of pyNeuroMatic, a Python implementation of NeuroMatic for analyzing,
+acquiring and simulating electrophysiology data.
+
+References:
+    - Igor Technical Note 003 (binary wave file format)
+    - Igor Technical Note PTN003 (packed experiment file format)
+"""
+from __future__ import annotations
+import struct
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pyneuromatic.core.nm_data import NMData
+    from pyneuromatic.core.nm_folder import NMFolder
+
+# Igor number types (NT_CMPLX is not used)
+_NT_TEXT = 0
+_NT_FP32 = 0x02
+_NT_FP64 = 0x04
+_NT_I8 = 0x08
+_NT_I16 = 0x10
+_NT_I32 = 0x20
+_NT_UNSIGNED = 0x40
+
+_NUMBER_TYPES = {
+    "f4": _NT_FP32,
+    "f8": _NT_FP64,
+    "i1": _NT_I8,
+    "i2": _NT_I16,
+    "i4": _NT_I32,
+    "u1": _NT_I8 | _NT_UNSIGNED,
+    "u2": _NT_I16 | _NT_UNSIGNED,
+    "u4": _NT_I32 | _NT_UNSIGNED,
+}
+
+_MAX_WAVE_NAME = 31  # MAX_WAVE_NAME5
+_MAX_UNIT_CHARS = 3  # longer units are stored as extended units
+
+# BinHeader5 (64 bytes) and WaveHeader5 (320 bytes)
+_BIN_HEADER = struct.Struct("<hhiiii4i4iiii")
+_WAVE_HEADER = struct.Struct(
+    "<iIIihh6sh32sii4i4d4d4s16shhddi4i4ii16ihhhbbiihhii"
+)
+
+# packed experiment record types
+_WAVE_RECORD = 3
+_RECORD_HEADER = struct.Struct("<hhi")
+
+# seconds from 1904-01-01 (Igor epoch) to 1970-01-01
+_IGOR_EPOCH_OFFSET = 2082844800
+
+
+def write_ibw(nmdata: "NMData", filepath: str | Path) -> Path:
+    """Write NMData to an Igor binary wave (.ibw) file.
+
+    Numeric arrays are written in their own dtype (int64 and bool are
+    converted to float64 and int8, which Igor binary waves support).
+    Object or string arrays are written as text waves.
+
+    Args:
+        nmdata: NMData to export.
+        filepath: Output file path (.ibw).
+
+    Returns:
+        Path to the written file.
+    """
+    filepath = Path(filepath)
+    with open(filepath, "wb") as f:
+        f.write(_ibw_bytes(nmdata))
+    return filepath
+
+
+def write_pxp(folder: "NMFolder", filepath: str | Path) -> Path:
+    """Write NMFolder data to an Igor packed experiment (.pxp) file.
+
+    Each NMData with an array becomes a wave record (an embedded binary
+    wave, see write_ibw) in the root data folder of the experiment.
+
+    Args:
+        folder: NMFolder containing data to export.
+        filepath: Output file path (.pxp).
+
+    Returns:
+        Path to the written file.
+    """
+    filepath = Path(filepath)
+    with open(filepath, "wb") as f:
+        for name in folder.data:
+            nmdata = folder.data[name]
+            if nmdata.nparray is None:
+                continue
+            wave = _ibw_bytes(nmdata)
+            f.write(_RECORD_HEADER.pack(_WAVE_RECORD, 0, len(wave)))
+            f.write(wave)
+    return filepath
+
+
+def _ibw_bytes(nmdata: "NMData") -> bytes:
+    """Igor binary wave (version 5) file contents of NMData."""
+    name = nmdata.name.encode("utf-8")
+    if len(name) > _MAX_WAVE_NAME:
+        raise ValueError("wave name too long: %s" % nmdata.name)
+    nparray = nmdata.nparray
+    if nparray is None:
+        raise ValueError("%s has no data" % nmdata.name)
+    nparray = np.ravel(nparray)
+    npnts = nparray.size
+
+    sindices = b""
+    if nparray.dtype.kind in "OUS":
+        wtype = _NT_TEXT
+        values = [str(v).encode("utf-8") for v in nparray.tolist()]
+        data = b"".join(values)
+        ends = np.cumsum([len(v) for v in values], dtype="<i4")
+        sindices = ends.tobytes()
+    else:
+        if nparray.dtype.kind == "b":
+            nparray = nparray.astype(np.int8)
+        key = "%s%d" % (nparray.dtype.kind, nparray.dtype.itemsize)
+        if key not in _NUMBER_TYPES:
+            nparray = nparray.astype(np.float64)
+            key = "f8"
+        wtype = _NUMBER_TYPES[key]
+        data = nparray.astype(nparray.dtype.newbyteorder("<")).tobytes()
+
+    # units: up to 3 chars in the header, otherwise extended units
+    data_units, data_eunits = _units(nmdata.yscale.units)
+    x_units, x_eunits = _units(nmdata.xscale.units)
+
+    note = "\r".join(entry.get("note", "") for entry in nmdata.notes)
+    note = note.encode("utf-8")
+
+    wfm_size = _WAVE_HEADER.size + len(data)
+    now = int(time.time()) + _IGOR_EPOCH_OFFSET
+    wave_header = _WAVE_HEADER.pack(
+        0, now, now, npnts, wtype, 0, b"", 1, name, 0, 0,
+        npnts, 0, 0, 0,  # nDim
+        float(nmdata.xscale.delta), 1.0, 1.0, 1.0,  # sfA
+        float(nmdata.xscale.start), 0.0, 0.0, 0.0,  # sfB
+        data_units, x_units,  # dataUnits, dimUnits[4][4]
+        0, 0, 0.0, 0.0,  # fsValid, whpad3, topFullScale, botFullScale
+        0, 0, 0, 0, 0, 0, 0, 0, 0,  # dataEUnits, dimEUnits, dimLabels
+        0, *([0] * 16),  # waveNoteH, whUnused
+        0, 0, 0, 0, 0,  # aModified, wModified, swModified, useBits, kind
+        0, 0, 0, 0, 0, 0,  # formula, depID, whpad4, srcFldr, fileName, sIdx
+    )
+    bin_header = _BIN_HEADER.pack(
+        5, 0, wfm_size, 0, len(note), len(data_eunits),
+        len(x_eunits), 0, 0, 0,  # dimEUnitsSize
+        0, 0, 0, 0,  # dimLabelsSize
+        len(sindices), 0, 0,
+    )
+    header = bin_header + wave_header
+    checksum = -int(np.frombuffer(header, dtype="<i2").sum()) & 0xFFFF
+    header = struct.pack("<hH", 5, checksum) + header[4:]
+
+    return b"".join((header, data, note, data_eunits, x_eunits, sindices))
+
+
+def _units(units: str) -> tuple[bytes, bytes]:
+    """Split units into (header units, extended units) for a wave header."""
+    if not isinstance(units, str):
+        units = "" if units is None else str(units)
+    b = units.encode("utf-8")
+    if len(b) > _MAX_UNIT_CHARS:
+        return b"", b
+    return b, b""
+
@@ -10,53 +10,141 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+import numpy as np
+
+import pyneuromatic.core.nm_utilities as nmu
+
 if TYPE_CHECKING:
     from pyneuromatic.core.nm_folder import NMFolder
 
+# number of values formatted per write
+_BLOCK_SIZE = 65536
+
 
 def write_itx(
     folder: "NMFolder",
     filepath: str | Path,
+    multicolumn: bool = False,
+    precision: int | None = None,
+    compress: bool | None = None,
 ) -> Path:
     """Write NMFolder data to an Igor Text file.
 
+    Values are formatted a block of samples at a time with printf-style
+    formats ("%d" for integers, "%.17g" for float64, "%.9g" for float32,
+    so values read back exactly).
+
     Args:
         folder: NMFolder containing data to export.
-        filepath: Output file path (.itx).
+        filepath: Output file path (.itx, or .itx.gz).
+        multicolumn: If True, consecutive waves of equal length and dtype
+            are written as columns of one WAVES block (Igor loads them
+            as separate waves) rather than one block per wave.
+        precision: Significant digits for floating-point values. Default
+            None for exact values (17 for float64, 9 for float32).
+        compress: If True, write a gzip-compressed file (level 1, for
+            speed). Default None compresses if filepath ends with ".gz".
 
     Returns:
         Path to the written file.
     """
     filepath = Path(filepath)
+    if precision is not None:
+        if isinstance(precision, bool) or not isinstance(precision, int):
+            e = nmu.type_error_str(precision, "precision", "integer")
+            raise TypeError(e)
+        if precision < 1:
+            raise ValueError("precision: %s" % precision)
+    if compress is None:
+        compress = filepath.suffix.lower() == ".gz"
 
-    with open(filepath, "w") as f:
-        f.write("IGOR\n")
-
-        for name in folder.data:
-            nmdata = folder.data[name]
-            if nmdata.nparray is None:
+    # blocks of (names, arrays) written as one WAVES block each
+    blocks: list[tuple[list[str], list[np.ndarray]]] = []
+    for name in folder.data:
+        nmdata = folder.data[name]
+        nparray = nmdata.nparray
+        if nparray is None:
+            continue
+        nparray = np.ravel(nparray)
+        if multicolumn and blocks:
+            arrays = blocks[-1][1]
+            if (
+                nparray.size == arrays[0].size
+                and nparray.dtype == arrays[0].dtype
+                and _value_format(nparray.dtype, precision) is not None
+            ):
+                blocks[-1][0].append(name)
+                arrays.append(nparray)
                 continue
+        blocks.append(([name], [nparray]))
+
+    if compress:
+        import gzip
+
+        f = gzip.open(filepath, "wt", compresslevel=1)
+    else:
+        f = open(filepath, "w")
 
-            f.write(f"WAVES/D\t{name}\n")
+    with f:
+        f.write("IGOR\n")
+
+        for names, arrays in blocks:
+            f.write("WAVES/D\t%s\n" % "\t".join(names))
             f.write("BEGIN\n")
-            for val in nmdata.nparray:
-                f.write(f"\t{val}\n")
+            fmt = _value_format(arrays[0].dtype, precision)
+            _write_values(f, arrays, fmt)
             f.write("END\n")
 
-            # x scaling: SetScale/P x, offset, delta, "units", waveName
-            x_start = nmdata.xscale.start
-            x_delta = nmdata.xscale.delta
-            x_units = nmdata.xscale.units
-            f.write(
-                f'X SetScale/P x, {x_start}, {x_delta},'
-                f' "{x_units}", {name}\n'
-            )
-
-            # y units: SetScale d, 0, 0, "units", waveName
-            y_units = nmdata.yscale.units
-            f.write(
-                f'X SetScale d, 0, 0,'
-                f' "{y_units}", {name}\n'
-            )
+            for name in names:
+                nmdata = folder.data[name]
+
+                # x scaling: SetScale/P x, offset, delta, "units", waveName
+                x_start = nmdata.xscale.start
+                x_delta = nmdata.xscale.delta
+                x_units = nmdata.xscale.units
+                f.write(
+                    f'X SetScale/P x, {x_start}, {x_delta},'
+                    f' "{x_units}", {name}\n'
+                )
+
+                # y units: SetScale d, 0, 0, "units", waveName
+                y_units = nmdata.yscale.units
+                f.write(
+                    f'X SetScale d, 0, 0,'
+                    f' "{y_units}", {name}\n'
+                )
 
     return filepath
+
+
+def _value_format(dtype: np.dtype, precision: int | None) -> str | None:
+    """printf-style format for values of dtype, or None if not numeric."""
+    if dtype.kind in "iub":
+        return "%d"
+    if dtype.kind == "f":
+        if precision is None:
+            precision = 9 if dtype.itemsize <= 4 else 17
+        return "%%.%dg" % precision
+    return None
+
+
+def _write_values(f, arrays: list[np.ndarray], fmt: str | None) -> None:
+    """Write the rows of a WAVES block, one column per array."""
+    n = arrays[0].size
+    if fmt is None:
+        # non-numeric (single column): str() of each value
+        values = arrays[0]
+        for i in range(0, n, _BLOCK_SIZE):
+            f.write("".join(f"\t{val}\n" for val in values[i:i + _BLOCK_SIZE]))
+        return None
+    ncols = len(arrays)
+    row = ("\t" + fmt) * ncols + "\n"
+    nrows = max(_BLOCK_SIZE // ncols, 1)
+    for i in range(0, n, nrows):
+        if ncols == 1:
+            block = arrays[0][i:i + nrows]
+        else:
+            block = np.column_stack([a[i:i + nrows] for a in arrays])
+        values = block.ravel().tolist()
+        f.write((row * (len(values) // ncols)) % tuple(values))
+    return None
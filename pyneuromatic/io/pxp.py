@@ -19,26 +19,44 @@ if TYPE_CHECKING:
     from pyneuromatic.core.nm_folder import NMFolder
 
 from pyneuromatic.io.base import parse_units_from_label, make_data_name
+from pyneuromatic.io.cache import get_import_cache
 import pyneuromatic.core.nm_utilities as nmu
 
+# packed experiment record types (PTN003)
+_VARIABLES_RECORD = 1
+_WAVE_RECORD = 3
+_FOLDER_START_RECORD = 9
+_FOLDER_END_RECORD = 10
+
+# binary wave version -> (offset, size) of the wave name (TN003)
+_WAVE_NAME_OFFSETS = {1: (14, 20), 2: (22, 20), 3: (26, 20), 5: (92, 32)}
+_WAVE_NAME_END = 124
+
 
 def read_pxp(
     filepath: str | Path,
     folder: "NMFolder | None" = None,
     prefix: str | None = None,
     make_dataseries: bool = True,
+    channels: list[str] | None = None,
 ) -> "NMFolder":
     """Read an Igor Pro PXP file into an NMFolder.
 
     Reads packed experiment files created by NeuroMatic in Igor Pro.
     Requires the igor2 library (pip install igor2).
 
+    Records are read one at a time. Only waves whose names match prefix
+    (and channels) are decoded, one at a time as each NMData is created,
+    so other waves in the experiment (e.g. analysis results) cost only a
+    seek past their record.
+
     Args:
         filepath: Path to the PXP file.
         folder: Optional existing folder to add data to. If None, creates new.
         prefix: Prefix for data names. If None, auto-detects from file's
             WavePrefix variable (falls back to "Record").
         make_dataseries: If True, automatically create dataseries from data.
+        channels: Channel characters to read (e.g. ["A"]), or None for all.
 
     Returns:
         NMFolder containing the imported data.
@@ -48,7 +66,7 @@ def read_pxp(
         ImportError: If igor2 is not installed.
     """
     try:
-        import igor2.packed as igor_packed
+        import igor2.packed  # noqa: F401
     except ImportError:
         raise ImportError(
             "igor2 is required to read PXP files. "
@@ -60,6 +78,17 @@ def read_pxp(
     if not filepath.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
 
+    # serve repeated reads from the import cache (see io.cache)
+    cache = get_import_cache() if folder is None else None
+    if cache is not None:
+        cache_key = cache.key(
+            filepath, "read_pxp", prefix=prefix,
+            make_dataseries=make_dataseries, channels=channels,
+        )
+        cached = cache.get(cache_key, lazy=False, filepath=filepath)
+        if cached is not None:
+            return cached
+
     # Import here to avoid circular imports
     from pyneuromatic.core.nm_folder import NMFolder
 
@@ -72,27 +101,153 @@ def read_pxp(
             folder_name = "F" + folder_name
         folder = NMFolder(name=folder_name)
 
-    # Load the PXP file
-    records, _ = igor_packed.load(str(filepath))
+    # Walk records, extracting metadata and locating wave records
+    # (waves are not decoded yet, see _scan_pxp)
+    with open(filepath, "rb") as f:
+        waves = _scan_pxp(f, folder.metadata)
+
+        # Resolve prefix
+        if prefix is None:
+            root_meta = folder.metadata.get("root", {})
+            prefix = root_meta.get("WavePrefix", "Record")
+
+        # Find the yLabel text wave for y-axis labels/units
+        y_labels = []
+        for wave_name, offset, size in waves:
+            if wave_name == "yLabel":
+                y_labels = _ylabel_list(_load_wave(f, offset, size))
+                break
+
+        # Get x-units from root variables
+        root_meta = folder.metadata.get("root", {})
+        x_units = root_meta.get("xLabel", "ms")
+
+        # Decode data waves one at a time; build matches dict as we go
+        matches = {}
+        for wave_name, offset, size in waves:
+            # Parse using NeuroMatic naming convention
+            parsed = nmu.parse_data_name(wave_name)
+            if parsed is None:
+                continue
+
+            wave_prefix, channel_char, epoch_num = parsed
+            if wave_prefix != prefix:
+                continue
+            if channels is not None and channel_char not in channels:
+                continue
+
+            channel_num = ord(channel_char) - ord("A")
+
+            # Build the data name using the requested prefix
+            name = make_data_name(prefix, channel_num, epoch_num)
+
+            wave = _load_wave(f, offset, size)
+            wave_header = wave["wave_header"]
+
+            # Build scale dicts
+            if "sfA" in wave_header:  # version 5 wave header
+                x_start = wave_header["sfB"][0]
+                x_delta = wave_header["sfA"][0]
+            else:
+                x_start = wave_header.get("hsB", 0.0)
+                x_delta = wave_header.get("hsA", 1.0)
+            xscale = {
+                "start": float(x_start),
+                "delta": float(x_delta),
+                "units": x_units,
+            }
+            yscale = None
+            if channel_num < len(y_labels):
+                y_parsed = parse_units_from_label(y_labels[channel_num])
+                yscale = {"label": y_parsed.label, "units": y_parsed.units}
+
+            # Create NMData
+            data = folder.data.new(name, xscale=xscale, yscale=yscale)
+            if data is None:
+                continue
+
+            # Set y data
+            data.nparray = wave["wData"]
+
+            matches[(channel_char, epoch_num)] = data
+
+    # Optionally create dataseries directly from the matches dict
+    if make_dataseries and matches:
+        folder.build_dataseries(prefix, matches)
+
+    if cache is not None:
+        cache.put(cache_key, folder)
+
+    return folder
+
+
+def _scan_pxp(f, metadata: dict) -> list[tuple[str, int, int]]:
+    """Walk the records of a PXP file without decoding waves.
+
+    Folder and variables records are decoded, with variables merged into
+    metadata (keyed by Igor data folder). Wave records are skipped after
+    reading the wave name from their header.
+
+    Returns:
+        List of (wave name, file offset, size) of wave records, in file
+        order, for _load_wave().
+    """
+    from igor2.packed import (
+        PACKEDRECTYPE_MASK, setup_packed_file_record_header
+    )
+    from igor2.record import RECORD_TYPE
+    from igor2.util import byte_order, need_to_reorder_bytes
 
-    # Walk records, extracting metadata and collecting wave records
-    wave_records = []
+    waves = []
     folder_stack = ["root"]
+    order = None  # record byte order, from the first nonzero version
+    header_struct = setup_packed_file_record_header(byte_order="=")
+
+    while True:
+        b = f.read(header_struct.size)
+        if not b:
+            break
+        if len(b) < header_struct.size:
+            raise ValueError("not enough data for the next record header")
+        header = header_struct.unpack_from(b)
+        if header["version"] and order is None:
+            reorder = need_to_reorder_bytes(header["version"])
+            order = byte_order(reorder)
+            if reorder:
+                header_struct = setup_packed_file_record_header(
+                    byte_order=order)
+                header = header_struct.unpack_from(b)
+        rtype = header["recordType"] & PACKEDRECTYPE_MASK
+        nbytes = header["numDataBytes"]
+        offset = f.tell()
+
+        if rtype == _WAVE_RECORD:
+            wave_name = _wave_name(f.read(min(nbytes, _WAVE_NAME_END)))
+            waves.append((wave_name, offset, nbytes))
+            f.seek(offset + nbytes)
+            continue
+
+        if rtype not in (_VARIABLES_RECORD, _FOLDER_START_RECORD,
+                         _FOLDER_END_RECORD):
+            f.seek(nbytes, 1)  # history, procedures, etc.
+            continue
 
-    for record in records:
-        rtype = type(record).__name__
+        data = f.read(nbytes)
+        if len(data) < nbytes:
+            raise ValueError("not enough data for the next record")
+        record = RECORD_TYPE[rtype](header, data, byte_order=order)
 
-        if rtype == "FolderStartRecord":
+        if rtype == _FOLDER_START_RECORD:
             name = record.null_terminated_text
             if isinstance(name, bytes):
                 name = name.decode("utf-8").rstrip("\x00")
             folder_stack.append(name)
 
-        elif rtype == "FolderEndRecord":
+        elif rtype == _FOLDER_END_RECORD:
             if len(folder_stack) > 1:
                 folder_stack.pop()
 
-        elif rtype == "VariablesRecord":
+        else:
             current_folder = folder_stack[-1]
             variables = record.variables.get("variables", {})
             user_vars = variables.get("userVars", {})
@@ -100,106 +255,48 @@ def read_pxp(
 
             # Merge vars and strings into metadata
             if user_vars or user_strs:
-                if current_folder not in folder.metadata:
-                    folder.metadata[current_folder] = {}
+                if current_folder not in metadata:
+                    metadata[current_folder] = {}
                 for k, v in user_vars.items():
                     key = k.decode("utf-8") if isinstance(k, bytes) else k
-                    folder.metadata[current_folder][key] = v
+                    metadata[current_folder][key] = v
                 for k, v in user_strs.items():
                     key = k.decode("utf-8") if isinstance(k, bytes) else k
                     val = v.decode("utf-8") if isinstance(v, bytes) else v
-                    folder.metadata[current_folder][key] = val
-
-        elif rtype == "WaveRecord":
-            wave_records.append(record)
-
-    # Resolve prefix
-    if prefix is None:
-        root_meta = folder.metadata.get("root", {})
-        prefix = root_meta.get("WavePrefix", "Record")
-
-    # Find the yLabel text wave for y-axis labels/units
-    y_labels = _find_ylabel_wave(wave_records)
-
-    # Get x-units from root variables
-    root_meta = folder.metadata.get("root", {})
-    x_units = root_meta.get("xLabel", "ms")
-
-    # Process data wave records; build matches dict as we go
-    matches = {}
-    for record in wave_records:
-        wave = record.wave["wave"]
-        wave_header = wave["wave_header"]
-
-        bname = wave_header["bname"]
-        if isinstance(bname, bytes):
-            wave_name = bname.decode("utf-8").rstrip("\x00")
-        else:
-            wave_name = str(bname).rstrip("\x00")
+                    metadata[current_folder][key] = val
 
-        # Parse using NeuroMatic naming convention
-        parsed = nmu.parse_data_name(wave_name)
-        if parsed is None:
-            continue
+    return waves
 
-        wave_prefix, channel_char, epoch_num = parsed
-        if wave_prefix != prefix:
-            continue
 
-        channel_num = ord(channel_char) - ord("A")
-
-        # Build the data name using the requested prefix
-        name = make_data_name(prefix, channel_num, epoch_num)
-
-        # Build scale dicts
-        xscale = {
-            "start": float(wave_header.get("hsB", 0.0)),
-            "delta": float(wave_header.get("hsA", 1.0)),
-            "units": x_units,
-        }
-        yscale = None
-        if channel_num < len(y_labels):
-            y_parsed = parse_units_from_label(y_labels[channel_num])
-            yscale = {"label": y_parsed.label, "units": y_parsed.units}
-
-        # Create NMData
-        data = folder.data.new(name, xscale=xscale, yscale=yscale)
-        if data is None:
-            continue
+def _wave_name(b: bytes) -> str:
+    """Name of an Igor binary wave, from the start of its file contents."""
+    if len(b) < 2:
+        return ""
+    version = int.from_bytes(b[:2], "little")
+    if version & 0xFF == 0:
+        version >>= 8  # big-endian
+    if version not in _WAVE_NAME_OFFSETS:
+        return ""
+    i, n = _WAVE_NAME_OFFSETS[version]
+    name = b[i:i + n].split(b"\x00", 1)[0]
+    return name.decode("utf-8", errors="replace")
 
-        # Set y data
-        data.nparray = wave["wData"]
 
-        matches[(channel_char, epoch_num)] = data
+def _load_wave(f, offset: int, size: int) -> dict:
+    """Decode the Igor binary wave of a wave record (see _scan_pxp)."""
+    import io
+    from igor2.binarywave import load
 
-    # Optionally create dataseries directly from the matches dict
-    if make_dataseries and matches:
-        folder.build_dataseries(prefix, matches)
-
-    return folder
+    f.seek(offset)
+    return load(io.BytesIO(f.read(size)))["wave"]
 
 
-def _find_ylabel_wave(wave_records: list) -> list[str]:
-    """Find and parse the yLabel text wave from PXP records.
-
-    Returns list of y-axis label strings, one per channel.
-    """
-    for record in wave_records:
-        wave = record.wave["wave"]
-        bname = wave["wave_header"]["bname"]
-        if isinstance(bname, bytes):
-            name = bname.decode("utf-8").rstrip("\x00")
+def _ylabel_list(wave: dict) -> list[str]:
+    """Parse the yLabel text wave: y-axis label strings, one per channel."""
+    labels = []
+    for item in wave["wData"]:
+        if isinstance(item, bytes):
+            labels.append(item.decode("utf-8").rstrip("\x00"))
         else:
-            name = str(bname).rstrip("\x00")
-
-        if name == "yLabel":
-            wdata = wave["wData"]
-            labels = []
-            for item in wdata:
-                if isinstance(item, bytes):
-                    labels.append(item.decode("utf-8").rstrip("\x00"))
-                else:
-                    labels.append(str(item).rstrip("\x00"))
-            return labels
-
-    return []
+            labels.append(str(item).rstrip("\x00"))
+    return labels
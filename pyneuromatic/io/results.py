@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar export of tool results.
+
+Turns a folder.toolresults entry, or the NMData arrays of an NMToolFolder,
+into one table (a dict of equal-length column arrays) and writes it in one
+shot to .npz, .csv or (if pyarrow is installed) .parquet.
+
+Part of pyNeuroMatic, a Python implementation of NeuroMatic for analyzing,
+acquiring and simulating electrophysiology data.
+
+Example:
+    >>> table = results_table(folder.toolresults["stats"][-1]["results"],
+    ...                       levels=("window", "run", "row"))
+    >>> write_table(table, "stats.csv")
+"""
+from __future__ import annotations
+import operator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+import pyneuromatic.core.nm_utilities as nmu
+
+if TYPE_CHECKING:
+    from pyneuromatic.core.nm_folder import NMFolder
+    from pyneuromatic.tools.nm_tool_folder import NMToolFolder
+
+# names of the nesting levels of each tool's results (see results_table)
+RESULTS_LEVELS: dict[str, tuple[str, ...]] = {
+    "stats": ("window", "run", "row"),
+    "stats2": ("data",),
+    "spike": ("epoch",),
+    "event": ("epoch",),
+    "fit": ("epoch",),
+}
+
+# number of rows formatted per write (CSV)
+_BLOCK_SIZE = 65536
+
+_SCALARS = (bool, int, float, str, np.bool_, np.number)
+# exact scalar types (and None), for a fast check of common values
+_SCALAR_TYPES = frozenset((
+    type(None), bool, int, float, str, np.bool_, np.int64, np.int32,
+    np.float64, np.float32,
+))
+
+
+def results_table(
+    results: Any,
+    levels: tuple[str, ...] | list[str] = (),
+) -> dict[str, np.ndarray]:
+    """Flatten nested tool results into columns.
+
+    Results are walked depth-first. Each dict with scalar values becomes a
+    row. A nested dict of scalars (e.g. func={"name": "mean"}) adds
+    columns named "key" (for its "name") and "key.subkey". A dict with
+    1-D arrays of equal length (e.g. event times) becomes one row per
+    array element, with an "index" column; a bare array (e.g. spike times)
+    becomes one row per element with "index" and "value" columns.
+
+    The dict keys and list indexes leading to a row are added as columns
+    named by levels (e.g. ("epoch",) for {epoch: {...}}); unnamed levels
+    are named "level0", "level1", etc. Dicts at named levels are always
+    walked key by key, so {epoch: times} gives an "epoch" column rather
+    than one column per epoch. Arrays of a dict that differ in length from
+    the others (e.g. event rejects) become rows of their own.
+
+    Args:
+        results: Results, e.g. folder.toolresults["stats"][-1]["results"].
+        levels: Column names of the nesting levels (see RESULTS_LEVELS).
+
+    Returns:
+        Dict of column name -> array, all of the same length. Numeric
+        columns are int64 (float64 if any values are missing, as NaN),
+        other columns are strings ("" if missing).
+    """
+    if not isinstance(levels, (tuple, list)):
+        e = nmu.type_error_str(levels, "levels", "tuple or list")
+        raise TypeError(e)
+    levels = list(levels)
+    rows: list[dict] = []
+
+    # (keys, value types) of a dict -> keys of its nested dicts of scalars,
+    # or None if the dict has other values (arrays, lists, etc.)
+    plans: dict[tuple, tuple | None] = {}
+
+    def level(depth: int) -> str:
+        if depth < len(levels):
+            return levels[depth]
+        return "level%d" % depth
+
+    def plan(obj: dict) -> tuple | None:
+        nested = []
+        for k, v in obj.items():
+            if v is None or isinstance(v, _SCALARS):
+                continue
+            if isinstance(v, dict):
+                nested.append(k)
+                continue
+            return None
+        return tuple(nested)
+
+    def walk(obj, keys: dict, depth: int) -> None:
+        if depth < len(levels) and isinstance(obj, dict):
+            name = levels[depth]  # e.g. {epoch: {...}}
+            for k, v in obj.items():
+                walk(v, {**keys, name: k}, depth + 1)
+        elif isinstance(obj, dict):
+            sig = (tuple(obj), tuple(map(type, obj.values())))
+            if sig not in plans:
+                plans[sig] = plan(obj)
+            nested = plans[sig]
+            if nested is not None and (not nested or all(
+                _SCALAR_TYPES.issuperset(map(type, obj[k].values()))
+                for k in nested
+            )):
+                # scalars and nested dicts of scalars (the common case)
+                row = {**keys, **obj}
+                for k in nested:
+                    for k2, v2 in row.pop(k).items():
+                        row[k if k2 == "name" else "%s.%s" % (k, k2)] = v2
+                if len(row) > len(keys):
+                    rows.append(row)
+                return None
+            row = dict(keys)
+            arrays = {}
+            rest = []
+            for k, v in obj.items():
+                if v is None or isinstance(v, _SCALARS):
+                    row[k] = v
+                elif isinstance(v, dict) and all(
+                    x is None or isinstance(x, _SCALARS) for x in v.values()
+                ):
+                    for k2, v2 in v.items():
+                        row[k if k2 == "name" else "%s.%s" % (k, k2)] = v2
+                elif _is_vector(v):
+                    arrays[k] = v
+                else:
+                    rest.append((k, v))
+            if arrays:
+                # arrays of the most common length are columns of one table
+                sizes = [len(a) for a in arrays.values()]
+                size = max(sizes, key=sizes.count)
+                for k in list(arrays):
+                    if len(arrays[k]) != size:
+                        rest.append((k, arrays.pop(k)))
+                columns = {k: np.asarray(a).tolist()
+                           for k, a in arrays.items()}
+                for i in range(size):
+                    r = dict(row)
+                    r["index"] = i
+                    for k, c in columns.items():
+                        r[k] = c[i]
+                    rows.append(r)
+            elif len(row) > len(keys):
+                rows.append(row)
+            name = level(depth)
+            for k, v in rest:
+                walk(v, {**keys, name: k}, depth + 1)
+        elif isinstance(obj, (list, tuple)) and not (
+            obj and type(obj[0]) in _SCALAR_TYPES and _is_vector(obj)
+        ):
+            name = level(depth)
+            for i, v in enumerate(obj):
+                walk(v, {**keys, name: i}, depth + 1)
+        elif _is_vector(obj):
+            for i, v in enumerate(np.asarray(obj).tolist()):
+                rows.append({**keys, "index": i, "value": v})
+
+    walk(results, {}, 0)
+    return _columns(rows)
+
+
+def toolresults_table(
+    folder: "NMFolder",
+    tool: str,
+    index: int = -1,
+) -> dict[str, np.ndarray]:
+    """Table of a folder.toolresults entry (see results_table).
+
+    Args:
+        folder: NMFolder with toolresults.
+        tool: Tool name, e.g. "stats".
+        index: Entry of folder.toolresults[tool] (default -1, the last).
+
+    Returns:
+        Dict of column name -> array.
+    """
+    if tool not in folder.toolresults:
+        raise KeyError("tool not found in toolresults: %s" % tool)
+    entry = folder.toolresults[tool][index]
+    return results_table(entry["results"], RESULTS_LEVELS.get(tool, ()))
+
+
+def toolfolder_table(
+    toolfolder: "NMToolFolder",
+    names: list[str] | None = None,
+) -> dict[str, np.ndarray]:
+    """Table of the NMData arrays of an NMToolFolder (e.g. ST_ arrays).
+
+    Args:
+        toolfolder: NMToolFolder whose data are the columns.
+        names: Names of the NMData to include, or None for all 1-D
+            arrays.
+
+    Returns:
+        Dict of NMData name -> array.
+
+    Raises:
+        KeyError: If a name does not exist.
+        ValueError: If the arrays differ in length.
+    """
+    table = {}
+    if names is None:
+        names = list(toolfolder.data)
+    for name in names:
+        d = toolfolder.data.get(name)
+        if d is None:
+            raise KeyError("data '%s' does not exist" % name)
+        a = d.nparray
+        if a is None or a.ndim != 1:
+            continue
+        if a.dtype.kind == "O":
+            a = a.astype(str)
+        table[name] = a
+    sizes = set(a.size for a in table.values())
+    if len(sizes) > 1:
+        raise ValueError(
+            "arrays differ in length (%s); pass names to select columns"
+            % ", ".join(str(n) for n in sorted(sizes))
+        )
+    return table
+
+
+def write_table(
+    table: dict[str, np.ndarray],
+    filepath: str | Path,
+    fmt: str | None = None,
+) -> Path:
+    """Write a table of columns to .npz, .csv or .parquet.
+
+    Args:
+        table: Dict of column name -> 1-D array, all of the same length.
+        filepath: Output file path.
+        fmt: "npz", "csv" or "parquet". Default None uses the file suffix.
+
+    Returns:
+        Path to the written file.
+
+    Raises:
+        ValueError: If the format is not supported or columns differ in
+            length.
+        ImportError: For parquet, if pyarrow is not installed.
+    """
+    filepath = Path(filepath)
+    if fmt is None:
+        fmt = filepath.suffix.lower().lstrip(".")
+    if not isinstance(fmt, str):
+        raise TypeError(nmu.type_error_str(fmt, "fmt", "string"))
+    fmt = fmt.lower()
+    columns = {k: np.asarray(v) for k, v in table.items()}
+    if len(set(a.shape for a in columns.values())) > 1:
+        raise ValueError("table columns differ in length")
+
+    if fmt == "npz":
+        np.savez(filepath, **columns)
+        if filepath.suffix.lower() != ".npz":
+            filepath = filepath.with_name(filepath.name + ".npz")
+    elif fmt == "csv":
+        _write_csv(columns, filepath)
+    elif fmt == "parquet":
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required to write Parquet files. "
+                "Install it with: pip install pyarrow"
+            )
+        pyarrow.parquet.write_table(pyarrow.table(columns), filepath)
+    else:
+        raise ValueError("unsupported table format: %s" % fmt)
+    return filepath
+
+
+def _is_vector(value) -> bool:
+    """True for 1-D numeric arrays and lists of numbers."""
+    if isinstance(value, np.ndarray):
+        return value.ndim == 1 and value.dtype.kind in "biuf"
+    if isinstance(value, (list, tuple)) and value:
+        return all(
+            isinstance(v, (int, float, np.number)) and
+            not isinstance(v, (bool, np.bool_))
+            for v in value
+        )
+    return False
+
+
+def _columns(rows: list[dict]) -> dict[str, np.ndarray]:
+    """Convert rows (dicts) to columns, typed as in results_table."""
+    keys: dict = {}
+    for r in rows:
+        keys.update(r)
+    table = {}
+    for k in keys:
+        values = list(map(operator.methodcaller("get", k), rows))
+        types = set(map(type, values))
+        missing = type(None) in types
+        types.discard(type(None))
+        if types and all(issubclass(t, (bool, np.bool_)) for t in types):
+            if missing:
+                values = [np.nan if v is None else float(v) for v in values]
+                table[k] = np.array(values, dtype=np.float64)
+            else:
+                table[k] = np.array(values, dtype=bool)
+        elif types and all(
+            issubclass(t, (int, np.integer)) and
+            not issubclass(t, (bool, np.bool_)) for t in types
+        ) and not missing:
+            table[k] = np.array(values, dtype=np.int64)
+        elif types and all(
+            issubclass(t, (int, float, np.number)) for t in types
+        ):
+            table[k] = np.array(
+                [np.nan if v is None else v for v in values],
+                dtype=np.float64,
+            )
+        else:
+            table[k] = np.array(
+                ["" if v is None else str(v) for v in values], dtype=str
+            )
+    return table
+
+
+def _write_csv(columns: dict[str, np.ndarray], filepath: Path) -> None:
+    """Write columns as CSV, a block of rows at a time."""
+    names = list(columns)
+    arrays = []
+    fmts = []
+    for name in names:
+        a = columns[name]
+        if a.dtype.kind in "iub":
+            fmts.append("%d")
+        elif a.dtype.kind == "f":
+            fmts.append("%.17g")
+        else:
+            a = a.astype(str)
+            if any(c in "\x00".join(a.tolist()) for c in ',"\n\r'):
+                a = np.array([_csv_quote(v) for v in a.tolist()], dtype=str)
+            fmts.append("%s")
+        arrays.append(a)
+    row = ",".join(fmts) + "\n"
+    n = arrays[0].size if arrays else 0
+    with open(filepath, "w", newline="") as f:
+        f.write(",".join(_csv_quote(name) for name in names) + "\n")
+        for i in range(0, n, _BLOCK_SIZE):
+            block = [a[i:i + _BLOCK_SIZE].tolist() for a in arrays]
+            values = [v for r in zip(*block) for v in r]
+            f.write((row * len(block[0])) % tuple(values))
+
+
+def _csv_quote(s: str) -> str:
+    if any(c in s for c in ',"\n\r'):
+        return '"' + s.replace('"', '""') + '"'
+    return s
@@ -63,6 +63,35 @@ def _epochs_repr(epochs: list[int]) -> str:
     return repr(epochs)
 
 
+def _stack_rows(arrays: list[np.ndarray], n_points: int) -> np.ndarray:
+    """Stack 1-D arrays, truncated to n_points, as rows of a 2-D array.
+
+    If the arrays are evenly spaced rows of one buffer (e.g. the rows of
+    an NMChannel matrix, see NMChannel.matrix_build), returns a read-only
+    view of the buffer without copying.
+    """
+    a0 = arrays[0]
+    base = a0.base
+    if base is not None and len(arrays) > 1:
+        step = arrays[1].ctypes.data - a0.ctypes.data
+        if step > 0 and all(
+            a.base is base
+            and a.dtype == a0.dtype
+            and a.ndim == 1
+            and a.strides == a0.strides
+            and len(a) >= n_points
+            and a.ctypes.data == a0.ctypes.data + i * step
+            for i, a in enumerate(arrays)
+        ):
+            return np.lib.stride_tricks.as_strided(
+                a0,
+                shape=(len(arrays), n_points),
+                strides=(step, a0.strides[0]),
+                writeable=False,
+            )
+    return np.stack([a[:n_points] for a in arrays])
+
+
 # =========================================================================
 # Base class
 # =========================================================================
@@ -2826,7 +2855,8 @@ class NMMainOpAccumulate(NMMainOp):
             self._xscales[channel_name] = data.xscale.to_dict()
             self._yscales[channel_name] = data.yscale.to_dict()
 
-        self._accum[channel_name].append(data.nparray.astype(float).copy())
+        # no copy for float rows, so matrix rows can be stacked zero-copy
+        self._accum[channel_name].append(np.asarray(data.nparray, dtype=float))
         self._data_names.setdefault(channel_name, []).append(data.name)
 
     def _epoch_str(self, cname: str) -> str:
@@ -2891,7 +2921,7 @@ class NMMainOpAccumulate(NMMainOp):
             arrays: List of accumulated arrays for this channel.
         """
         min_len = min(len(a) for a in arrays)
-        stack = np.stack([a[:min_len] for a in arrays])
+        stack = _stack_rows(arrays, min_len)
         n = len(arrays)
         epoch_str = self._epoch_str(cname)
         arr = self._reduce(stack)
@@ -3013,7 +3043,7 @@ class NMMainOpAverage(NMMainOpAccumulate):
         base_main = self._out_prefix + pfx + cname
         suffix = main_out_name[len(base_main):]  # "" or "_0", "_1", ...
         min_len = min(len(a) for a in arrays)
-        stack = np.stack([a[:min_len] for a in arrays])
+        stack = _stack_rows(arrays, min_len)
         n = len(arrays)
         epoch_str = self._epoch_str(cname)
         std_fn = np.nanstd if self._ignore_nans else np.std
@@ -3178,7 +3208,9 @@ class NMMainOpConcatenate(NMMainOpAccumulate):
     ) -> None:
         if self._mode == "1d":
             arr = np.concatenate(arrays)
-        else:  # "2d"
+        elif all(len(a) == len(arrays[0]) for a in arrays):  # "2d"
+            arr = _stack_rows(arrays, len(arrays[0])).copy()
+        else:  # "2d", unequal lengths
             max_len = max(len(a) for a in arrays)
             padded = []
             for a in arrays:
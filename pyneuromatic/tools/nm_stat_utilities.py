@@ -387,6 +387,13 @@ def stat(
         raise TypeError(e)
     f = f.lower()
 
+    for xname, xvalue in (("xbgn", xbgn), ("xend", xend)):
+        # get_xindex() also accepts arrays; stat windows are scalar
+        if (isinstance(xvalue, bool)
+                or not isinstance(xvalue, (float, int, np.integer))):
+            e = nmu.type_error_str(xvalue, xname, "float")
+            raise TypeError(e)
+
     found_xarray = isinstance(data.xarray, np.ndarray)
     ysize = data.nparray.size
 
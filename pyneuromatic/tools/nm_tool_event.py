@@ -33,7 +33,9 @@ import pyneuromatic.core.nm_command_history as nmch
 import pyneuromatic.core.nm_configurations as nmc
 import pyneuromatic.core.nm_history as nmh
 import pyneuromatic.core.nm_utilities as nmu
-from pyneuromatic.tools.nm_tool_utilities import find_events_nmdata
+from pyneuromatic.tools.nm_tool_utilities import (
+    _normalize_template, find_events_nmdata,
+)
 import pyneuromatic.core.nm_math as nm_math
 
 _VALID_ALGORITHMS: frozenset[str] = frozenset(
@@ -138,6 +140,10 @@ class NMToolEvent(NMTool):
             Should contain only the event shape — the baseline is prepended
             automatically via *template_baseline*. Not TOML-serializable;
             set directly on the instance.
+        templates: Bank of 1-D numpy templates (algorithm="template"),
+            matched in one pass instead of *template*. Each event is
+            assigned its best-matching template (``EV_template_`` arrays).
+            Not TOML-serializable; set directly on the instance.
         criterion_threshold: Criterion threshold for template matching. Default 4.0.
         template_baseline: Baseline window (x-units) prepended to the template as
             zeros before matching. Detected times are shifted forward by this
@@ -173,6 +179,7 @@ class NMToolEvent(NMTool):
         self.__baseline_avg:  float = 4.0
         self.__baseline_dt:   float = 2.0
         self.__template:          np.ndarray | None = None
+        self.__templates:         list[np.ndarray] | None = None
         self.__criterion_threshold: float = 4.0
         self.__template_baseline:   float = 0.0
         self.__onset_search:  bool  = True
@@ -189,7 +196,8 @@ class NMToolEvent(NMTool):
         self._xbgn = self._config.xbgn
         self._xend = self._config.xend
 
-        # Match criterion cache — keyed by (id(data.nparray), template_baseline)
+        # Match criterion cache — keyed by (id(data.nparray), template_baseline,
+        # id(template), id(templates))
         self._match_criterion_cache_id: tuple | None      = None
         self._match_criterion_cache:    np.ndarray | None = None
 
@@ -198,6 +206,7 @@ class NMToolEvent(NMTool):
         self._onset_times:     list[list[float | None]]    = []
         self._peak_times:      list[list[float | None]]    = []
         self._reject_times:    list[list[float]]           = []
+        self._template_index:  list[list[int | None]]      = []
         self._match_criterion: list[np.ndarray | None]     = []
         self._epoch_names:     list[str]                   = []
         self._detected_xunits: str | None                  = None
@@ -351,6 +360,48 @@ class NMToolEvent(NMTool):
         nmh.history("set template (n=%d)" % n, quiet=quiet)
         nmch.add_nm_command("%s.template = <array n=%d>" % (self._name, n))
 
+    @property
+    def templates(self) -> list[np.ndarray] | None:
+        """Bank of event templates (algorithm='template'), or None.
+
+        When set, the templates are matched in one pass instead of
+        *template*, and each event is assigned its best-matching template.
+        """
+        return self.__templates
+
+    @templates.setter
+    def templates(self, value: list[np.ndarray] | None) -> None:
+        self._templates_set(value)
+
+    def _templates_set(
+        self, value: list[np.ndarray] | None, quiet: bool = nmc.QUIET
+    ) -> None:
+        if value is not None:
+            if not isinstance(value, (list, tuple)):
+                raise TypeError(
+                    nmu.type_error_str(value, "templates", "list or None")
+                )
+            if len(value) == 0:
+                raise ValueError("templates must not be empty")
+            for i, tpl in enumerate(value):
+                if not isinstance(tpl, np.ndarray):
+                    raise TypeError(
+                        nmu.type_error_str(tpl, "templates[%d]" % i,
+                                           "numpy.ndarray")
+                    )
+                if tpl.ndim != 1:
+                    raise ValueError(
+                        "templates[%d] must be 1-D, got shape %s"
+                        % (i, str(tpl.shape))
+                    )
+            value = list(value)
+        self.__templates = value
+        k = len(value) if value is not None else 0
+        nmh.history("set templates (k=%d)" % k, quiet=quiet)
+        nmch.add_nm_command(
+            "%s.templates = <list of %d arrays>" % (self._name, k)
+        )
+
     @property
     def criterion_threshold(self) -> float:
         """Match-criterion detection threshold (algorithm='template'). Default 4.0."""
@@ -602,21 +653,34 @@ class NMToolEvent(NMTool):
         """Return the match template criterion array for *data*, using a cache.
 
         Normalizes ``self.template`` to [0, 1] and calls
-        ``nm_math.match_template()`` only when the data array has changed
-        since the last call (detected via ``id(data.nparray)``).  Returns
-        ``None`` when ``algorithm != "template"`` or ``template`` is unset.
+        ``nm_math.match_template()`` only when the data array or the
+        template has changed since the last call (detected via
+        ``id(data.nparray)`` and the ids of the template arrays).  With a template bank (``self.templates``)
+        each template is normalized and ``nm_math.match_template_bank()``
+        returns a 2-D array, one row per template.  Returns ``None`` when
+        ``algorithm != "template"`` or no template is set.
         """
-        if self.__algorithm != "template" or self.__template is None:
+        if self.__algorithm != "template":
+            return None
+        if self.__template is None and self.__templates is None:
             return None
         arr = data.nparray
         if arr is None:
             return None
-        cache_key = (id(arr), self.__template_baseline)
+        if self.__templates is not None:
+            # key on the template arrays, since the list can be changed in
+            # place through the templates getter
+            tpl_ids = tuple(id(t) for t in self.__templates)
+        else:
+            tpl_ids = None
+        cache_key = (id(arr), self.__template_baseline,
+                     id(self.__template), tpl_ids)
         if cache_key != self._match_criterion_cache_id:
-            tpl = self.__template.astype(float, copy=True)
-            tpl_min, tpl_max = tpl.min(), tpl.max()
-            if tpl_max != tpl_min:
-                tpl = (tpl - tpl_min) / (tpl_max - tpl_min)
+            if self.__templates is not None:
+                tpls = self.__templates
+            else:
+                tpls = [self.__template]
+            tpls = [_normalize_template(t) for t in tpls]
             if self.__template_baseline > 0:
                 xdelta = data.xscale.delta
                 if not xdelta:
@@ -624,8 +688,12 @@ class NMToolEvent(NMTool):
                         "cannot prepend template baseline: xscale.delta is zero or unset"
                     )
                 n_base = max(1, round(self.__template_baseline / xdelta))
-                tpl = np.concatenate([np.zeros(n_base), tpl])
-            self._match_criterion_cache    = nm_math.match_template(arr, tpl)
+                tpls = [np.concatenate([np.zeros(n_base), t]) for t in tpls]
+            if self.__templates is not None:
+                criterion = nm_math.match_template_bank(arr, tpls)
+            else:
+                criterion = nm_math.match_template(arr, tpls[0])
+            self._match_criterion_cache    = criterion
             self._match_criterion_cache_id = cache_key
         return self._match_criterion_cache
 
@@ -650,6 +718,8 @@ class NMToolEvent(NMTool):
             params = "criterion_threshold=%g, template_baseline=%g" % (
                 self.__criterion_threshold, self.__template_baseline,
             )
+            if self.__templates is not None:
+                params += ", templates=%d" % len(self.__templates)
         return (
             "NMEvent(source=%s, algorithm=%r, polarity=%r, %s, "
             "onset_search=%r, peak_search=%r, refractory=%g, "
@@ -671,7 +741,8 @@ class NMToolEvent(NMTool):
 
     def run_init(self) -> bool:
         """Reset internal state and validate template if needed."""
-        if self.__algorithm == "template" and self.__template is None:
+        if (self.__algorithm == "template" and self.__template is None
+                and self.__templates is None):
             raise ValueError(
                 "template must be set before running algorithm='template'"
             )
@@ -679,6 +750,7 @@ class NMToolEvent(NMTool):
         self._onset_times     = []
         self._peak_times      = []
         self._reject_times    = []
+        self._template_index  = []
         self._match_criterion = []
         self._epoch_names     = []
         self._detected_xunits = None
@@ -710,6 +782,7 @@ class NMToolEvent(NMTool):
             baseline_avg=self.__baseline_avg,
             baseline_dt=self.__baseline_dt,
             template=self.__template,
+            templates=self.__templates,
             criterion_threshold=self.__criterion_threshold,
             template_baseline=self.__template_baseline,
             refractory=self.__refractory,
@@ -731,6 +804,7 @@ class NMToolEvent(NMTool):
         self._onset_times.append(res["onset_times"])
         self._peak_times.append(res["peak_times"])
         self._reject_times.append(res["reject_times"])
+        self._template_index.append(res["template_index"])
         self._match_criterion.append(res["match_criterion"])
         self._epoch_names.append(data.name)
         return True
@@ -763,12 +837,13 @@ class NMToolEvent(NMTool):
         xunits = self._detected_xunits or ""
 
         # Store event-shape template (normalized to [0, 1], baseline not included)
-        if self.__algorithm == "template" and self.__template is not None:
-            tpl = self.__template.astype(float, copy=True)
-            tmin, tmax = tpl.min(), tpl.max()
-            if tmax != tmin:
-                tpl = (tpl - tmin) / (tmax - tmin)
-            f.data.new("EV_template", nparray=tpl,
+        bank = self.__algorithm == "template" and self.__templates is not None
+        if bank:
+            for k, tpl in enumerate(self.__templates):
+                f.data.new("EV_template%d" % k, nparray=_normalize_template(tpl),
+                           yscale={"label": "Normalized template", "units": ""})
+        elif self.__algorithm == "template" and self.__template is not None:
+            f.data.new("EV_template", nparray=_normalize_template(self.__template),
                        yscale={"label": "Normalized template", "units": ""})
 
         counts        = np.zeros(len(self._epoch_names), dtype=float)
@@ -817,6 +892,15 @@ class NMToolEvent(NMTool):
                 )
                 self._add_note(d_pk, note)
 
+            # Best-matching template of each event (template bank only)
+            if bank:
+                d_tpl = f.data.new(
+                    "EV_template_" + name,
+                    nparray=np.array(self._template_index[i], dtype=float),
+                    yscale={"label": "Template", "units": ""},
+                )
+                self._add_note(d_tpl, note)
+
             # Rejected detect times
             d_rej = f.data.new(
                 "EV_reject_" + name,
@@ -864,6 +948,9 @@ class NMToolEvent(NMTool):
                 self._reject_times,
             )
         }
+        if self.__algorithm == "template" and self.__templates is not None:
+            for name, ti in zip(self._epoch_names, self._template_index):
+                results[name]["template"] = ti
         self.folder.toolresults_save("event", results)
 
     def _write_results_to_history(self) -> None:
@@ -896,7 +983,8 @@ class NMToolEvent(NMTool):
 
         Returns:
             Dict with keys ``"t_event"``, ``"t_onset"`` (float or None),
-            ``"t_peak"`` (float or None), ``"accepted"`` (bool), and
+            ``"t_peak"`` (float or None), ``"template_index"`` (int, or
+            None without a template bank), ``"accepted"`` (bool), and
             ``"match_criterion"`` (np.ndarray or None for template).
             Returns None if no event is found.
         """
@@ -911,6 +999,7 @@ class NMToolEvent(NMTool):
             baseline_avg=self.__baseline_avg,
             baseline_dt=self.__baseline_dt,
             template=self.__template,
+            templates=self.__templates,
             criterion_threshold=self.__criterion_threshold,
             template_baseline=self.__template_baseline,
             refractory=self.__refractory,
@@ -934,6 +1023,7 @@ class NMToolEvent(NMTool):
                 "t_event":        res["detect_times"][0],
                 "t_onset":        res["onset_times"][0],
                 "t_peak":         res["peak_times"][0],
+                "template_index": res["template_index"][0],
                 "accepted":       True,
                 "match_criterion": res["match_criterion"],
             }
@@ -942,6 +1032,7 @@ class NMToolEvent(NMTool):
                 "t_event":        res["reject_times"][0],
                 "t_onset":        None,
                 "t_peak":         None,
+                "template_index": None,
                 "accepted":       False,
                 "match_criterion": res["match_criterion"],
             }
@@ -67,6 +67,7 @@ class NMToolSpikeConfig(NMToolConfig):
                                "choices": ["level", "level+", "level-"]},
         "xbgn":                 {"type": float, "default": -math.inf},
         "xend":                 {"type": float, "default":  math.inf},
+        "refractory":         {"type": float, "default": 0.0, "min": 0.0},
         "ignore_nans":        {"type": bool,  "default": True},
         "overwrite":          {"type": bool,  "default": True},
         "results_to_history": {"type": bool,  "default": False},
@@ -92,6 +93,9 @@ class NMToolSpike(NMTool):
             ``"level-"`` (falling), or ``"level"`` (both).
         xbgn: X-axis window start. Default ``-inf`` (no lower bound).
         xend: X-axis window end. Default ``+inf`` (no upper bound).
+        refractory: Minimum interval between spikes (x-units). Crossings
+            less than this after the preceding crossing are dropped.
+            Default 0.0 (keep all crossings).
         ignore_nans: If True (default), detect crossings across NaN gaps
             via linear interpolation.
         results_to_history: If True, print spike counts to the history log
@@ -118,6 +122,7 @@ class NMToolSpike(NMTool):
 
         self.__ylevel: float = 0.0
         self.__func_name: str = "level+"
+        self.__refractory: float = 0.0
 
         # Internal run state — reset by run_init()
         self._spike_times: list[np.ndarray] = []
@@ -177,6 +182,32 @@ class NMToolSpike(NMTool):
         nmh.history("set func_name=%r" % self.__func_name, quiet=quiet)
         nmch.add_nm_command("%s.func_name = %r" % (self._name, self.__func_name))
 
+    @property
+    def refractory(self) -> float:
+        """Minimum interval between spikes (x-units)."""
+        return self.__refractory
+
+    @refractory.setter
+    def refractory(self, value: float) -> None:
+        self._refractory_set(value)
+
+    def _refractory_set(self, value: float, quiet: bool = nmc.QUIET) -> None:
+        """Set refractory.
+
+        Args:
+            value: Minimum interval (float >= 0, bool rejected).
+            quiet: If True, suppress history log output.
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(nmu.type_error_str(value, "refractory", "float"))
+        value = float(value)
+        if math.isnan(value) or value < 0:
+            raise ValueError("refractory must be >= 0, got %r" % value)
+        self.__refractory = value
+        nmh.history("set refractory=%g" % self.__refractory, quiet=quiet)
+        nmch.add_nm_command(
+            "%s.refractory = %r" % (self._name, self.__refractory))
+
     # ------------------------------------------------------------------
     # Lifecycle
 
@@ -212,6 +243,7 @@ class NMToolSpike(NMTool):
             xbgn=self._xbgn,
             xend=self._xend,
             ignore_nans=self._ignore_nans,
+            refractory=self.__refractory,
         )
         self._spike_times.append(x_times)
         self._epoch_names.append(data.name)
@@ -651,10 +683,15 @@ class NMToolSpike(NMTool):
 
             post_samples = max(int(round(post / abs(delta_for_samples))), 1)
 
-            for n, spike_x in enumerate(spike_times_arr):
-                # Nearest sample index to spike
-                i_spike = source.get_xindex(spike_x, clip=False)
-                if i_spike is None:
+            # Nearest sample index to each spike (-1 if not found)
+            i_spikes = source.get_xindex(
+                np.asarray(spike_times_arr, dtype=float), clip=False
+            )
+
+            for n, (spike_x, i_spike) in enumerate(
+                zip(spike_times_arr, i_spikes.tolist())
+            ):
+                if i_spike < 0:
                     continue
 
                 i0 = i_spike - pre_samples
@@ -60,6 +60,38 @@ def _sample_rate_from_xscale(data: NMData) -> float:
     return 1.0 / (delta * factor)
 
 
+def _normalize_template(template: np.ndarray) -> np.ndarray:
+    """Copy of *template* scaled to [0, 1] (unchanged if constant)."""
+    tpl = template.astype(float, copy=True)
+    tpl_min = tpl.min()
+    tpl_max = tpl.max()
+    if tpl_max != tpl_min:
+        tpl = (tpl - tpl_min) / (tpl_max - tpl_min)
+    return tpl
+
+
+def _event_templates(
+    criterion: np.ndarray,
+    template_index: np.ndarray,
+    idxs: np.ndarray,
+    thresh: float,
+) -> list[int]:
+    """Best-matching template of each criterion crossing of a template bank.
+
+    For each crossing index, the template is taken at the largest
+    criterion (most negative if *thresh* < 0) from the crossing to the
+    first point back within threshold.
+    """
+    signed = criterion if thresh >= 0 else -criterion
+    level = abs(thresh)
+    within = np.flatnonzero(~(signed >= level))  # NaN counts as within
+    ends = np.append(within, criterion.size)[np.searchsorted(within, idxs + 1)]
+    return [
+        int(template_index[i + np.argmax(signed[i:e])])
+        for i, e in zip(idxs.tolist(), ends.tolist())
+    ]
+
+
 def find_level_crossings_nmdata(
     data: NMData,
     ylevel: float,
@@ -68,6 +100,7 @@ def find_level_crossings_nmdata(
     xend: float = math.inf,
     x_interp: bool = True,
     ignore_nans: bool = True,
+    refractory: float = 0,
 ) -> tuple:
     """Find threshold crossings in an NMData array.
 
@@ -87,6 +120,7 @@ def find_level_crossings_nmdata(
         xend:          Window end. Default ``+inf`` (no upper bound).
         x_interp:    If True (default), return interpolated x at crossing.
         ignore_nans: If True (default), ignore NaN values.
+        refractory:  Minimum x-interval between crossings. Default 0.
 
     Returns:
         Tuple ``(indexes, xvalues)`` of numpy arrays.
@@ -101,6 +135,7 @@ def find_level_crossings_nmdata(
             xend=xend,
             x_interp=x_interp,
             ignore_nans=ignore_nans,
+            refractory=refractory,
         )
     return nm_math.find_level_crossings(
         data.nparray,
@@ -112,6 +147,7 @@ def find_level_crossings_nmdata(
         xend=xend,
         x_interp=x_interp,
         ignore_nans=ignore_nans,
+        refractory=refractory,
     )
 
 
@@ -203,6 +239,7 @@ def find_events_nmdata(
     baseline_avg: float = 2.0,
     baseline_dt: float = 2.0,
     template: np.ndarray | None = None,
+    templates: list[np.ndarray] | None = None,
     criterion_threshold: float = 4.0,
     template_baseline: float = 0.0,
     refractory: float = 0.0,
@@ -240,6 +277,12 @@ def find_events_nmdata(
             window is desired, it must already be included in this array
             (e.g. leading zeros prepended by the caller). Used only when
             *match_criterion* is ``None``.
+        templates: Bank of 1-D numpy templates (template algorithm only),
+            used instead of *template*. Each is normalized as *template*
+            and all are matched in one pass (``match_template_bank()``);
+            the criterion at each point is that of the best-matching
+            template, and each event is assigned the template with the
+            largest criterion while the criterion is beyond threshold.
         criterion_threshold: Criterion threshold for template matching (default 4).
         template_baseline: Offset (x-units) applied to shift detected times
             forward after criterion level-crossing detection. Use this to
@@ -264,7 +307,8 @@ def find_events_nmdata(
         match_criterion: Pre-computed template criterion array (template algorithm
             only). When provided, ``match_template()`` is skipped. Pass the
             cached result of a prior call to avoid recomputing for long
-            recordings.
+            recordings. A 2-D array is taken as the criteria of a template
+            bank, one row per template.
 
     Returns:
         Dict with keys:
@@ -272,6 +316,8 @@ def find_events_nmdata(
         ``"onset_times"``  — list[float | None], onset per accepted event.
         ``"peak_times"``   — list[float | None], peak per accepted event.
         ``"reject_times"`` — list[float], t_event for rejected events.
+        ``"template_index"`` — list[int | None], best-matching template
+            per accepted event (template bank only, else None).
         ``"match_criterion"`` — np.ndarray | None, criterion wave (template
             algorithm only, else None).
         ``"xunits"``       — str, from data.xscale.units.
@@ -286,6 +332,7 @@ def find_events_nmdata(
         "onset_times":     [],
         "peak_times":      [],
         "reject_times":    [],
+        "template_index":  [],
         "match_criterion": None,
         "xunits":          xunits,
     }
@@ -293,20 +340,28 @@ def find_events_nmdata(
     if yarray is None or len(yarray) == 0:
         return result
 
+    candidate_templates = None
     if algorithm == "template":
         if match_criterion is None:
-            if template is None:
+            if templates is not None:
+                match_criterion = nm_math.match_template_bank(
+                    yarray, [_normalize_template(t) for t in templates]
+                )
+            elif template is None:
                 raise ValueError("template must be provided when algorithm='template'")
-            tpl = template.astype(float, copy=True)
-            tpl_min = tpl.min()
-            tpl_max = tpl.max()
-            if tpl_max != tpl_min:
-                tpl = (tpl - tpl_min) / (tpl_max - tpl_min)
-            match_criterion = nm_math.match_template(yarray, tpl)
+            else:
+                match_criterion = nm_math.match_template(
+                    yarray, _normalize_template(template)
+                )
+        template_index = None
+        if match_criterion.ndim == 2:
+            match_criterion, template_index = nm_math.match_template_best(
+                match_criterion, polarity
+            )
         result["match_criterion"] = match_criterion
         func_name = "level-" if polarity == "negative" else "level+"
         thresh = -criterion_threshold if polarity == "negative" else criterion_threshold
-        _idxs, candidate_times = nm_math.find_level_crossings(
+        idxs, candidate_times = nm_math.find_level_crossings(
             match_criterion,
             thresh,
             func_name=func_name,
@@ -316,16 +371,22 @@ def find_events_nmdata(
             xend=xend,
         )
         candidate_times = list(candidate_times)
+        if template_index is not None:
+            candidate_templates = _event_templates(
+                match_criterion, template_index, idxs, thresh
+            )
         # Shift times to recover true event onset (baseline offset correction)
         if template_baseline > 0:
             candidate_times = [t + template_baseline for t in candidate_times]
         # Apply refractory filter
         if refractory > 0 and len(candidate_times) > 1:
-            filtered = [candidate_times[0]]
-            for t in candidate_times[1:]:
-                if t - filtered[-1] >= refractory:
-                    filtered.append(t)
-            candidate_times = filtered
+            keep = [0]
+            for i in range(1, len(candidate_times)):
+                if candidate_times[i] - candidate_times[keep[-1]] >= refractory:
+                    keep.append(i)
+            candidate_times = [candidate_times[i] for i in keep]
+            if candidate_templates is not None:
+                candidate_templates = [candidate_templates[i] for i in keep]
     else:
         mode = "nstdv" if algorithm == "nstdv" else "threshold"
         candidate_times = nm_math.find_events_sliding_baseline(
@@ -343,40 +404,48 @@ def find_events_nmdata(
             max_events=max_events,
         )
 
-    for t_event in candidate_times:
-        t_onset = None
-        t_peak  = None
-        rejected = False
-
-        if onset_search:
-            t_onset = nm_math.find_event_onset(
-                yarray, xstart, xdelta, t_event,
-                polarity=polarity,
-                avg=onset_avg,
-                nstdv=onset_nstdv,
-                limit=onset_limit,
-            )
-            if t_onset is None:
-                rejected = True
-
-        if not rejected and peak_search:
-            t_peak = nm_math.find_event_peak(
-                yarray, xstart, xdelta, t_event,
-                polarity=polarity,
-                avg=peak_avg,
-                nstdv=peak_nstdv,
-                limit=peak_limit,
-            )
-            if t_peak is None:
-                rejected = True
-
-        if rejected:
+    # onsets and peaks of all candidates at once; a candidate is rejected
+    # if its onset (or, if found, its peak) is not found
+    n_cand = len(candidate_times)
+    onsets = [None] * n_cand
+    peaks = [None] * n_cand
+    rejected = np.zeros(n_cand, dtype=bool)
+    if n_cand and onset_search:
+        t_onsets = nm_math.find_event_onsets(
+            yarray, xstart, xdelta, candidate_times,
+            polarity=polarity,
+            avg=onset_avg,
+            nstdv=onset_nstdv,
+            limit=onset_limit,
+        )
+        rejected |= np.isnan(t_onsets)
+        onsets = [None if r else t for r, t in zip(rejected, t_onsets.tolist())]
+    if n_cand and peak_search:
+        t_peaks = nm_math.find_event_peaks(
+            yarray, xstart, xdelta, candidate_times,
+            polarity=polarity,
+            avg=peak_avg,
+            nstdv=peak_nstdv,
+            limit=peak_limit,
+        )
+        missing = np.isnan(t_peaks)
+        peaks = [None if r or m else t
+                 for r, m, t in zip(rejected, missing, t_peaks.tolist())]
+        rejected |= missing
+
+    n_detect = 0
+    for i, t_event in enumerate(candidate_times):
+        if rejected[i]:
             result["reject_times"].append(t_event)
         else:
             result["detect_times"].append(t_event)
-            result["onset_times"].append(t_onset)
-            result["peak_times"].append(t_peak)
-            if max_events > 0 and len(result["detect_times"]) >= max_events:
+            result["onset_times"].append(onsets[i])
+            result["peak_times"].append(peaks[i])
+            result["template_index"].append(
+                None if candidate_templates is None else candidate_templates[i]
+            )
+            n_detect += 1
+            if max_events > 0 and n_detect >= max_events:
                 break
 
     return result
@@ -8,6 +8,8 @@ Created on Sun Dec 25 14:43:19 2022
 import copy
 import unittest
 
+import numpy
+
 from pyneuromatic.core.nm_channel import NMChannel, NMChannelContainer
 from pyneuromatic.core.nm_data import NMData
 from pyneuromatic.core.nm_manager import NMManager
@@ -194,3 +196,75 @@ class NMChannelTest(unittest.TestCase):
         self.assertFalse(c.name == a.name)
         self.assertTrue(c.xscale == a.xscale)
         self.assertTrue(c.yscale == a.yscale)
+
+
+class NMChannelMatrixTest(unittest.TestCase):
+    def setUp(self):
+        self.c = NMChannel(parent=NM, name=CNAME0)
+        for i in range(3):
+            d = NMData(parent=NM, name="dataA%d" % i,
+                       nparray=numpy.arange(4, dtype=numpy.float32) + i)
+            self.c.data.append(d)
+
+    def test_no_matrix(self):
+        self.assertIsNone(self.c.matrix)
+
+    def test_build(self):
+        m = self.c.matrix_build()
+        self.assertIs(self.c.matrix, m)
+        self.assertEqual(m.shape, (3, 4))
+        self.assertEqual(m.dtype, numpy.float32)
+        self.assertTrue(m.flags.c_contiguous)
+        numpy.testing.assert_array_equal(m[2], [2, 3, 4, 5])
+        for d in self.c.data:
+            self.assertIs(d.nparray.base, m)
+        self.assertIs(self.c.matrix_build(), m)  # still valid, no copy
+        m2 = self.c.matrix_build(dtype=numpy.float64)
+        self.assertEqual(m2.dtype, numpy.float64)
+
+    def test_row_views(self):
+        m = self.c.matrix_build()
+        self.c.data[1].nparray[0] = 99
+        self.assertEqual(m[1, 0], 99)
+        m[2] *= 2
+        numpy.testing.assert_array_equal(self.c.data[2].nparray, [4, 6, 8, 10])
+
+    def test_invalidated(self):
+        self.c.matrix_build()
+        self.c.data[0].nparray = numpy.zeros(4)
+        self.assertIsNone(self.c.matrix)
+        self.c.matrix_build()
+        self.c.data.pop()
+        self.assertIsNone(self.c.matrix)
+
+    def test_release(self):
+        m = self.c.matrix_build()
+        self.c.matrix_release()
+        self.assertIsNone(self.c.matrix)
+        self.c.data[0].nparray[0] = 99
+        self.assertEqual(m[0, 0], 0)
+        self.c.matrix_release()  # no matrix, no error
+
+    def test_build_errors(self):
+        self.c.data[1].nparray = numpy.zeros(5)
+        with self.assertRaises(ValueError):
+            self.c.matrix_build()
+        self.c.data[1].nparray = None
+        with self.assertRaises(ValueError):
+            self.c.matrix_build()
+        with self.assertRaises(ValueError):
+            NMChannel(parent=NM, name="B").matrix_build()
+
+    def test_deepcopy(self):
+        self.c.matrix_build()
+        c = copy.deepcopy(self.c)
+        self.assertIsNone(c.matrix)
+        self.assertIsNotNone(self.c.matrix)
+
+    def test_deepcopy_data(self):
+        m = self.c.matrix_build()
+        d = copy.deepcopy(self.c.data[0])
+        self.assertFalse(numpy.shares_memory(d.nparray, m))
+        self.assertIs(self.c.matrix, m)  # still valid and writeable
+        m[0] -= 100
+        numpy.testing.assert_array_equal(d.nparray, [0, 1, 2, 3])
@@ -6,8 +6,10 @@ Created on Sat Aug  5 14:00:26 2023
 @author: jason
 """
 import copy
+import math
 import numpy
 import unittest
+import weakref
 
 from pyneuromatic.core.nm_data import NMData, NMDataContainer
 from pyneuromatic.core.nm_dataseries import NMDataSeries
@@ -386,3 +388,268 @@ class TestNMDataNotes(unittest.TestCase):
         self.assertIsInstance(c1._select_set('RecordA0'), NMData)
         self.assertFalse(c0._isequivalent(c1, alert=ALERT))
     """
+
+
+class TestNMDataLoader(unittest.TestCase):
+    """Tests for deferred nparray loading (_nparray_loader_set)."""
+
+    def setUp(self):
+        self.calls = 0
+        self.d0 = NMData(parent=NM, name=DNAME0, xscale=XSCALE0)
+        self.d0._nparray_loader_set(self._load)
+
+    def _load(self):
+        self.calls += 1
+        return NPARRAY0.copy()
+
+    def test_not_loaded_until_access(self):
+        self.assertFalse(self.d0.nparray_loaded)
+        self.assertEqual(self.calls, 0)
+        numpy.testing.assert_array_equal(self.d0.nparray, NPARRAY0)
+        self.assertTrue(self.d0.nparray_loaded)
+        self.d0.nparray
+        self.assertEqual(self.calls, 1)
+
+    def test_parameters_do_not_load(self):
+        p = self.d0.parameters
+        self.assertFalse(p["nparray loaded"])
+        self.assertEqual(self.calls, 0)
+
+    def test_setter_replaces_loader(self):
+        self.d0.nparray = NPARRAY1
+        self.assertTrue(self.d0.nparray_loaded)
+        numpy.testing.assert_array_equal(self.d0.nparray, NPARRAY1)
+        self.assertEqual(self.calls, 0)
+
+    def test_loader_none_removes_loader(self):
+        self.d0._nparray_loader_set(None)
+        self.assertTrue(self.d0.nparray_loaded)
+        self.assertIsNone(self.d0.nparray)
+
+    def test_loader_type_error(self):
+        with self.assertRaises(TypeError):
+            self.d0._nparray_loader_set("not callable")
+
+    def test_loader_bad_return(self):
+        self.d0._nparray_loader_set(lambda: [1, 2, 3])
+        with self.assertRaises(TypeError):
+            self.d0.nparray
+
+    def test_deepcopy_shares_loader(self):
+        c = copy.deepcopy(self.d0)
+        self.assertFalse(c.nparray_loaded)
+        self.assertTrue(c == self.d0)
+        self.assertEqual(self.calls, 2)  # each loads its own array
+
+    def test_get_xindex_loads(self):
+        self.assertEqual(self.d0.get_xindex(10.02), 2)
+        self.assertEqual(self.calls, 1)
+
+
+class TestNMDataShareReadOnly(unittest.TestCase):
+    """Tests for copies sharing read-only buffers (nparray_shared)."""
+
+    def setUp(self):
+        self.d0 = NMData(
+            parent=NM, name=DNAME0, nparray=numpy.arange(4.0),
+            xarray=numpy.arange(4.0) * 0.1,
+        )
+        self.d0.nparray.flags.writeable = False
+        self.d0.xarray.flags.writeable = False
+        self.c = copy.deepcopy(self.d0)
+
+    def test_shared_buffer(self):
+        self.assertFalse(self.d0.nparray_shared)
+        self.assertTrue(self.c.nparray_shared)
+        self.assertTrue(numpy.shares_memory(self.c.nparray, self.d0.nparray))
+        self.assertTrue(numpy.shares_memory(self.c.xarray, self.d0.xarray))
+        self.assertTrue(self.c == self.d0)
+
+    def test_copy_of_copy_shared(self):
+        c2 = copy.deepcopy(self.c)
+        self.assertTrue(c2.nparray_shared)
+        self.assertTrue(numpy.shares_memory(c2.nparray, self.d0.nparray))
+
+    def test_read_only(self):
+        with self.assertRaises(ValueError):
+            self.c.nparray[0] = 99
+        with self.assertRaises(ValueError):
+            self.c.xarray[0] = 99
+
+    def test_writeable_copied(self):
+        d = NMData(parent=NM, name=DNAME1, nparray=numpy.arange(4.0),
+                   xarray=numpy.arange(4.0))
+        c = copy.deepcopy(d)
+        self.assertFalse(c.nparray_shared)
+        self.assertFalse(numpy.shares_memory(c.nparray, d.nparray))
+        self.assertFalse(numpy.shares_memory(c.xarray, d.xarray))
+        d.nparray[0] = 99  # source stays writeable
+        d.xarray[0] = 99
+        self.assertEqual(c.nparray[0], 0)
+        self.assertEqual(c.xarray[0], 0)
+
+    def test_read_only_view_of_writeable_copied(self):
+        a = numpy.arange(4.0)
+        v = a.view()
+        v.flags.writeable = False
+        c = copy.deepcopy(NMData(parent=NM, name=DNAME1, nparray=v))
+        self.assertFalse(c.nparray_shared)
+        a[0] = 99
+        self.assertEqual(c.nparray[0], 0)
+
+    def test_assign_replaces(self):
+        self.c.nparray = self.c.nparray * 2
+        self.assertFalse(self.c.nparray_shared)
+        self.assertTrue(self.c.nparray.flags.writeable)
+        numpy.testing.assert_array_equal(self.d0.nparray, numpy.arange(4.0))
+
+    def test_own(self):
+        arr = self.c.nparray_own()
+        self.assertFalse(self.c.nparray_shared)
+        self.assertFalse(numpy.shares_memory(arr, self.d0.nparray))
+        arr[0] = 99
+        self.assertEqual(self.c.nparray[0], 99)
+        self.assertEqual(self.d0.nparray[0], 0)
+        self.assertIs(self.c.nparray_own(), arr)  # already owned, no copy
+
+    def test_own_none(self):
+        d = NMData(parent=NM, name=DNAME1)
+        self.assertIsNone(d.nparray_own())
+        self.assertFalse(copy.deepcopy(d).nparray_shared)
+
+    def test_parameters(self):
+        self.assertTrue(self.c.parameters["nparray shared"])
+
+
+class TestNMDataRaw(unittest.TestCase):
+
+    def setUp(self):
+        self.raw = numpy.array([-2, 0, 1, 1000], dtype=numpy.int16)
+        self.d0 = NMData(parent=NM, name=DNAME0, yscale=YSCALE0)
+        self.d0.nparray_raw_set(self.raw, scale=0.5, offset=1.0)
+
+    def test_decode(self):
+        self.assertIs(self.d0.nparray_raw, self.raw)
+        a = self.d0.nparray
+        self.assertEqual(a.dtype, numpy.float64)
+        numpy.testing.assert_array_equal(a, [0.0, 1.0, 1.5, 501.0])
+        self.assertFalse(a.flags.writeable)
+        self.assertEqual(self.d0.yscale.scale, 0.5)
+        self.assertEqual(self.d0.yscale.offset, 1.0)
+        self.assertEqual(self.d0.parameters["nparray raw"], numpy.int16)
+
+    def test_decode_cached(self):
+        a = self.d0.nparray
+        self.assertIs(self.d0.nparray, a)  # cached while referenced
+        self.d0.yscale.scale = 2
+        b = self.d0.nparray
+        self.assertIsNot(b, a)
+        numpy.testing.assert_array_equal(b, [-3.0, 1.0, 3.0, 2001.0])
+
+    def test_decode_kept_recent(self):
+        ref = weakref.ref(self.d0.nparray)
+        self.assertIs(self.d0.nparray, ref())  # not decoded again
+        for i in range(10):  # decode other data
+            d = NMData(parent=NM, name=DNAME1)
+            d.nparray_raw_set(self.raw, scale=i + 1)
+            d.nparray
+        self.assertIsNone(ref())  # freed once no longer recent
+
+    def test_xindex_no_decode(self):
+        self.assertEqual(self.d0.get_xindex(math.inf), 3)
+        self.assertEqual(self.d0.get_xindex(2), 2)
+        numpy.testing.assert_array_equal(self.d0.get_xindex([1, 9]), [1, -1])
+        self.assertEqual(self.d0.get_xvalue(3), 3)
+        self.assertIsNone(self.d0._NMData__nparray_decoded)
+
+    def test_float32(self):
+        d = NMData(parent=NM, name=DNAME1)
+        d.nparray_raw_set(numpy.arange(3, dtype=numpy.float32))
+        numpy.testing.assert_array_equal(d.nparray, [0.0, 1.0, 2.0])
+
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            self.d0.nparray_raw_set([1, 2])
+        with self.assertRaises(ValueError):
+            self.d0.nparray_raw_set(numpy.array(["a"]))
+        with self.assertRaises(ValueError):
+            self.d0.nparray_raw_set(self.raw, scale=0)
+
+    def test_assign_replaces_raw(self):
+        self.d0.nparray = self.d0.nparray * 2
+        self.assertIsNone(self.d0.nparray_raw)
+        self.assertTrue(self.d0.nparray.flags.writeable)
+        numpy.testing.assert_array_equal(self.d0.nparray, [0, 2, 3, 1002])
+
+    def test_own(self):
+        arr = self.d0.nparray_own()
+        self.assertIsNone(self.d0.nparray_raw)
+        arr[0] = 99
+        self.assertEqual(self.d0.nparray[0], 99)
+
+    def test_copy_shares_raw(self):
+        c = copy.deepcopy(self.d0)
+        self.assertFalse(numpy.shares_memory(c.nparray_raw, self.raw))
+        self.raw.flags.writeable = False
+        c = copy.deepcopy(self.d0)
+        self.assertTrue(numpy.shares_memory(c.nparray_raw, self.raw))
+        self.assertTrue(c == self.d0)
+        c.yscale.offset = 0
+        self.assertEqual(c.nparray[0], -1.0)
+        self.assertEqual(self.d0.nparray[0], 0.0)
+
+
+class TestNMDataXIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.d0 = NMData(parent=NM, name=DNAME0, nparray=numpy.zeros(10),
+                         xscale={"start": 1.0, "delta": 0.5})
+        self.d1 = NMData(parent=NM, name=DNAME1, nparray=numpy.zeros(5),
+                         xarray=numpy.array([0.0, 0.1, 0.3, 0.7, 1.5]))
+
+    def test_scalar(self):
+        self.assertEqual(self.d0.get_xindex(2.0), 2)
+        self.assertIsNone(self.d0.get_xindex(99.0))
+        self.assertEqual(self.d0.get_xindex(99.0, clip=True), 9)
+        self.assertEqual(self.d0.get_xindex(-math.inf), 0)
+        self.assertEqual(self.d1.get_xindex(0.2), 2)
+        self.assertEqual(self.d1.get_xindex(0.3), 2)
+        self.assertIsNone(self.d1.get_xindex(2.0))
+        self.assertEqual(self.d1.get_xindex(math.inf), 4)
+        with self.assertRaises(TypeError):
+            self.d0.get_xindex("1")
+        with self.assertRaises(TypeError):
+            self.d0.get_xindex(True)
+
+    def test_array(self):
+        xv = [-math.inf, 0.0, 2.0, 5.6, 99.0, math.nan, math.inf]
+        i = self.d0.get_xindex(numpy.array(xv))
+        numpy.testing.assert_array_equal(i, [0, -1, 2, 9, -1, -1, 9])
+        i = self.d0.get_xindex(xv, clip=True)
+        numpy.testing.assert_array_equal(i, [0, 0, 2, 9, 9, -1, 9])
+        i = self.d1.get_xindex(xv)
+        numpy.testing.assert_array_equal(i, [0, 0, -1, -1, -1, -1, 4])
+        for x, j in zip(xv[1:5], [0, None, None, None]):
+            self.assertEqual(self.d1.get_xindex(x), j)
+        with self.assertRaises(TypeError):
+            self.d0.get_xindex(["a"])
+
+    def test_array_not_monotonic(self):
+        self.d1.xarray = numpy.array([0.0, 0.5, 0.2, 0.9, 0.4])
+        i = self.d1.get_xindex([0.3, 0.6, 1.0])
+        numpy.testing.assert_array_equal(i, [1, 3, -1])
+        self.assertEqual(self.d1.get_xindex(0.6), 3)
+        self.d1.xarray = numpy.arange(5.0)  # resets monotonic check
+        numpy.testing.assert_array_equal(self.d1.get_xindex([0.6]), [1])
+
+    def test_xvalue_array(self):
+        x = self.d0.get_xvalue([0, 2, 9])
+        numpy.testing.assert_array_equal(x, [1.0, 2.0, 5.5])
+        x = self.d0.get_xvalue(numpy.array([-3, 20]), clip=True)
+        numpy.testing.assert_array_equal(x, [1.0, 5.5])
+        with self.assertRaises(ValueError):
+            self.d0.get_xvalue([0, 10])
+        with self.assertRaises(ValueError):
+            self.d0.get_xvalue([-1])
+        x = self.d1.get_xvalue(self.d1.get_xindex([0.2, 0.8]))
+        numpy.testing.assert_array_equal(x, [0.3, 1.5])
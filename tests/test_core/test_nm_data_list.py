@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import copy
+import pickle
+import unittest
+
+import numpy
+
+from pyneuromatic.core.nm_data import NMData
+from pyneuromatic.core.nm_data_list import NMDataList
+from pyneuromatic.core.nm_folder import NMFolder
+
+
+class TestNMDataList(unittest.TestCase):
+    """Tests for NMDataList class."""
+
+    def setUp(self):
+        self.d0 = NMData(name="RecordA0", nparray=numpy.zeros(4))
+        self.d1 = NMData(name="RecordA1", nparray=numpy.ones(4))
+        self.d2 = NMData(name="RecordA2", nparray=numpy.ones(4))
+        self.dlist = NMDataList([self.d0, self.d1])
+
+    def test_is_list(self):
+        self.assertIsInstance(self.dlist, list)
+        self.assertEqual(self.dlist, [self.d0, self.d1])
+
+    def test_contains_identity(self):
+        self.assertIn(self.d0, self.dlist)
+        twin = copy.deepcopy(self.d0)
+        twin._name_set("RecordA0")
+        self.assertNotIn(twin, self.dlist)
+        self.assertNotIn(None, self.dlist)
+
+    def test_append_extend_insert(self):
+        self.dlist.append(self.d2)
+        self.assertIn(self.d2, self.dlist)
+        dlist = NMDataList()
+        dlist.extend(iter([self.d0, self.d1]))
+        self.assertIn(self.d1, dlist)
+        dlist += [self.d2]
+        self.assertIn(self.d2, dlist)
+        dlist = NMDataList()
+        dlist.insert(0, self.d1)
+        self.assertIn(self.d1, dlist)
+
+    def test_remove(self):
+        self.dlist.remove(self.d0)
+        self.assertNotIn(self.d0, self.dlist)
+        self.assertEqual(self.dlist, [self.d1])
+        with self.assertRaises(ValueError):
+            self.dlist.remove(self.d0)
+
+    def test_remove_duplicate(self):
+        self.dlist.append(self.d0)
+        self.dlist.remove(self.d0)
+        self.assertIn(self.d0, self.dlist)  # second reference remains
+        self.dlist.remove(self.d0)
+        self.assertNotIn(self.d0, self.dlist)
+
+    def test_pop_del_clear(self):
+        self.assertIs(self.dlist.pop(), self.d1)
+        self.assertNotIn(self.d1, self.dlist)
+        del self.dlist[0]
+        self.assertNotIn(self.d0, self.dlist)
+        self.dlist.extend([self.d0, self.d1, self.d2])
+        del self.dlist[:2]
+        self.assertEqual(self.dlist, [self.d2])
+        self.assertNotIn(self.d0, self.dlist)
+        self.dlist.clear()
+        self.assertNotIn(self.d2, self.dlist)
+
+    def test_setitem(self):
+        self.dlist[0] = self.d2
+        self.assertNotIn(self.d0, self.dlist)
+        self.assertIn(self.d2, self.dlist)
+        self.dlist[:] = [self.d0]
+        self.assertIn(self.d0, self.dlist)
+        self.assertNotIn(self.d2, self.dlist)
+
+    def test_copy(self):
+        c = copy.copy(self.dlist)
+        self.assertIsInstance(c, NMDataList)
+        self.assertIn(self.d0, c)
+        c = copy.deepcopy(self.dlist)
+        self.assertIsInstance(c, NMDataList)
+        self.assertNotIn(self.d0, c)
+        self.assertIn(c[0], c)
+        c = pickle.loads(pickle.dumps(NMDataList([1, 2])))
+        self.assertIn(c[0], c)
+
+
+class TestNMDataSeriesLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = NMFolder(name="folder0")
+        matches = {}
+        for ch in "AB":
+            for ep in range(5):
+                d = self.folder.data.new(
+                    "Record%s%d" % (ch, ep), nparray=numpy.zeros(3)
+                )
+                matches[(ch, ep)] = d
+        self.ds = self.folder.build_dataseries("Record", matches)
+
+    def test_get_data(self):
+        self.assertIs(self.ds.get_data("B", "E3"),
+                      self.folder.data["RecordB3"])
+        self.assertIsNone(self.ds.get_data("C", "E3"))
+
+    def test_equal_data_not_confused(self):
+        # identical arrays and scales: NMData.__eq__ differs only by name
+        channel = self.ds.channels["A"]
+        self.assertNotIn(self.folder.data["RecordB0"], channel.data)
+
+    def test_build_idempotent(self):
+        matches = {("A", 0): self.folder.data["RecordA0"]}
+        self.folder.build_dataseries("Record", matches)
+        self.assertEqual(len(self.ds.channels["A"].data), 5)
+
+    def test_get_selected(self):
+        self.ds.channels.selected_name = "B"
+        self.ds.epochs.selected_name = "E1"
+        self.assertEqual(self.ds.get_selected(get_keys=True), ["RecordB1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1106,6 +1106,68 @@ class TestNMManagerToolfolderRunValues(unittest.TestCase):
         self.assertLess(first_tf, first_basic)
 
 
+class TestNMManagerIterRunTargets(unittest.TestCase):
+    """Tests for iter_run_values(), iter_run_keys() and iter_run_groups()."""
+
+    def setUp(self):
+        self.nm = NMManager(quiet=QUIET)
+        for fname in ("folder0", "folder1"):
+            f = self.nm.folders.new(fname)
+            matches = {}
+            for ch in "AB":
+                for ep in range(3):
+                    matches[(ch, ep)] = f.data.new("Record%s%d" % (ch, ep))
+            f.build_dataseries("Record", matches)
+            f.data.run_target = "all"
+            tf = f.toolfolders.new("Stats_0")
+            tf.data.new("ST_A0")
+            tf.data.new("ST_A1")
+            f.toolfolders.run_target = "all"
+            tf.data.run_target = "all"
+        self.nm.folders.run_target = "all"
+
+    def _set_dataseries(self):
+        self.nm.run_keys_set({
+            "folder": "all", "dataseries": "Record",
+            "channel": "all", "epoch": "all",
+        })
+
+    def test_iter_run_values(self):
+        for priority in (True, False):
+            self._set_dataseries()
+            values = self.nm.run_values(priority)
+            self.assertEqual(len(values), 2 * (2 + 6))
+            self.assertEqual(list(self.nm.iter_run_values(priority)), values)
+            self.assertEqual(self.nm.run_count(priority), len(values))
+            self.assertEqual(list(self.nm.iter_run_keys(priority)),
+                             self.nm.run_keys(priority))
+
+    def test_iter_run_values_lazy(self):
+        self._set_dataseries()
+        it = self.nm.iter_run_values()
+        first = next(it)
+        self.assertEqual(first["toolfolder"].name, "Stats_0")
+        self.assertEqual(sum(1 for _ in it), 15)
+
+    def test_iter_run_groups(self):
+        self._set_dataseries()
+        for priority in (True, False):
+            groups = list(self.nm.iter_run_groups(priority))
+            expected = _split_targets_by_channel(self.nm.run_values(priority))
+            self.assertEqual(groups, expected)
+        # dataseries: 2 toolfolder groups, then 2 folders x 2 channels
+        groups = list(self.nm.iter_run_groups())
+        self.assertEqual([len(g) for g in groups], [2, 2, 3, 3, 3, 3])
+
+    def test_iter_run_groups_data(self):
+        groups = list(self.nm.iter_run_groups(dataseries_priority=False))
+        self.assertEqual([len(g) for g in groups], [2, 2, 12])
+        self.assertIn("toolfolder", groups[0][0])
+        # all folder data in one group
+        self.assertEqual({t["folder"].name for t in groups[-1]},
+                         {"folder0", "folder1"})
+
+
 class TestNMManagerToolfolderRunKeysSet(unittest.TestCase):
     """Tests for run_keys_set() toolfolder+data and toolfolder+dataseries modes."""
 
@@ -15,6 +15,11 @@ from pyneuromatic.core.nm_math import (
     apply_inequality,
     array_stats,
     compute_ref_value,
+    find_event_onset,
+    find_event_onsets,
+    find_event_peak,
+    find_event_peaks,
+    find_events_sliding_baseline,
     find_level_crossings,
     inequality_condition_str,
     inequality_mask,
@@ -513,6 +518,68 @@ class TestFindLevelCrossings:
         with pytest.raises(TypeError):
             find_level_crossings(np.array([-1.0, 1.0]), 0.0, xend=False)
 
+    # --- refractory ---
+
+    def test_refractory_drops_close_crossings(self):
+        # rising crossings at x = 0.5, 2.5, 4.5, 9.5
+        y = np.array([-1.0, 1, -1, 1, -1, 1, -1, -1, -1, -1, 1])
+        _, xv = find_level_crossings(y, 0.0, func_name="level+")
+        assert list(xv) == [0.5, 2.5, 4.5, 9.5]
+        # 2.5 is within 3 of 0.5; 4.5 is kept since 2.5 was dropped
+        idx, xv = find_level_crossings(y, 0.0, func_name="level+",
+                                       refractory=3)
+        assert list(xv) == [0.5, 4.5, 9.5]
+        assert list(idx) == [0, 4, 9]
+        _, xv = find_level_crossings(y, 0.0, func_name="level+",
+                                     refractory=2)
+        assert list(xv) == [0.5, 2.5, 4.5, 9.5]
+
+    def test_refractory_backward_search(self):
+        y = np.array([-1.0, 1, -1, 1, -1, 1, -1, -1, -1, -1, 1])
+        _, xv = find_level_crossings(y, 0.0, func_name="level+",
+                                     xbgn=20.0, xend=0.0, refractory=3)
+        assert list(xv) == [9.5, 4.5, 0.5]
+        _, xv = find_level_crossings(y, 0.0, func_name="level+",
+                                     xbgn=20.0, xend=0.0, refractory=6)
+        assert list(xv) == [9.5, 2.5]
+
+    def test_refractory_matches_dead_time_loop(self):
+        rng = np.random.default_rng(1)
+        y = np.sin(np.arange(5000) * 0.05) + rng.normal(0, 0.3, 5000)
+        _, xv_all = find_level_crossings(y, 0.0, func_name="level+")
+        _, xv = find_level_crossings(y, 0.0, func_name="level+",
+                                     refractory=20)
+        keep = [xv_all[0]]
+        for x in xv_all[1:]:
+            if x - keep[-1] >= 20:
+                keep.append(x)
+        assert list(xv) == keep
+        assert 0 < len(xv) < len(xv_all)
+
+    def test_refractory_rejects_invalid(self):
+        y = np.array([-1.0, 1.0])
+        with pytest.raises(TypeError):
+            find_level_crossings(y, 0.0, refractory=True)
+        with pytest.raises(TypeError):
+            find_level_crossings(y, 0.0, refractory="1")
+        with pytest.raises(ValueError):
+            find_level_crossings(y, 0.0, refractory=-1.0)
+        with pytest.raises(ValueError):
+            find_level_crossings(y, 0.0, refractory=math.nan)
+
+    def test_many_crossings_match_interp_x(self):
+        rng = np.random.default_rng(2)
+        y = rng.normal(size=2000)
+        idx, xv = find_level_crossings(y, 0.1, xstart=1.0, xdelta=0.5)
+        assert len(xv) > 500
+        i = np.flatnonzero(np.diff(y > 0.1)) + 1
+        expected = [
+            interp_x(0.1, 1.0 + (j - 1) * 0.5, y[j - 1], 1.0 + j * 0.5, y[j])
+            for j in i
+        ]
+        assert np.allclose(xv, expected)
+        assert np.all((idx == i) | (idx == i - 1))
+
     # --- xarray with non-uniform spacing ---
 
     def test_xarray_nonuniform_crossing_x_value(self):
@@ -605,6 +672,190 @@ class TestFindLevelCrossings:
         assert len(idx) == 0
 
 
+# ---------------------------------------------------------------------------
+# TestFindEventsSlidingBaseline
+# ---------------------------------------------------------------------------
+
+
+def _sliding_baseline_loop(y, xstart, xdelta, polarity, mode, threshold,
+                           baseline_avg, baseline_dt, refractory=0.0):
+    """Sample-by-sample reference for find_events_sliding_baseline."""
+    n = len(y)
+    ihalf = round(baseline_avg / xdelta / 2) if baseline_avg > 0 else 0
+    dt_pts = max(1, round(baseline_dt / xdelta))
+    ref_pts = round(refractory / xdelta)
+    events = []
+    t0 = 0
+    while t0 + dt_pts < n:
+        w = y[max(0, t0 - ihalf): min(n - 1, t0 + ihalf) + 1]
+        avg = np.mean(w)
+        off = threshold * np.std(w) if mode == "nstdv" else threshold
+        det = y[t0 + dt_pts]
+        if (det < avg - off) if polarity == "negative" else (det > avg + off):
+            events.append(xstart + (t0 + dt_pts) * xdelta)
+            t0 += dt_pts + max(1, ref_pts)
+        else:
+            t0 += 1
+    return events
+
+
+class TestFindEventsSlidingBaseline:
+    def _trace(self, n=4000, seed=0):
+        rng = np.random.default_rng(seed)
+        y = rng.normal(-60.0, 0.5, n)
+        for i in range(100, n - 50, 370):
+            y[i: i + 20] -= 8.0 * np.exp(-np.arange(20) / 5.0)
+        return y
+
+    @pytest.mark.parametrize("mode,threshold", [("threshold", 3.0),
+                                                ("nstdv", 2.0)])
+    @pytest.mark.parametrize("refractory", [0.0, 1.0])
+    def test_matches_loop(self, mode, threshold, refractory):
+        y = self._trace()
+        args = (0.0, 0.1, "negative", mode, threshold, 2.0, 0.5)
+        events = find_events_sliding_baseline(y, *args, refractory=refractory)
+        assert len(events) >= 10
+        assert events == pytest.approx(
+            _sliding_baseline_loop(y, *args, refractory=refractory))
+
+    def test_positive_polarity(self):
+        y = -self._trace()
+        args = (0.0, 0.1, "positive", "threshold", 3.0, 2.0, 0.5)
+        events = find_events_sliding_baseline(y, *args)
+        assert events == pytest.approx(_sliding_baseline_loop(y, *args))
+        assert events == pytest.approx(find_events_sliding_baseline(
+            -y, 0.0, 0.1, "negative", "threshold", 3.0, 2.0, 0.5))
+
+    def test_step_baseline_nstdv(self):
+        # flat windows have exact stdv 0, so round-off in the window
+        # statistics must not flip the strict comparison
+        y = np.zeros(2000)
+        y[:500] = 1.0
+        y[1500] = -5.0
+        args = (0.0, 1.0, "negative", "nstdv", 3.0, 20.0, 2.0)
+        events = find_events_sliding_baseline(y, *args, refractory=10.0)
+        assert events == [1500.0]
+        assert events == _sliding_baseline_loop(y, *args, refractory=10.0)
+
+    @pytest.mark.parametrize("mode,threshold", [("threshold", 0.0),
+                                                ("nstdv", 1.0)])
+    @pytest.mark.parametrize("polarity", ["negative", "positive"])
+    def test_quantized_matches_loop(self, mode, threshold, polarity):
+        rng = np.random.default_rng(1)
+        y = np.repeat(rng.integers(-3, 4, 300) * 0.1 + 7.3, 7)
+        args = (0.0, 1.0, polarity, mode, threshold, 9.0, 2.0)
+        assert find_events_sliding_baseline(y, *args, refractory=3.0) == \
+            _sliding_baseline_loop(y, *args, refractory=3.0)
+
+    def test_single_point_baseline(self):
+        y = np.array([0.0, 0.0, -5.0, 0.0, 0.0, -5.0, 0.0])
+        events = find_events_sliding_baseline(
+            y, 0.0, 1.0, "negative", "threshold", 1.0, 0.0, 1.0)
+        assert events == [2.0, 5.0]
+
+    def test_window_and_max_events(self):
+        y = self._trace()
+        args = (0.0, 0.1, "negative", "threshold", 3.0, 2.0, 0.5)
+        events = find_events_sliding_baseline(y, *args)
+        part = find_events_sliding_baseline(y, *args, xbgn=80.0, xend=250.0)
+        assert part == [x for x in events if 80.0 <= x <= 250.0]
+        assert find_events_sliding_baseline(y, *args, max_events=3) == \
+            events[:3]
+
+    def test_nan_window_is_skipped(self):
+        y = self._trace(n=1000)
+        args = (0.0, 0.1, "negative", "threshold", 3.0, 2.0, 0.5)
+        events = find_events_sliding_baseline(y, *args)
+        y[95] = math.nan  # in the baseline window of the first event
+        with np.errstate(invalid="ignore"):
+            expected = _sliding_baseline_loop(y, *args)
+        events_nan = find_events_sliding_baseline(y, *args)
+        assert events_nan == pytest.approx(expected)
+        assert events_nan != events
+
+    def test_empty(self):
+        assert find_events_sliding_baseline(
+            np.array([]), 0.0, 1.0, "negative", "threshold", 1.0, 0.0,
+            1.0) == []
+        assert find_events_sliding_baseline(
+            np.zeros(3), 0.0, 1.0, "negative", "threshold", 1.0, 0.0,
+            5.0) == []
+
+
+# ---------------------------------------------------------------------------
+# TestFindEventOnsetsPeaks
+# ---------------------------------------------------------------------------
+
+
+class TestFindEventOnsetsPeaks:
+    def _trace(self, n=3000, seed=0):
+        rng = np.random.default_rng(seed)
+        y = rng.normal(0.0, 0.2, n)
+        for i in range(50, n - 60, 210):
+            y[i: i + 40] -= 5.0 * (1 - np.exp(-np.arange(40) / 3.0))
+        return y
+
+    @pytest.mark.parametrize("polarity", ["negative", "positive"])
+    @pytest.mark.parametrize("avg,nstdv", [(0.0, 0.0), (0.5, 1.0),
+                                           (2.0, 2.5)])
+    def test_matches_single_event(self, polarity, avg, nstdv):
+        y = self._trace()
+        if polarity == "positive":
+            y = -y
+        t = np.arange(-0.3, 300.0, 1.7)  # includes times before x = 0
+        onsets = find_event_onsets(y, 0.0, 0.1, t, polarity, avg, nstdv, 3.0)
+        peaks = find_event_peaks(y, 0.0, 0.1, t, polarity, avg, nstdv, 3.0)
+        assert onsets.shape == peaks.shape == t.shape
+        for i, te in enumerate(t):
+            onset = find_event_onset(y, 0.0, 0.1, te, polarity, avg, nstdv,
+                                     3.0)
+            peak = find_event_peak(y, 0.0, 0.1, te, polarity, avg, nstdv,
+                                   3.0)
+            assert (math.nan if onset is None else onset) == \
+                pytest.approx(onsets[i], nan_ok=True)
+            assert (math.nan if peak is None else peak) == \
+                pytest.approx(peaks[i], nan_ok=True)
+        if avg > 0:
+            assert np.isfinite(onsets).sum() > 10
+            assert np.isfinite(peaks).sum() > 10
+
+    def test_window_longer_than_array(self):
+        y = np.array([0.0, 0.0, -3.0, -4.0, -1.0])
+        for te in (0.0, 2.0, 4.0):
+            onset = find_event_onset(y, 0.0, 1.0, te, "negative", 10.0,
+                                     0.5, 5.0)
+            peak = find_event_peak(y, 0.0, 1.0, te, "negative", 10.0,
+                                   0.5, 5.0)
+            onsets = find_event_onsets(y, 0.0, 1.0, [te], "negative", 10.0,
+                                       0.5, 5.0)
+            peaks = find_event_peaks(y, 0.0, 1.0, [te], "negative", 10.0,
+                                     0.5, 5.0)
+            assert (math.nan if onset is None else onset) == \
+                pytest.approx(onsets[0], nan_ok=True)
+            assert (math.nan if peak is None else peak) == \
+                pytest.approx(peaks[0], nan_ok=True)
+
+    def test_empty(self):
+        y = self._trace(n=100)
+        assert find_event_onsets(y, 0.0, 0.1, [], "negative", 0.5, 1.0,
+                                 3.0).size == 0
+        result = find_event_peaks(np.array([]), 0.0, 0.1, [1.0, 2.0],
+                                  "negative", 0.5, 1.0, 3.0)
+        assert np.isnan(result).all() and result.size == 2
+
+    def test_rejects_invalid(self):
+        y = self._trace(n=100)
+        with pytest.raises(TypeError):
+            find_event_onsets(list(y), 0.0, 0.1, [1.0], "negative", 0.5, 1.0,
+                              3.0)
+        with pytest.raises(ValueError):
+            find_event_peaks(y, 0.0, 0.1, [1.0], "down", 0.5, 1.0, 3.0)
+        with pytest.raises(ValueError):
+            find_event_peaks(y, 0.0, 0.1, [1.0], "negative", 0.5, 1.0, 0.0)
+        with pytest.raises(TypeError):
+            find_event_onsets(y, 0.0, True, [1.0], "negative", 0.5, 1.0, 3.0)
+
+
 # ---------------------------------------------------------------------------
 # TestLinearRegression
 # ---------------------------------------------------------------------------
@@ -1707,3 +1958,173 @@ class TestMatchTemplate:
         result = nm_math.match_template(data, tmpl)
         assert len(result) == 50
 
+    # --- method and chunk_size ---
+
+    def test_rejects_invalid_method(self):
+        with pytest.raises(ValueError):
+            nm_math.match_template(np.zeros(10), np.array([1.0, 2.0]),
+                                   method="overlap")
+
+    def test_rejects_float_chunk_size(self):
+        with pytest.raises(TypeError):
+            nm_math.match_template(np.zeros(10), np.array([1.0, 2.0]),
+                                   chunk_size=4.0)
+
+    def test_rejects_zero_chunk_size(self):
+        with pytest.raises(ValueError):
+            nm_math.match_template(np.zeros(10), np.array([1.0, 2.0]),
+                                   chunk_size=0)
+
+    @pytest.mark.parametrize("circular", [False, True])
+    def test_fft_matches_bruteforce(self, circular):
+        rng = np.random.default_rng(21)
+        data = rng.standard_normal(300) - 70.0
+        tmpl = self._template(40)
+        result = nm_math.match_template(data, tmpl, circular=circular,
+                                        method="fft")
+        ref = _match_template_bruteforce(data, tmpl, circular=circular)
+        np.testing.assert_allclose(result, ref, rtol=1e-8, atol=1e-8)
+
+    def test_fft_multiple_blocks(self):
+        # long enough for several overlap-save blocks
+        rng = np.random.default_rng(5)
+        data = rng.standard_normal(20000)
+        tmpl = self._template(300)
+        direct = nm_math.match_template(data, tmpl, method="direct")
+        np.testing.assert_allclose(
+            nm_math.match_template(data, tmpl, method="fft"), direct,
+            rtol=1e-8, atol=1e-8)
+        # auto selects FFT for long templates
+        np.testing.assert_allclose(
+            nm_math.match_template(data, tmpl), direct, rtol=1e-8, atol=1e-8)
+
+    @pytest.mark.parametrize("method", ["direct", "fft"])
+    @pytest.mark.parametrize("circular", [False, True])
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1000])
+    def test_chunked_matches_unchunked(self, method, circular, chunk_size):
+        rng = np.random.default_rng(8)
+        data = rng.standard_normal(500)
+        tmpl = self._template(30)
+        ref = nm_math.match_template(data, tmpl, circular=circular)
+        result = nm_math.match_template(data, tmpl, circular=circular,
+                                        method=method, chunk_size=chunk_size)
+        np.testing.assert_allclose(result, ref, rtol=1e-8, atol=1e-8)
+        if not circular:
+            np.testing.assert_array_equal(result[500 - 30 + 1:], 0.0)
+
+    def test_chunked_event_detection(self):
+        rng = np.random.default_rng(123)
+        m = 20
+        tmpl = self._template(m)
+        data = rng.standard_normal(1000) * 0.1
+        data[515:515 + m] += 5.0 * tmpl  # straddles a block boundary
+        result = nm_math.match_template(data, tmpl, chunk_size=100)
+        assert int(np.argmax(result)) == 515
+        assert result[515] > 4.0
+
+
+class TestMatchTemplateBank:
+    """Tests for nm_math.match_template_bank and match_template_best."""
+
+    @staticmethod
+    def _bank():
+        t = np.arange(300, dtype=float)
+        return [
+            np.sin(np.linspace(0, math.pi, 20)),
+            np.exp(-t[:60] / 5.0),
+            np.exp(-t / 40.0),  # FFT with method="auto"
+        ]
+
+    @staticmethod
+    def _template(m):
+        return np.sin(np.linspace(0, math.pi, m))
+
+    # --- input validation ---
+
+    def test_rejects_non_sequence(self):
+        with pytest.raises(TypeError):
+            nm_math.match_template_bank(np.zeros(10), "abc")
+
+    def test_rejects_empty(self):
+        with pytest.raises(ValueError):
+            nm_math.match_template_bank(np.zeros(10), [])
+
+    def test_rejects_bad_template(self):
+        with pytest.raises(TypeError):
+            nm_math.match_template_bank(np.zeros(10), [[1.0, 2.0]])
+        with pytest.raises(ValueError):
+            nm_math.match_template_bank(np.zeros(10), [np.zeros(20)])
+        with pytest.raises(ValueError):
+            nm_math.match_template_bank(np.zeros(10), np.zeros((2, 2, 2)))
+
+    def test_rejects_invalid_method(self):
+        with pytest.raises(ValueError):
+            nm_math.match_template_bank(np.zeros(10), [np.arange(3.0)],
+                                        method="overlap")
+
+    # --- output ---
+
+    def test_2d_array_of_templates(self):
+        data = np.random.default_rng(1).standard_normal(200)
+        tmpls = np.vstack([np.arange(10.0), np.arange(10.0) ** 2])
+        result = nm_math.match_template_bank(data, tmpls)
+        assert result.shape == (2, 200)
+        for k in range(2):
+            np.testing.assert_allclose(
+                result[k], nm_math.match_template(data, tmpls[k]),
+                rtol=1e-10, atol=1e-10)
+
+    @pytest.mark.parametrize("method", ["auto", "direct", "fft"])
+    @pytest.mark.parametrize("circular", [False, True])
+    @pytest.mark.parametrize("chunk_size", [None, 97])
+    def test_rows_match_single_template(self, method, circular, chunk_size):
+        data = np.random.default_rng(2).standard_normal(3000) - 70.0
+        bank = self._bank() + [np.ones(15)]  # constant template: zeros
+        result = nm_math.match_template_bank(
+            data, bank, circular=circular, method=method,
+            chunk_size=chunk_size)
+        assert result.shape == (len(bank), len(data))
+        for k, tmpl in enumerate(bank):
+            ref = nm_math.match_template(data, tmpl, circular=circular)
+            np.testing.assert_allclose(result[k], ref, rtol=1e-8, atol=1e-8)
+        np.testing.assert_array_equal(result[-1], 0.0)
+
+    def test_matches_bruteforce(self):
+        data = np.random.default_rng(3).standard_normal(400)
+        bank = [self._template(m) for m in (8, 25)]
+        result = nm_math.match_template_bank(data, bank, method="fft")
+        for k, tmpl in enumerate(bank):
+            ref = _match_template_bruteforce(data, tmpl)
+            np.testing.assert_allclose(result[k], ref, rtol=1e-8, atol=1e-8)
+
+    # --- match_template_best ---
+
+    def test_best(self):
+        criteria = np.array([[1.0, -5.0, 3.0, 2.0],
+                             [2.0, -1.0, 3.0, -6.0]])
+        crit, index = nm_math.match_template_best(criteria)
+        np.testing.assert_array_equal(crit, [2.0, -1.0, 3.0, 2.0])
+        np.testing.assert_array_equal(index, [1, 1, 0, 0])
+        crit, index = nm_math.match_template_best(criteria, "negative")
+        np.testing.assert_array_equal(crit, [1.0, -5.0, 3.0, -6.0])
+        np.testing.assert_array_equal(index, [0, 0, 0, 1])
+
+    def test_best_rejects_invalid(self):
+        with pytest.raises(TypeError):
+            nm_math.match_template_best([[1.0]])
+        with pytest.raises(ValueError):
+            nm_math.match_template_best(np.zeros(4))
+        with pytest.raises(ValueError):
+            nm_math.match_template_best(np.zeros((1, 4)), "up")
+
+    def test_best_template_at_events(self):
+        rng = np.random.default_rng(4)
+        bank = self._bank()
+        data = rng.standard_normal(5000) * 0.05
+        data[1000:1060] += 3.0 * bank[1]
+        data[3000:3300] += 3.0 * bank[2]
+        crit, index = nm_math.match_template_best(
+            nm_math.match_template_bank(data, bank))
+        assert index[np.argmax(crit[:2000])] == 1
+        assert index[2000 + np.argmax(crit[2000:])] == 2
+
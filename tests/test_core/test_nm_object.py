@@ -283,6 +283,32 @@ class TestNMObjectPath(NMObjectTestBase):
         expected_str = NM0.name + "." + ONAME0 + ".myobject"
         self.assertEqual(o2.myobject.path_str, expected_str)
 
+    def test_path_cached(self):
+        o2 = NMObject2(parent=NM0, name=ONAME0)
+        s = o2.myobject.path_str
+        self.assertIs(o2.myobject.path_str, s)
+        path = o2.myobject.path
+        path.append("x")  # returns a new list
+        self.assertEqual(len(o2.myobject.path), 3)
+
+    def test_path_ancestor_renamed(self):
+        o2 = NMObject2(parent=NM0, name=ONAME0)
+        self.assertEqual(o2.myobject.path_str,
+                         NM0.name + "." + ONAME0 + ".myobject")
+        o2._name_set(ONAME1, quiet=QUIET)
+        self.assertEqual(o2.myobject.path_str,
+                         NM0.name + "." + ONAME1 + ".myobject")
+        self.assertEqual(o2.myobject.path, [NM0.name, ONAME1, "myobject"])
+
+    def test_path_ancestor_reparented(self):
+        o2 = NMObject2(parent=NM0, name=ONAME0)
+        self.assertEqual(o2.myobject.path[0], NM0.name)
+        o2._parent = None
+        self.assertEqual(o2.myobject.path_str, ONAME0 + ".myobject")
+        o2._parent = self.o1
+        self.assertEqual(o2.myobject.path,
+                         [NM1.name, ONAME1, ONAME0, "myobject"])
+
 
 class TestNMObjectNameSet(NMObjectTestBase):
     """Tests for NMObject._name_set method."""
@@ -1181,6 +1181,63 @@ class TestNMObjectContainerRun(NMObjectContainerTestBase):
             self.assertTrue(self.map0.is_run_target(n))
 
 
+class TestNMObjectContainerKeyIndex(NMObjectContainerTestBase):
+    """Case-insensitive key index stays in sync with the map."""
+
+    def _check_index(self, c):
+        for k in c.keys():
+            self.assertEqual(c._getkey(k.upper()), k)
+            self.assertEqual(c._getkey(k.lower()), k)
+            self.assertTrue(c.contains_value(c[k]))
+        self.assertEqual(len(c._NMObjectContainer__keys), len(c))
+
+    def test_initial(self):
+        self._check_index(self.map0)
+        self.assertIsNone(self.map0._getkey("nope"))
+
+    def test_rename(self):
+        self.map0.rename("OBJECT1", "Renamed")
+        self.assertNotIn("object1", self.map0)
+        self.assertIn("RENAMED", self.map0)
+        self._check_index(self.map0)
+
+    def test_reorder(self):
+        klist = ONLIST0.copy()
+        klist.reverse()
+        self.map0.reorder(klist)
+        self._check_index(self.map0)
+
+    def test_pop_clear(self):
+        self.map0.pop("Object2")
+        self.assertNotIn("object2", self.map0)
+        self.map0.new("Object2")  # name is free again
+        self._check_index(self.map0)
+        self.map0.clear()
+        self.assertNotIn("object0", self.map0)
+        self._check_index(self.map0)
+
+    def test_update_duplicate_new(self):
+        self.map0.update(NMObject(parent=NM0, name="Extra"))
+        self.map0.duplicate("extra", "ExtraCopy")
+        o = self.map0.new()
+        self.assertIn("EXTRACOPY", self.map0)
+        self.assertIn(o.name.upper(), self.map0)
+        with self.assertRaises(KeyError):
+            self.map0.new("EXTRA")
+        self._check_index(self.map0)
+
+    def test_contains_value_identity(self):
+        twin = NMObject(parent=NM0, name=ONLIST0[0])
+        self.assertFalse(self.map0.contains_value(twin))
+        self.assertTrue(self.map0.contains_value(self.olist0[0]))
+
+    def test_deepcopy(self):
+        c = copy.deepcopy(self.map0)
+        self._check_index(c)
+        c.pop(ONLIST0[0])
+        self.assertIn(ONLIST0[0], self.map0)
+
+
 class TestNMObjectContainerHistory(unittest.TestCase):
     """Tests for history logging in NMObjectContainer mutation methods."""
 
@@ -115,6 +115,39 @@ class TestNMScaleY(unittest.TestCase):
         s.label = "voltage"
         self.assertEqual(s.label, "voltage")
 
+    def test_scale_offset_defaults(self):
+        s = NMScaleY()
+        self.assertEqual(s.scale, 1.0)
+        self.assertEqual(s.offset, 0.0)
+        self.assertNotIn("scale", s.to_dict())
+        self.assertNotIn("offset", s.to_dict())
+
+    def test_scale_offset_setters(self):
+        s = NMScaleY(label="voltage", units="mV")
+        s.scale = 0.5
+        s.offset = -2
+        self.assertEqual(s.scale, 0.5)
+        self.assertEqual(s.offset, -2)
+        self.assertEqual(
+            s.to_dict(),
+            {"label": "voltage", "units": "mV", "scale": 0.5, "offset": -2},
+        )
+        self.assertIn("scale=0.5", repr(s))
+        self.assertNotEqual(s, NMScaleY(label="voltage", units="mV"))
+
+    def test_scale_offset_errors(self):
+        s = NMScaleY()
+        with self.assertRaises(TypeError):
+            s.scale = True
+        with self.assertRaises(TypeError):
+            s.offset = "1"
+        with self.assertRaises(ValueError):
+            s.scale = 0
+        with self.assertRaises(ValueError):
+            s.scale = math.inf
+        with self.assertRaises(ValueError):
+            s.offset = math.nan
+
 
 class TestNMScaleX(unittest.TestCase):
     """Tests for NMScaleX."""
@@ -303,6 +336,13 @@ class TestHelperFunctions(unittest.TestCase):
         self.assertEqual(s.label, "current")
         self.assertEqual(s.units, "pA")
 
+    def test_yscale_from_dict_scale_offset(self):
+        d = {"label": "current", "units": "pA", "scale": 0.1, "offset": 3}
+        s = _yscale_from_dict(d)
+        self.assertEqual(s.scale, 0.1)
+        self.assertEqual(s.offset, 3)
+        self.assertEqual(s.to_dict(), d)
+
 
 if __name__ == "__main__":
     unittest.main()
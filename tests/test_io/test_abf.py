@@ -7,6 +7,9 @@ Part of pyNeuroMatic.
 """
 import unittest
 from pathlib import Path
+from unittest import mock
+
+import numpy
 
 from pyneuromatic.core.nm_folder import NMFolder
 
@@ -138,6 +141,66 @@ class TestReadAbfOptions(unittest.TestCase):
         folder = read_abf(ABF_FILE, make_dataseries=False)
         self.assertEqual(len(folder.dataseries), 0)
 
+    def test_compact(self):
+        from pyneuromatic.io.abf import read_abf
+
+        folder = read_abf(ABF_FILE)
+        compact = read_abf(ABF_FILE, compact=True)
+        self.assertEqual(list(compact.data.keys()), list(folder.data.keys()))
+        for name, d in compact.data.items():
+            self.assertEqual(d.nparray_raw.dtype, numpy.int16)
+            # pyabf scales in float32
+            numpy.testing.assert_allclose(
+                d.nparray, folder.data[name].nparray, rtol=1e-6, atol=1e-6
+            )
+
+    def test_lazy(self):
+        from pyneuromatic.io.abf import read_abf
+
+        folder = read_abf(ABF_FILE)
+        lazy = read_abf(ABF_FILE, lazy=True)
+        self.assertEqual(list(lazy.data.keys()), list(folder.data.keys()))
+        self.assertIn("Record", lazy.dataseries)
+        self.assertEqual(lazy.metadata["root"], folder.metadata["root"])
+        d = lazy.data["RecordB3"]
+        self.assertFalse(d.nparray_loaded)
+        self.assertFalse(lazy.data["RecordA0"].nparray_loaded)
+        for name, d in lazy.data.items():
+            self.assertTrue(numpy.array_equal(
+                d.nparray, folder.data[name].nparray))
+            self.assertTrue(d.nparray_loaded)
+
+    def test_lazy_compact(self):
+        from pyneuromatic.io.abf import read_abf
+
+        compact = read_abf(ABF_FILE, compact=True)
+        lazy = read_abf(ABF_FILE, compact=True, lazy=True)
+        d = lazy.data["RecordB3"]
+        self.assertIsInstance(d.nparray_raw, numpy.memmap)
+        self.assertTrue(numpy.array_equal(
+            d.nparray, compact.data["RecordB3"].nparray))
+
+    def test_compact_lazy_without_raw_layout(self):
+        # a pyabf without _dtype, _dataGain and _dataOffset falls back to
+        # its scaled data
+        import pyabf
+        from pyneuromatic.io.abf import read_abf
+
+        class ABF(pyabf.ABF):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                del self._dtype, self._dataGain, self._dataOffset
+
+        folder = read_abf(ABF_FILE)
+        with mock.patch("pyabf.ABF", ABF):
+            compact = read_abf(ABF_FILE, compact=True)
+            lazy = read_abf(ABF_FILE, lazy=True)
+        for f in (compact, lazy):
+            self.assertEqual(list(f.data.keys()), list(folder.data.keys()))
+            for name, d in f.data.items():
+                self.assertTrue(numpy.array_equal(
+                    d.nparray, folder.data[name].nparray))
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
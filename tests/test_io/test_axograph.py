@@ -9,6 +9,8 @@ import tempfile
 import unittest
 from pathlib import Path
 
+import numpy
+
 from pyneuromatic.io.axograph import read_axograph
 from pyneuromatic.core.nm_folder import NMFolder
 
@@ -110,6 +112,38 @@ class TestReadAxographXFile(unittest.TestCase):
         self.assertIn("Record", self.folder.dataseries)
 
 
+class TestReadAxographClassic(unittest.TestCase):
+    """Tests with a synthetic classic Axograph (AxGr) file."""
+
+    def setUp(self):
+        import struct
+
+        self.raw = numpy.array([[0, 10, -20], [5, 6, 7]], dtype=">i2")
+        b = b"AxGr" + struct.pack(">hh", 1, 3)
+        b += struct.pack(">ii", 3, 1) + b"Time (s)".ljust(80, b"\x00")
+        b += struct.pack(">f", 0.5)
+        for raw in self.raw:
+            b += struct.pack(">ii", 3, 1) + b"Vm (mV)".ljust(80, b"\x00")
+            b += struct.pack(">f", 0.25) + raw.tobytes()
+        with tempfile.NamedTemporaryFile(suffix=".axgd", delete=False) as f:
+            f.write(b)
+        self.filepath = Path(f.name)
+
+    def tearDown(self):
+        self.filepath.unlink()
+
+    def test_read(self):
+        for kwargs in ({}, {"compact": True}, {"lazy": True},
+                       {"compact": True, "lazy": True}):
+            folder = read_axograph(self.filepath, **kwargs)
+            self.assertEqual(list(folder.data.keys()),
+                             ["RecordA0", "RecordA1"])
+            d = folder.data["RecordA1"]
+            self.assertEqual(d.yscale.units, "mV")
+            self.assertTrue(numpy.array_equal(
+                d.nparray, self.raw[1].astype(float) * 0.25))
+
+
 @unittest.skipUnless(AXGD_FILE.exists(), "Fixture file not available")
 class TestReadAxographOptions(unittest.TestCase):
     """Tests for read_axograph options."""
@@ -128,6 +162,38 @@ class TestReadAxographOptions(unittest.TestCase):
         folder = read_axograph(AXGD_FILE, make_dataseries=False)
         self.assertEqual(len(folder.dataseries), 0)
 
+    def test_compact(self):
+        folder = read_axograph(AXGD_FILE)
+        compact = read_axograph(AXGD_FILE, compact=True)
+        self.assertEqual(list(compact.data.keys()), list(folder.data.keys()))
+        for name, d in compact.data.items():
+            self.assertEqual(d.nparray_raw.dtype, numpy.int16)
+            numpy.testing.assert_allclose(
+                d.nparray, folder.data[name].nparray, rtol=1e-12
+            )
+            self.assertEqual(d.xscale, folder.data[name].xscale)
+
+    def test_lazy(self):
+        folder = read_axograph(AXGD_FILE)
+        lazy = read_axograph(AXGD_FILE, lazy=True)
+        self.assertEqual(list(lazy.data.keys()), list(folder.data.keys()))
+        self.assertIn("Record", lazy.dataseries)
+        for name, d in lazy.data.items():
+            self.assertFalse(d.nparray_loaded)
+            self.assertEqual(d.xscale, folder.data[name].xscale)
+            self.assertEqual(d.yscale, folder.data[name].yscale)
+            self.assertTrue(numpy.array_equal(
+                d.nparray, folder.data[name].nparray))
+            self.assertTrue(d.nparray.dtype.isnative)
+
+    def test_lazy_compact(self):
+        compact = read_axograph(AXGD_FILE, compact=True)
+        lazy = read_axograph(AXGD_FILE, compact=True, lazy=True)
+        for name, d in lazy.data.items():
+            self.assertIsInstance(d.nparray_raw, numpy.memmap)
+            self.assertTrue(numpy.array_equal(
+                d.nparray, compact.data[name].nparray))
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for batch import of recording files.
+
+Part of pyNeuroMatic.
+"""
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy
+
+from pyneuromatic.core.nm_folder import NMFolderContainer
+from pyneuromatic.core.nm_manager import NMManager
+import pyneuromatic.io.batch as batch
+from pyneuromatic.io.batch import iter_folders, read_many
+from pyneuromatic.tools.nm_tool import NMTool
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+ABF_FILE = FIXTURES_DIR / "15804044.abf"
+AXGD_FILE = FIXTURES_DIR / "Vers6_060523 004.axgd"
+
+
+class TestReadManyErrors(unittest.TestCase):
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            read_many(["data.txt"])
+        with self.assertRaises(FileNotFoundError):
+            read_many(["nonexistent_file.abf"])
+        with self.assertRaises(TypeError):
+            read_many([1])
+        with self.assertRaises(TypeError):
+            read_many([], workers=1.5)
+        with self.assertRaises(ValueError):
+            read_many([], workers=-1)
+        self.assertEqual(read_many([]), [])
+        with self.assertRaises(TypeError):
+            iter_folders([], prefetch=1.5)
+        with self.assertRaises(ValueError):
+            iter_folders([], prefetch=-1)
+        with self.assertRaises(FileNotFoundError):
+            iter_folders(["nonexistent_file.abf"])  # checked before reading
+        self.assertEqual(list(iter_folders([])), [])
+
+
+@unittest.skipUnless(ABF_FILE.exists() and AXGD_FILE.exists(),
+                     "fixture files not available")
+class TestReadMany(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = Path(tempfile.mkdtemp())
+        for i in range(2):
+            shutil.copy(ABF_FILE, cls.tmpdir / ("cell%d.abf" % i))
+            shutil.copy(AXGD_FILE, cls.tmpdir / ("cell%d.axgd" % i))
+        (cls.tmpdir / "notes.txt").write_text("not a recording")
+        cls.paths = sorted(p for p in cls.tmpdir.iterdir()
+                           if p.suffix != ".txt")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def assertFoldersEqual(self, flist0, flist1):
+        self.assertEqual([f.name for f in flist0], [f.name for f in flist1])
+        for f0, f1 in zip(flist0, flist1):
+            self.assertEqual(list(f0.data), list(f1.data))
+            self.assertEqual(list(f0.dataseries), list(f1.dataseries))
+            for name in f0.data:
+                d0 = f0.data[name]
+                d1 = f1.data[name]
+                numpy.testing.assert_array_equal(d0.nparray, d1.nparray)
+                self.assertEqual(d0.xscale.delta, d1.xscale.delta)
+                self.assertEqual(d0.yscale.units, d1.yscale.units)
+
+    def test_serial(self):
+        flist = read_many(self.paths, workers=0)
+        self.assertEqual([f.name for f in flist],
+                         ["cell0", "cell0", "cell1", "cell1"])
+        self.assertEqual(len(flist[0].data), len(flist[2].data))
+
+    def test_workers(self):
+        flist = read_many(self.paths, workers=3)
+        self.assertFoldersEqual(flist, read_many(self.paths, workers=1))
+        ds = flist[0].dataseries["Record"]
+        self.assertIs(ds.channels["A"].data[0], flist[0].data["RecordA0"])
+
+    def test_directory(self):
+        flist = read_many(self.tmpdir, workers=2, compact=True)
+        self.assertFoldersEqual(flist, read_many(self.paths, workers=0,
+                                                 compact=True))
+
+    def test_container(self):
+        container = NMFolderContainer()
+        container.new("cell1")
+        flist = read_many(self.paths[:2], workers=2, container=container)
+        # names already in use are renamed
+        self.assertEqual(list(container), ["cell1", "cell0", "folder2"])
+        self.assertIs(container["folder2"], flist[1])
+        flist = container.read_many(self.paths[2:], workers=2)
+        self.assertEqual(len(container), 5)
+        self.assertEqual(list(container)[3:], [f.name for f in flist])
+        self.assertIs(container[flist[1].name], flist[1])
+        self.assertIs(flist[1]._parent, container._parent)
+
+
+class _RecordTool(NMTool):
+    """Records the folder and epoch of each run target."""
+
+    def __init__(self):
+        super().__init__()
+        self.targets = []
+
+    def run(self):
+        self.targets.append((self.folder.name, self.epoch.name))
+        return True
+
+
+@unittest.skipUnless(ABF_FILE.exists(), "ABF fixture file not available")
+class TestIterFolders(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = Path(tempfile.mkdtemp())
+        for i in range(5):
+            shutil.copy(ABF_FILE, cls.tmpdir / ("cell%d.abf" % i))
+        cls.paths = sorted(cls.tmpdir.iterdir())
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def test_order(self):
+        for prefetch in (0, 1, 3):
+            items = list(iter_folders(self.tmpdir, prefetch=prefetch))
+            self.assertEqual([p for p, _ in items], self.paths)
+            self.assertEqual([f.name for _, f in items],
+                             ["cell%d" % i for i in range(5)])
+        items = list(iter_folders(self.paths[:2], processes=True,
+                                  compact=True))
+        self.assertIsNotNone(items[1][1].data["RecordA0"].nparray_raw)
+
+    def test_bounded(self):
+        lock = threading.Lock()
+        state = {"reads": 0, "consumed": 0, "ahead": 0}
+        read_file = batch._read_file
+
+        def counting_read(job):
+            with lock:
+                state["reads"] += 1
+                ahead = state["reads"] - state["consumed"]
+                state["ahead"] = max(state["ahead"], ahead)
+            return read_file(job)
+
+        with mock.patch.object(batch, "_read_file", counting_read):
+            for _, folder in iter_folders(self.paths, prefetch=2):
+                with lock:
+                    state["consumed"] += 1
+        self.assertEqual(state["reads"], 5)
+        # reads started ahead of the folders handed out
+        self.assertLessEqual(state["ahead"], 3)
+
+        with mock.patch.object(batch, "_read_file", counting_read):
+            state["reads"] = 0
+            it = iter_folders(self.paths, prefetch=2)
+            next(it)
+            it.close()  # stops reading ahead
+        self.assertLessEqual(state["reads"], 3)
+
+    def test_run_tool_files(self):
+        nm = NMManager(quiet=True)
+        tool = _RecordTool()
+        nm.tool_add("record", tool=tool, select=True)
+        with self.assertRaises(ValueError):
+            nm.run_tool_files(self.paths)  # no run configuration
+        nm.folders.read_many(self.paths[:1], workers=0, select=True)
+        nm.run_keys_set({"folder": "selected", "dataseries": "Record",
+                         "channel": "A", "epoch": "all"})
+        seen = []
+        results = nm.run_tool_files(self.paths[:3], prefetch=1,
+                                    callback=lambda f: seen.append(f.name))
+        self.assertEqual(list(results), [str(p) for p in self.paths[:3]])
+        # cell0 already exists, so the first file is renamed
+        self.assertEqual(seen[1:], ["cell1", "cell2"])
+        self.assertEqual([f for f, _ in tool.targets][-1], "cell2")
+        self.assertEqual(len(set(f for f, _ in tool.targets)), 3)
+        self.assertEqual(list(nm.folders), ["cell0"])  # dropped
+        self.assertEqual(nm.folders.run_target, "selected")
+        nm.run_tool_files(self.paths[3:], keep=True)
+        self.assertEqual(list(nm.folders), ["cell0", "cell3", "cell4"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the import cache.
+
+Part of pyNeuroMatic.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy
+
+from pyneuromatic.io.cache import (
+    ImportCache, get_import_cache, set_import_cache
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+ABF_FILE = FIXTURES_DIR / "15804044.abf"
+AXGD_FILE = FIXTURES_DIR / "Vers6_060523 004.axgd"
+
+try:
+    import h5py  # noqa: F401
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+
+@unittest.skipUnless(HAS_H5PY, "h5py not installed")
+class TestImportCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.cache = set_import_cache(self.tmpdir / "cache")
+
+    def tearDown(self):
+        set_import_cache(None)
+        shutil.rmtree(self.tmpdir)
+
+    def assertFoldersEqual(self, f0, f1):
+        self.assertEqual(f0.name, f1.name)
+        self.assertEqual(list(f0.data), list(f1.data))
+        self.assertEqual(list(f0.dataseries), list(f1.dataseries))
+        self.assertEqual(f0.metadata, f1.metadata)
+        for name in f0.data:
+            d0 = f0.data[name]
+            d1 = f1.data[name]
+            numpy.testing.assert_array_equal(d0.nparray, d1.nparray)
+            self.assertEqual(d0.xscale.delta, d1.xscale.delta)
+            self.assertEqual(d0.yscale.units, d1.yscale.units)
+
+    def test_set(self):
+        self.assertIs(get_import_cache(), self.cache)
+        self.assertEqual(self.cache.directory, self.tmpdir / "cache")
+        self.assertIsNone(set_import_cache(None))
+        self.assertIsNone(get_import_cache())
+        with self.assertRaises(TypeError):
+            ImportCache(self.tmpdir, max_size=1.5)
+        with self.assertRaises(ValueError):
+            ImportCache(self.tmpdir, max_size=-1)
+
+    def test_key(self):
+        path = self.tmpdir / "a.abf"
+        path.write_bytes(b"0123")
+        key = self.cache.key(path, "read_abf", compact=False)
+        self.assertEqual(key, self.cache.key(path, "read_abf",
+                                             compact=False))
+        self.assertNotEqual(key, self.cache.key(path, "read_abf",
+                                                compact=True))
+        self.assertNotEqual(key, self.cache.key(path, "read_axograph",
+                                                compact=False))
+        path.write_bytes(b"01234")
+        self.assertNotEqual(key, self.cache.key(path, "read_abf",
+                                                compact=False))
+        # content keys ignore the path
+        cache = ImportCache(self.tmpdir / "cache", hash_content=True)
+        copy = self.tmpdir / "b.abf"
+        shutil.copy(path, copy)
+        self.assertEqual(cache.key(path, "read_abf"),
+                         cache.key(copy, "read_abf"))
+
+    @unittest.skipUnless(ABF_FILE.exists(), "ABF fixture file not available")
+    def test_read_abf(self):
+        from pyneuromatic.io.abf import read_abf
+
+        f0 = read_abf(ABF_FILE)
+        self.assertEqual(len(list(self.cache.directory.glob("*.h5"))), 1)
+        key = self.cache.key(ABF_FILE, "read_abf", prefix="Record",
+                             make_dataseries=True, compact=False)
+        self.assertIsNotNone(self.cache.get(key))
+        f1 = read_abf(ABF_FILE)
+        self.assertFoldersEqual(f0, f1)
+        ds = f1.dataseries["Record"]
+        self.assertIs(ds.channels["A"].data[0], f1.data["RecordA0"])
+        f2 = read_abf(ABF_FILE, lazy=True)  # hit, memory-mapped
+        self.assertFoldersEqual(f0, f2)
+        f3 = read_abf(ABF_FILE, compact=True)  # different key
+        self.assertEqual(len(list(self.cache.directory.glob("*.h5"))), 2)
+        f4 = read_abf(ABF_FILE, compact=True)
+        self.assertIsNotNone(f4.data["RecordA0"].nparray_raw)
+        self.assertFoldersEqual(f3, f4)
+
+    @unittest.skipUnless(AXGD_FILE.exists(),
+                         "Axograph fixture file not available")
+    def test_read_axograph(self):
+        from pyneuromatic.io.axograph import read_axograph
+
+        f0 = read_axograph(AXGD_FILE, lazy=True)  # lazy reads not cached
+        self.assertEqual(self.cache.size, 0)
+        f1 = read_axograph(AXGD_FILE)
+        self.assertGreater(self.cache.size, 0)
+        self.assertFoldersEqual(f0, f1)
+        self.assertFoldersEqual(f0, read_axograph(AXGD_FILE))
+
+    def test_lazy_get_survives_evict(self):
+        from pyneuromatic.core.nm_folder import NMFolder
+
+        folder = NMFolder(name="folder0")
+        folder.data.new("RecordA0", nparray=numpy.arange(1000.0),
+                        quiet=True)
+        cache = ImportCache(self.tmpdir / "cache", max_size=0)
+        cache.put("a", folder)
+        f1 = cache.get("a", lazy=True)
+        cache.put("b", folder)  # evicts "a"
+        self.assertEqual([p.stem for p, _ in cache._entries()], ["b"])
+        numpy.testing.assert_array_equal(f1.data["RecordA0"].nparray,
+                                         numpy.arange(1000.0))
+
+    def test_get_renames_folder(self):
+        from pyneuromatic.core.nm_folder import NMFolder
+
+        folder = NMFolder(name="cell1")
+        folder.data.new("RecordA0", nparray=numpy.zeros(10), quiet=True)
+        self.cache.put("a", folder)
+        self.assertEqual(self.cache.get("a").name, "cell1")
+        self.assertEqual(self.cache.get("a", filepath="x/2-cell.abf").name,
+                         "F2_cell")
+
+    @unittest.skipUnless(ABF_FILE.exists(), "ABF fixture file not available")
+    def test_hash_content_copy(self):
+        from pyneuromatic.io.abf import read_abf
+
+        set_import_cache(self.tmpdir / "cache", hash_content=True)
+        copy = self.tmpdir / "cell2.abf"
+        shutil.copy(ABF_FILE, copy)
+        f0 = read_abf(ABF_FILE)
+        f1 = read_abf(copy)  # hit
+        self.assertEqual(len(list(self.cache.directory.glob("*.h5"))), 1)
+        self.assertEqual(f0.name, "F15804044")
+        self.assertEqual(f1.name, "cell2")
+
+    def test_evict(self):
+        from pyneuromatic.core.nm_folder import NMFolder
+
+        folder = NMFolder(name="folder0")
+        folder.data.new("RecordA0", nparray=numpy.zeros(1000), quiet=True)
+        cache = ImportCache(self.tmpdir / "cache", max_size=0)
+        keys = ["a", "b", "c"]
+        for i, key in enumerate(keys):
+            path = cache.put(key, folder)
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+        # the entry just written is kept even when over the size limit
+        self.assertEqual([p.stem for p, _ in cache._entries()], ["c"])
+        cache = ImportCache(self.tmpdir / "cache")
+        for i, key in enumerate(keys):
+            path = cache.put(key, folder)
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+        cache.get("a")  # most recently used
+        size = cache.size
+        cache = ImportCache(self.tmpdir / "cache", max_size=size * 2 // 3)
+        self.assertEqual(cache.evict(), 1)
+        self.assertEqual(sorted(p.stem for p, _ in cache._entries()),
+                         ["a", "c"])
+        self.assertIsNone(cache.get("b"))
+        cache.clear()
+        self.assertEqual(cache.size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for following ABF files that are still being acquired.
+
+Part of pyNeuroMatic.
+"""
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy
+
+from pyneuromatic.core.nm_folder import NMFolder
+from pyneuromatic.tools.nm_tool import NMTool
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+ABF_FILE = FIXTURES_DIR / "15804044.abf"
+
+try:
+    import pyabf  # noqa: F401
+    HAS_PYABF = True
+except ImportError:
+    HAS_PYABF = False
+
+
+class RecordTool(NMTool):
+    """Tool that records the channel and epoch of each run."""
+
+    def __init__(self):
+        super().__init__(name="record")
+        self.runs = []
+
+    def run(self):
+        self.runs.append((self.channel.name, self.epoch.name))
+        return True
+
+
+@unittest.skipUnless(HAS_PYABF and ABF_FILE.exists(),
+                     "pyabf or ABF fixture file not available")
+class TestABFFollower(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from pyneuromatic.io.abf import read_abf
+
+        cls.ref = read_abf(ABF_FILE)
+        cls.bytes = ABF_FILE.read_bytes()
+        abf = pyabf.ABF(str(ABF_FILE), loadData=False)
+        cls.data_start = abf.dataByteStart
+        cls.sweep_bytes = abf.sweepPointCount * abf.channelCount * 2
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.filepath = self.tmpdir / "cell0.abf"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, nsweeps, extra=0):
+        """Write the fixture up to nsweeps sweeps (+ extra bytes)."""
+        n = self.data_start + nsweeps * self.sweep_bytes + extra
+        self.filepath.write_bytes(self.bytes[:n])
+
+    def test_poll(self):
+        from pyneuromatic.io.follow import ABFFollower
+
+        self.write(0)
+        follower = ABFFollower(self.filepath)
+        self.assertEqual(follower.poll(), [])
+        self.write(2, extra=100)  # plus part of sweep 2
+        epochs = follower.poll()
+        self.assertEqual([e.name for e in epochs], ["E0", "E1"])
+        self.assertEqual(follower.sweep_count, 2)
+        self.assertEqual(follower.poll(), [])
+        self.write(5)
+        epochs = follower.poll()
+        self.assertEqual([e.name for e in epochs], ["E2", "E3", "E4"])
+        folder = follower.folder
+        self.assertEqual(folder.name, "cell0")
+        self.assertEqual(len(folder.data), 10)
+        ds = folder.dataseries["Record"]
+        self.assertEqual(list(ds.channels), ["A", "B"])
+        self.assertEqual(len(ds.epochs), 5)
+        for name in folder.data:
+            d = folder.data[name]
+            ref = self.ref.data[name]
+            self.assertEqual(d.nparray.dtype, ref.nparray.dtype)
+            numpy.testing.assert_array_equal(d.nparray, ref.nparray)
+            self.assertEqual(d.xscale.delta, ref.xscale.delta)
+            self.assertEqual(d.yscale.units, ref.yscale.units)
+        self.assertIs(ds.get_data("B", "E4"), folder.data["RecordB4"])
+        self.assertEqual(folder.metadata["root"]["NumWaves"], 5)
+
+    def test_complete_file(self):
+        from pyneuromatic.io.follow import ABFFollower
+
+        self.filepath.write_bytes(self.bytes)
+        follower = ABFFollower(self.filepath, compact=True)
+        self.assertEqual(len(follower.poll()), 10)
+        self.assertEqual(follower.poll(), [])
+        d = follower.folder.data["RecordA9"]
+        self.assertIsNotNone(d.nparray_raw)
+        numpy.testing.assert_allclose(
+            d.nparray, self.ref.data["RecordA9"].nparray, rtol=1e-6)
+
+    def test_header_without_data_count(self):
+        import struct
+
+        from pyneuromatic.io.follow import ABFFollower
+
+        # header written before acquisition: data section count still 0
+        head = bytearray(self.bytes)
+        off = 76 + 10 * 16  # data section of the ABF2 section map
+        block, nbytes, _ = struct.unpack_from("<IIq", head, off)
+        struct.pack_into("<IIq", head, off, block, nbytes, 0)
+        self.filepath.write_bytes(head)  # all sections in the file
+        follower = ABFFollower(self.filepath)
+        self.assertEqual(follower.poll(), [])
+        self.filepath.write_bytes(head[:self.data_start
+                                       + 3 * self.sweep_bytes])
+        self.assertEqual(follower.poll(), [])
+        self.write(3)  # final header
+        self.assertEqual(len(follower.poll()), 3)
+        self.filepath.write_bytes(self.bytes)
+        self.assertEqual(len(follower.poll()), 7)
+        self.assertEqual(follower.sweep_count, 10)
+        self.assertEqual(follower.poll(), [])
+
+    def test_tools_and_callbacks(self):
+        from pyneuromatic.io.follow import ABFFollower
+
+        self.write(1)
+        folder = NMFolder(name="folder0")
+        follower = ABFFollower(self.filepath, folder=folder)
+        tool = RecordTool()
+        calls = []
+        follower.add_tool(tool)
+        follower.add_callback(lambda f, epochs: calls.append(
+            [e.name for e in epochs]))
+        follower.poll()
+        self.write(3)
+        follower.poll()
+        self.assertIs(follower.folder, folder)
+        self.assertEqual(calls, [["E0"], ["E1", "E2"]])
+        self.assertEqual(tool.runs, [
+            ("A", "E0"), ("B", "E0"),
+            ("A", "E1"), ("A", "E2"), ("B", "E1"), ("B", "E2"),
+        ])
+        follower.remove_tool(tool)
+        self.write(4)
+        follower.poll()
+        self.assertEqual(len(tool.runs), 6)
+        self.assertEqual(calls[-1], ["E3"])
+        with self.assertRaises(TypeError):
+            follower.add_tool("stats")
+        with self.assertRaises(TypeError):
+            follower.add_callback(None)
+
+    def test_follow(self):
+        from pyneuromatic.io.follow import ABFFollower
+
+        self.write(3)
+        follower = ABFFollower(self.filepath)
+        self.assertEqual(follower.follow(interval=0.01, idle=0.05), 3)
+        self.write(4)
+        self.assertEqual(follower.follow(interval=0.01, max_sweeps=4), 4)
+
+    def test_errors(self):
+        from pyneuromatic.io.follow import ABFFollower
+
+        with self.assertRaises(FileNotFoundError):
+            ABFFollower(self.tmpdir / "nonexistent_file.abf")
+
+    def test_without_raw_layout(self):
+        # a pyabf without _dtype, _dataGain and _dataOffset
+        import pyabf
+        from pyneuromatic.io.follow import ABFFollower
+
+        class ABF(pyabf.ABF):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                del self._dtype, self._dataGain, self._dataOffset
+
+        self.write(3)
+        follower = ABFFollower(self.filepath)
+        with mock.patch("pyabf.ABF", ABF):
+            with self.assertRaises(RuntimeError):
+                follower.poll()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
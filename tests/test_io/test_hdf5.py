@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for HDF5 file reader.
+
+Part of pyNeuroMatic.
+"""
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import h5py
+import numpy
+
+from pyneuromatic.core.nm_folder import NMFolder, NMFolderContainer
+from pyneuromatic.core.nm_manager import NMManager
+from pyneuromatic.io.hdf5 import (
+    read_hdf5,
+    hdf5_array,
+    write_hdf5,
+    read_hdf5_folders,
+    hdf5_contents,
+    is_nm_hdf5,
+)
+
+
+def _write_fixture(filepath: Path) -> None:
+    with h5py.File(filepath, "w") as f:
+        for ch in "AB":
+            for ep in range(3):
+                arr = numpy.arange(100, dtype=numpy.float64) + ep
+                dset = f.create_dataset("Record%s%d" % (ch, ep), data=arr)
+                dset.attrs["xstart"] = 0.0
+                dset.attrs["xdelta"] = 0.05
+                dset.attrs["xunits"] = "ms"
+                dset.attrs["ylabel"] = "Vm" if ch == "A" else "Im"
+                dset.attrs["yunits"] = "mV" if ch == "A" else "pA"
+        f.create_dataset(
+            "Chunked0", data=numpy.ones(50), chunks=(10,), compression="gzip"
+        )
+        igor = f.create_dataset("IgorWave", data=numpy.zeros(20))
+        igor.attrs["IGORWaveScaling"] = numpy.array([[0, 0], [0.1, -2.0]])
+        igor.attrs["IGORWaveUnits"] = numpy.array([b"pA", b"ms"])
+        f.create_dataset("Matrix", data=numpy.zeros((4, 4)))
+        f.create_group("SubFolder")
+
+
+class TestReadHdf5(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = Path(tempfile.mkdtemp())
+        cls.filepath = cls.tmpdir / "rec_001.h5"
+        _write_fixture(cls.filepath)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def test_file_not_found(self):
+        with self.assertRaises(FileNotFoundError):
+            read_hdf5(self.tmpdir / "nonexistent_file.h5")
+
+    def test_returns_folder(self):
+        folder = read_hdf5(self.filepath)
+        self.assertIsInstance(folder, NMFolder)
+        self.assertEqual(folder.name, "rec_001")
+
+    def test_data_names(self):
+        folder = read_hdf5(self.filepath)
+        self.assertIn("RecordA0", folder.data)
+        self.assertIn("RecordB2", folder.data)
+        self.assertIn("Chunked0", folder.data)
+        self.assertIn("IgorWave", folder.data)
+        self.assertNotIn("Matrix", folder.data)  # 2-D skipped
+        self.assertNotIn("SubFolder", folder.data)
+
+    def test_lazy_not_loaded(self):
+        folder = read_hdf5(self.filepath)
+        d = folder.data["RecordA1"]
+        self.assertFalse(d.nparray_loaded)
+        self.assertIsInstance(d.nparray, numpy.ndarray)
+        self.assertTrue(d.nparray_loaded)
+
+    def test_lazy_memmap(self):
+        folder = read_hdf5(self.filepath)
+        arr = folder.data["RecordA1"].nparray
+        self.assertIsInstance(arr, numpy.memmap)
+        self.assertFalse(arr.flags.writeable)
+        self.assertEqual(arr.shape, (100,))
+        self.assertEqual(arr[0], 1.0)
+        self.assertEqual(float(numpy.mean(arr[10:20])), 15.5)
+
+    def test_chunked_read_into_memory(self):
+        folder = read_hdf5(self.filepath)
+        arr = folder.data["Chunked0"].nparray
+        self.assertNotIsInstance(arr, numpy.memmap)
+        self.assertTrue(numpy.array_equal(arr, numpy.ones(50)))
+
+    def test_not_lazy(self):
+        folder = read_hdf5(self.filepath, lazy=False)
+        d = folder.data["RecordB0"]
+        self.assertTrue(d.nparray_loaded)
+        self.assertNotIsInstance(d.nparray, numpy.memmap)
+
+    def test_scales(self):
+        folder = read_hdf5(self.filepath)
+        d = folder.data["RecordB0"]
+        self.assertEqual(d.xscale.delta, 0.05)
+        self.assertEqual(d.xscale.units, "ms")
+        self.assertEqual(d.yscale.label, "Im")
+        self.assertEqual(d.yscale.units, "pA")
+
+    def test_igor_scales(self):
+        folder = read_hdf5(self.filepath)
+        d = folder.data["IgorWave"]
+        self.assertEqual(d.xscale.delta, 0.1)
+        self.assertEqual(d.xscale.start, -2.0)
+        self.assertEqual(d.xscale.units, "ms")
+        self.assertEqual(d.yscale.units, "pA")
+
+    def test_dataseries(self):
+        folder = read_hdf5(self.filepath)
+        ds = folder.dataseries.get("Record")
+        self.assertIsNotNone(ds)
+        self.assertEqual(list(ds.channels.keys()), ["A", "B"])
+        self.assertEqual(list(ds.epochs.keys()), ["E0", "E1", "E2"])
+        d = ds.get_data("B", "E2")
+        self.assertIs(d, folder.data["RecordB2"])
+        self.assertFalse(d.nparray_loaded)
+
+    def test_get_xindex_lazy(self):
+        folder = read_hdf5(self.filepath)
+        d = folder.data["RecordA0"]
+        self.assertEqual(d.get_xindex(1.0), 20)
+        self.assertTrue(d.nparray_loaded)
+
+    def test_hdf5_array_missing(self):
+        with self.assertRaises(KeyError):
+            hdf5_array(self.filepath, "DoesNotExist")
+
+    def test_open_hdf5(self):
+        fc = NMFolderContainer()
+        f = fc.open_hdf5(str(self.filepath), name="rec", select=True)
+        self.assertIs(fc.get("rec"), f)
+        self.assertEqual(fc.selected_name, "rec")
+        self.assertIn("RecordA0", f.data)
+
+
+def _make_folder(name: str = "folder0") -> NMFolder:
+    folder = NMFolder(name=name)
+    matches = {}
+    for ch in range(2):
+        for ep in range(3):
+            dname = "Record%s%d" % ("AB"[ch], ep)
+            d = folder.data.new(
+                dname,
+                xscale={"start": 0.0, "delta": 0.1, "units": "ms"},
+                yscale={"label": "Vm", "units": "mV"},
+                quiet=True,
+            )
+            d.nparray = numpy.arange(50, dtype=numpy.float64) * (ch + 1) + ep
+            matches[("AB"[ch], ep)] = d
+    folder.build_dataseries("Record", matches)
+    folder.data.new("Avg", nparray=numpy.ones(10, dtype=numpy.float32),
+                    quiet=True)
+    folder.data.new("Names", nparray=numpy.array(["E0", "E1"], dtype=object),
+                    quiet=True)
+    folder.data["RecordA0"].notes.add("first")
+    folder.data.sets.add("Set1", ["RecordA0", "RecordA1"])
+    folder.notes.add("folder note")
+    folder.metadata["root"] = {"AcqMode": "episodic", "n": numpy.int32(3)}
+    ds = folder.dataseries["Record"]
+    ds.epochs.sets.add("Set1", ["E0", "E2"])
+    ds.epochs.groups.assign("E1", 1)
+    tf = folder.toolfolders.new("stats0", quiet=True)
+    tf.data.new("ST_mean", nparray=numpy.array([1.0, 2.0]), quiet=True)
+    folder.toolresults_save("stats", {
+        "w0": [[{"data": "RecordA0", "s": "mean", "x": 1.5, "n": 10,
+                 "ok": True, "err": None}],
+               [{"data": "RecordA1", "s": "max", "x": 2.5, "n": 11,
+                 "ok": False, "err": "oops"}]],
+    }, quiet=True)
+    folder.toolresults_save(
+        "spike", {"E0": numpy.array([1.0, 2.5]), "E1": [3, 4]}, quiet=True
+    )
+    return folder
+
+
+class TestWriteHdf5(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.filepath = self.tmpdir / "session.h5"
+        self.folder = _make_folder()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _roundtrip(self, **kwargs) -> NMFolder:
+        write_hdf5(self.folder, self.filepath, **kwargs)
+        flist = read_hdf5_folders(self.filepath)
+        self.assertEqual(len(flist), 1)
+        return flist[0]
+
+    def test_bad_folders(self):
+        with self.assertRaises(TypeError):
+            write_hdf5("folder0", self.filepath)
+        with self.assertRaises(TypeError):
+            write_hdf5([self.folder, None], self.filepath)
+
+    def test_is_nm_hdf5(self):
+        write_hdf5(self.folder, self.filepath)
+        self.assertTrue(is_nm_hdf5(self.filepath))
+        other = self.tmpdir / "other.h5"
+        _write_fixture(other)
+        self.assertFalse(is_nm_hdf5(other))
+        with self.assertRaises(ValueError):
+            read_hdf5_folders(other)
+
+    def test_contents(self):
+        write_hdf5(self.folder, self.filepath)
+        c = hdf5_contents(self.filepath)
+        self.assertEqual(list(c.keys()), ["folder0"])
+        self.assertIn("RecordB2", c["folder0"]["data"])
+        self.assertEqual(c["folder0"]["dataseries"], ["Record"])
+        self.assertEqual(c["folder0"]["toolfolders"], ["stats0"])
+        self.assertEqual(sorted(c["folder0"]["toolresults"]),
+                         ["spike", "stats"])
+
+    def test_data(self):
+        f = self._roundtrip()
+        self.assertEqual(list(f.data.keys()), list(self.folder.data.keys()))
+        d = f.data["RecordB2"]
+        self.assertFalse(d.nparray_loaded)
+        self.assertIsInstance(d.nparray, numpy.memmap)
+        self.assertTrue(numpy.array_equal(
+            d.nparray, self.folder.data["RecordB2"].nparray))
+        self.assertEqual(f.data["Avg"].nparray.dtype, numpy.float32)
+        self.assertEqual(list(f.data["Names"].nparray), ["E0", "E1"])
+        self.assertEqual(d.xscale.delta, 0.1)
+        self.assertEqual(d.xscale.units, "ms")
+        self.assertEqual(d.yscale.label, "Vm")
+        self.assertEqual(f.data["RecordA0"].notes.note, "first")
+
+    def test_data_raw(self):
+        raw = numpy.array([-3, 0, 7], dtype=numpy.int16)
+        self.folder.data["RecordA1"].nparray_raw_set(raw, scale=0.25,
+                                                     offset=1.0)
+        f = self._roundtrip()
+        d = f.data["RecordA1"]
+        self.assertEqual(d.nparray_raw.dtype, numpy.int16)
+        self.assertEqual(d.yscale.scale, 0.25)
+        self.assertTrue(numpy.array_equal(d.nparray, [0.25, 1.0, 2.75]))
+
+    def test_folder_notes_metadata(self):
+        f = self._roundtrip()
+        self.assertEqual(f.notes.note, "folder note")
+        self.assertEqual(f.metadata["root"], {"AcqMode": "episodic", "n": 3})
+
+    def test_sets_and_groups(self):
+        f = self._roundtrip()
+        self.assertEqual(dict(f.data.sets.items())["Set1"], ["RecordA0", "RecordA1"])
+        ds = f.dataseries["Record"]
+        self.assertEqual(dict(ds.epochs.sets.items())["Set1"], ["E0", "E2"])
+        self.assertEqual(ds.epochs.groups.get_group("E1"), 1)
+
+    def test_dataseries(self):
+        f = self._roundtrip()
+        ds = f.dataseries["Record"]
+        self.assertEqual(list(ds.channels.keys()), ["A", "B"])
+        self.assertEqual(list(ds.epochs.keys()), ["E0", "E1", "E2"])
+        self.assertIs(ds.get_data("B", "E1"), f.data["RecordB1"])
+        self.assertEqual(ds.epochs["E2"].number, 2)
+
+    def test_toolfolders(self):
+        f = self._roundtrip()
+        tf = f.toolfolders["stats0"]
+        self.assertTrue(numpy.array_equal(
+            tf.data["ST_mean"].nparray, [1.0, 2.0]))
+
+    def test_toolresults(self):
+        f = self._roundtrip()
+        stats = f.toolresults["stats"][0]["results"]
+        self.assertEqual(stats, self.folder.toolresults["stats"][0]["results"])
+        self.assertIsInstance(stats["w0"][0][0]["n"], int)
+        self.assertIs(stats["w0"][1][0]["ok"], False)
+        spike = f.toolresults["spike"][0]["results"]
+        self.assertTrue(numpy.array_equal(spike["E0"], [1.0, 2.5]))
+        self.assertEqual(spike["E1"], [3, 4])
+        self.assertEqual(f.toolresults["spike"][0]["date"],
+                         self.folder.toolresults["spike"][0]["date"])
+
+    def test_toolresults_columnar(self):
+        write_hdf5(self.folder, self.filepath)
+        with h5py.File(self.filepath, "r") as f:
+            g = f["folder0/toolresults/stats/0/records"]
+            self.assertEqual(list(g["x"][()]), [1.5, 2.5])
+
+    def test_toolresults_int64_and_keys(self):
+        results = {"w0": [{"n": 2**53 + 1, "big": 2**64, "a/b": 1.0,
+                           "_path": "p", "_keys": "k", "%2F": 2, "": 3}]}
+        self.folder.toolresults_save("stats", results, quiet=True)
+        write_hdf5(self.folder, self.filepath)
+        with h5py.File(self.filepath, "r") as f:
+            g = f["folder0/toolresults/stats/1/records"]
+            self.assertEqual(g["n"].dtype, numpy.int64)
+        f = self._roundtrip()
+        self.assertEqual(f.toolresults["stats"][1]["results"], results)
+
+    def test_partial_load(self):
+        self.folder.data.new("Other", nparray=numpy.zeros(5), quiet=True)
+        write_hdf5(self.folder, self.filepath)
+        flist = read_hdf5_folders(
+            self.filepath, dataseries=["Record"], toolfolders=[],
+            toolresults=["stats"],
+        )
+        f = flist[0]
+        self.assertNotIn("Other", f.data)
+        self.assertIn("RecordA2", f.data)
+        self.assertEqual(len(f.toolfolders), 0)
+        self.assertEqual(list(f.toolresults.keys()), ["stats"])
+        with self.assertRaises(KeyError):
+            read_hdf5_folders(self.filepath, folders=["nope"])
+
+    def test_compression(self):
+        f = self._roundtrip(compression="gzip", compression_opts=4)
+        d = f.data["RecordA1"]
+        self.assertNotIsInstance(d.nparray, numpy.memmap)
+        self.assertTrue(numpy.array_equal(
+            d.nparray, self.folder.data["RecordA1"].nparray))
+        with h5py.File(self.filepath, "r") as h:
+            self.assertEqual(h["folder0/data/RecordA1"].compression, "gzip")
+
+    def test_not_lazy(self):
+        write_hdf5(self.folder, self.filepath)
+        f = read_hdf5_folders(self.filepath, lazy=False)[0]
+        self.assertTrue(f.data["RecordA0"].nparray_loaded)
+
+    def test_save_lazy_to_same_path(self):
+        write_hdf5(self.folder, self.filepath)
+        expected = self.folder.data["RecordA1"].nparray.copy()
+        # loaders still pending
+        f = read_hdf5_folders(self.filepath)[0]
+        write_hdf5(f, self.filepath)
+        f = read_hdf5_folders(self.filepath)[0]
+        self.assertTrue(numpy.array_equal(f.data["RecordA1"].nparray,
+                                          expected))
+        # arrays memory-mapped from the file being replaced
+        self.assertIsInstance(f.data["RecordA1"].nparray, numpy.memmap)
+        write_hdf5(f, self.filepath)
+        self.assertTrue(numpy.array_equal(f.data["RecordA1"].nparray,
+                                          expected))
+        f = read_hdf5_folders(self.filepath)[0]
+        self.assertTrue(numpy.array_equal(f.data["RecordA1"].nparray,
+                                          expected))
+        self.assertEqual(list(self.tmpdir.iterdir()), [self.filepath])
+
+    def test_folder_save(self):
+        path = self.folder.save(str(self.filepath))
+        self.assertEqual(path, str(self.filepath))
+        self.assertTrue(is_nm_hdf5(self.filepath))
+
+    def test_manager_save_load(self):
+        nm = NMManager(quiet=True)
+        f = nm.folders.new(quiet=True)
+        f.data.new("RecordA0", nparray=numpy.arange(5.0), quiet=True)
+        nm.save(str(self.filepath))
+        flist = nm.load(str(self.filepath))
+        self.assertEqual(len(flist), 1)
+        self.assertNotEqual(flist[0].name, f.name)  # renamed, name in use
+        self.assertEqual(nm.folders.selected_name, flist[0].name)
+        self.assertIs(flist[0]._parent, nm)
+        self.assertTrue(numpy.array_equal(
+            flist[0].data["RecordA0"].nparray, numpy.arange(5.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
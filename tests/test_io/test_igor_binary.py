@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for Igor binary wave and packed experiment file writer.
+
+Files are read back with the igor2 library.
+
+Part of pyNeuroMatic.
+"""
+import shutil
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy
+
+from pyneuromatic.core.nm_folder import NMFolder
+from pyneuromatic.io.igor_binary import write_ibw, write_pxp
+
+try:
+    from igor2 import binarywave
+    HAS_IGOR2 = True
+except ImportError:
+    HAS_IGOR2 = False
+
+
+@unittest.skipUnless(HAS_IGOR2, "igor2 not installed")
+class TestWriteIbw(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.folder = NMFolder(name="folder0")
+        self.a0 = numpy.array([0.1, -2.5e-7, 1e16, numpy.nan, 1 / 3])
+        self.d0 = self.folder.data.new(
+            "RecordA0", nparray=self.a0,
+            xscale={"start": 2.0, "delta": 0.1, "units": "ms"},
+            yscale={"label": "Vm", "units": "mV"}, quiet=True,
+        )
+        self.d0.notes.add("note0")
+        self.folder.data.new(
+            "RecordA1", nparray=numpy.arange(4, dtype=numpy.int16),
+            yscale={"units": "volts"}, quiet=True,
+        )
+        self.folder.data.new(
+            "Names", nparray=numpy.array(["E0", "Epoch1"], dtype=object),
+            quiet=True,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_write(self):
+        filepath = write_ibw(self.d0, self.tmpdir / "RecordA0.ibw")
+        wave = binarywave.load(filepath)["wave"]
+        header = wave["wave_header"]
+        self.assertEqual(header["bname"], b"RecordA0")
+        self.assertEqual(header["npnts"], 5)
+        self.assertEqual(header["sfA"][0], 0.1)
+        self.assertEqual(header["sfB"][0], 2.0)
+        self.assertEqual(b"".join(header["dataUnits"]), b"mV")
+        self.assertEqual(b"".join(header["dimUnits"][0]), b"ms")
+        self.assertEqual(wave["note"], b"note0")
+        self.assertEqual(wave["wData"].dtype, numpy.float64)
+        numpy.testing.assert_array_equal(wave["wData"], self.a0)
+
+    def test_checksum(self):
+        filepath = write_ibw(self.d0, self.tmpdir / "RecordA0.ibw")
+        header = filepath.read_bytes()[:384]
+        self.assertEqual(sum(struct.unpack("<192h", header)) & 0xFFFF, 0)
+
+    def test_dtypes(self):
+        filepath = write_ibw(self.folder.data["RecordA1"],
+                             self.tmpdir / "RecordA1.ibw")
+        wave = binarywave.load(filepath)["wave"]
+        self.assertEqual(wave["wData"].dtype, numpy.int16)
+        numpy.testing.assert_array_equal(wave["wData"], numpy.arange(4))
+        self.assertEqual(wave["data_units"], b"volts")  # extended units
+        self.folder.data["RecordA1"].nparray = numpy.arange(4)  # int64
+        wave = binarywave.load(write_ibw(self.folder.data["RecordA1"],
+                                         filepath))["wave"]
+        self.assertEqual(wave["wData"].dtype, numpy.float64)
+        numpy.testing.assert_array_equal(wave["wData"], numpy.arange(4))
+
+    def test_text(self):
+        filepath = write_ibw(self.folder.data["Names"],
+                             self.tmpdir / "Names.ibw")
+        wave = binarywave.load(filepath)["wave"]
+        self.assertEqual(list(wave["wData"]), [b"E0", b"Epoch1"])
+
+    def test_errors(self):
+        self.folder.data.new("RecordA2", quiet=True)
+        with self.assertRaises(ValueError):
+            write_ibw(self.folder.data["RecordA2"], self.tmpdir / "a.ibw")
+        d = self.folder.data.new("R" * 32, nparray=self.a0, quiet=True)
+        with self.assertRaises(ValueError):
+            write_ibw(d, self.tmpdir / "a.ibw")
+
+
+@unittest.skipUnless(HAS_IGOR2, "igor2 not installed")
+class TestWritePxp(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.folder = NMFolder(name="folder0")
+        for i in range(3):
+            self.folder.data.new(
+                "RecordA%d" % i, nparray=numpy.arange(5.0) * i,
+                xscale={"start": 1.0, "delta": 0.5}, quiet=True,
+            )
+        self.folder.data.new("Empty", quiet=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_write(self):
+        from igor2 import packed
+
+        filepath = write_pxp(self.folder, self.tmpdir / "f.pxp")
+        records, filesystem = packed.load(filepath)
+        self.assertEqual(len(records), 3)  # Empty has no data
+        self.assertEqual(sorted(filesystem["root"]),
+                         [b"RecordA0", b"RecordA1", b"RecordA2"])
+
+    def test_read_pxp(self):
+        from pyneuromatic.io.pxp import read_pxp
+
+        filepath = write_pxp(self.folder, self.tmpdir / "f.pxp")
+        folder = read_pxp(filepath, prefix="Record")
+        self.assertEqual(list(folder.data), ["RecordA0", "RecordA1",
+                                             "RecordA2"])
+        d = folder.data["RecordA2"]
+        numpy.testing.assert_array_equal(d.nparray, numpy.arange(5.0) * 2)
+        self.assertEqual(d.xscale.start, 1.0)
+        self.assertEqual(d.xscale.delta, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
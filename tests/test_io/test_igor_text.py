@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for Igor Text file writer.
+
+Part of pyNeuroMatic.
+"""
+import gzip
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy
+
+from pyneuromatic.core.nm_folder import NMFolder
+from pyneuromatic.io.igor_text import write_itx
+
+
+def _read_waves(text: str) -> dict:
+    """Parse WAVES blocks of an Igor Text file into {name: values}."""
+    waves = {}
+    lines = iter(text.splitlines())
+    for line in lines:
+        if not line.startswith("WAVES"):
+            continue
+        names = line.split("\t")[1:]
+        assert next(lines) == "BEGIN"
+        rows = []
+        for row in lines:
+            if row == "END":
+                break
+            rows.append(row.split("\t")[1:])
+        for i, name in enumerate(names):
+            waves[name] = [r[i] for r in rows]
+    return waves
+
+
+class TestWriteItx(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.folder = NMFolder(name="folder0")
+        self.a0 = numpy.array([0.1, -2.5e-7, 1e16, numpy.nan, 1 / 3])
+        self.folder.data.new(
+            "RecordA0", nparray=self.a0,
+            xscale={"start": 0.0, "delta": 0.1, "units": "ms"},
+            yscale={"label": "Vm", "units": "mV"}, quiet=True,
+        )
+        self.folder.data.new("RecordA1", nparray=self.a0 * 2, quiet=True)
+        self.folder.data.new("Count", nparray=numpy.arange(3), quiet=True)
+        self.folder.data.new(
+            "Names", nparray=numpy.array(["E0", "E1"], dtype=object),
+            quiet=True,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_write(self):
+        filepath = write_itx(self.folder, self.tmpdir / "f.itx")
+        text = filepath.read_text()
+        self.assertTrue(text.startswith("IGOR\nWAVES/D\tRecordA0\nBEGIN\n"))
+        self.assertIn('X SetScale/P x, 0.0, 0.1, "ms", RecordA0\n', text)
+        self.assertIn('X SetScale d, 0, 0, "mV", RecordA0\n', text)
+        waves = _read_waves(text)
+        self.assertEqual(list(waves), ["RecordA0", "RecordA1", "Count",
+                                       "Names"])
+        values = numpy.array(waves["RecordA0"], dtype=float)
+        numpy.testing.assert_array_equal(values, self.a0)  # exact
+        self.assertEqual(waves["Count"], ["0", "1", "2"])
+        self.assertEqual(waves["Names"], ["E0", "E1"])
+
+    def test_float32_precision(self):
+        a = numpy.array([0.1, 1 / 3], dtype=numpy.float32)
+        self.folder.data["RecordA1"].nparray = a
+        filepath = write_itx(self.folder, self.tmpdir / "f.itx")
+        waves = _read_waves(filepath.read_text())
+        values = numpy.array(waves["RecordA1"], dtype=numpy.float32)
+        numpy.testing.assert_array_equal(values, a)
+        filepath = write_itx(self.folder, self.tmpdir / "f.itx", precision=3)
+        waves = _read_waves(filepath.read_text())
+        self.assertEqual(waves["RecordA0"][0], "0.1")
+        self.assertEqual(waves["RecordA0"][4], "0.333")
+        with self.assertRaises(TypeError):
+            write_itx(self.folder, filepath, precision=3.0)
+        with self.assertRaises(ValueError):
+            write_itx(self.folder, filepath, precision=0)
+
+    def test_multicolumn(self):
+        filepath = write_itx(self.folder, self.tmpdir / "f.itx",
+                             multicolumn=True)
+        text = filepath.read_text()
+        self.assertIn("WAVES/D\tRecordA0\tRecordA1\nBEGIN\n", text)
+        self.assertIn("WAVES/D\tCount\n", text)
+        self.assertEqual(_read_waves(text),
+                         _read_waves(write_itx(
+                             self.folder, self.tmpdir / "g.itx"
+                         ).read_text()))
+
+    def test_block_size(self):
+        import pyneuromatic.io.igor_text as igor_text
+
+        a = numpy.arange(10.0)
+        self.folder.data["RecordA0"].nparray = a
+        self.folder.data["RecordA1"].nparray = -a
+        size = igor_text._BLOCK_SIZE
+        igor_text._BLOCK_SIZE = 3
+        try:
+            filepath = write_itx(self.folder, self.tmpdir / "f.itx",
+                                 multicolumn=True)
+        finally:
+            igor_text._BLOCK_SIZE = size
+        waves = _read_waves(filepath.read_text())
+        numpy.testing.assert_array_equal(
+            numpy.array(waves["RecordA1"], dtype=float), -a)
+
+    def test_gzip(self):
+        plain = write_itx(self.folder, self.tmpdir / "f.itx").read_text()
+        filepath = write_itx(self.folder, self.tmpdir / "f.itx.gz")
+        with gzip.open(filepath, "rt") as f:
+            self.assertEqual(f.read(), plain)
+        filepath = write_itx(self.folder, self.tmpdir / "g.itx",
+                             compress=True)
+        with gzip.open(filepath, "rt") as f:
+            self.assertEqual(f.read(), plain)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
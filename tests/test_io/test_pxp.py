@@ -5,8 +5,11 @@ Tests for PXP file reader.
 
 Part of pyNeuroMatic.
 """
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from pyneuromatic.core.nm_folder import NMFolder
 
@@ -64,6 +67,18 @@ class TestReadPxpFile(unittest.TestCase):
             self.folder.data["RecordA0"].xscale.start, 0.0, places=4
         )
 
+    def test_x_scale_matches_igor(self):
+        # Igor's WaveStats of the same waves (fixture): minLoc is the
+        # x-value of row minRowLoc, x = start + row * delta
+        stats = FIXTURES_DIR / "NM_WaveStats_nm02Jul04c0_002.txt"
+        lines = stats.read_text().splitlines()
+        header = lines[0].split("\t")
+        for line in lines[1:]:
+            row = dict(zip(header, line.split("\t")))
+            d = self.folder.data[row["W_name"]]
+            x = d.xscale.start + int(row["W_minRowLoc"]) * d.xscale.delta
+            self.assertAlmostEqual(x, float(row["W_minLoc"]), places=3)
+
     def test_x_units(self):
         self.assertEqual(self.folder.data["RecordA0"].xscale.units, "ms")
 
@@ -163,5 +178,88 @@ class TestReadPxpOptions(unittest.TestCase):
         self.assertEqual(len(folder.data), 38)
 
 
+class TestReadPxpSelective(unittest.TestCase):
+    """Tests for selective reading, with a PXP file from write_pxp."""
+
+    def setUp(self):
+        import numpy
+        from pyneuromatic.io.igor_binary import write_pxp
+
+        self.tmpdir = Path(tempfile.mkdtemp())
+        folder = NMFolder(name="folder0")
+        for ep in range(3):
+            for ch in "AB":
+                folder.data.new(
+                    "Record%s%d" % (ch, ep),
+                    nparray=numpy.arange(4.0) + ep,
+                    xscale={"start": 0.0, "delta": 0.02}, quiet=True,
+                )
+            folder.data.new("ST_RecordA%d" % ep, nparray=numpy.zeros(9),
+                            quiet=True)
+        folder.data.new("WaveA0", nparray=numpy.ones(4), quiet=True)
+        folder.data.new(
+            "yLabel", nparray=numpy.array(["Vm (mV)", "Im (pA)"],
+                                          dtype=object), quiet=True,
+        )
+        self.filepath = write_pxp(folder, self.tmpdir / "f.pxp")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_decodes_matching_waves_only(self):
+        import pyneuromatic.io.pxp as pxp
+
+        with mock.patch.object(pxp, "_load_wave",
+                               wraps=pxp._load_wave) as load:
+            folder = pxp.read_pxp(self.filepath)
+        # 6 Record waves + yLabel
+        self.assertEqual(load.call_count, 7)
+        self.assertEqual(list(folder.data), [
+            "RecordA0", "RecordB0", "RecordA1", "RecordB1", "RecordA2",
+            "RecordB2",
+        ])
+        d = folder.data["RecordB2"]
+        self.assertEqual(list(d.nparray), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(d.xscale.delta, 0.02)
+        self.assertEqual(d.yscale.label, "Im")
+        self.assertEqual(d.yscale.units, "pA")
+        self.assertIn("Record", folder.dataseries)
+
+    def test_channels(self):
+        import pyneuromatic.io.pxp as pxp
+
+        with mock.patch.object(pxp, "_load_wave",
+                               wraps=pxp._load_wave) as load:
+            folder = pxp.read_pxp(self.filepath, channels=["B"])
+        self.assertEqual(load.call_count, 4)
+        self.assertEqual(list(folder.data), ["RecordB0", "RecordB1",
+                                             "RecordB2"])
+        self.assertEqual(folder.data["RecordB0"].yscale.units, "pA")
+        folder = pxp.read_pxp(self.filepath, prefix="Wave")
+        self.assertEqual(list(folder.data), ["WaveA0"])
+
+    def test_version5_x_scale(self):
+        import numpy
+        from pyneuromatic.io.igor_binary import write_pxp
+        from pyneuromatic.io.pxp import read_pxp
+
+        # write_pxp writes version 5 waves, whose x-scale is sfA/sfB
+        folder = NMFolder(name="folder1")
+        folder.data.new("RecordA0", nparray=numpy.zeros(4),
+                        xscale={"start": 5.0, "delta": 0.25}, quiet=True)
+        filepath = write_pxp(folder, self.tmpdir / "v5.pxp")
+        d = read_pxp(filepath).data["RecordA0"]
+        self.assertEqual(d.xscale.start, 5.0)
+        self.assertEqual(d.xscale.delta, 0.25)
+
+    def test_wave_name(self):
+        from pyneuromatic.io.pxp import _wave_name
+
+        b = self.filepath.read_bytes()[8:8 + 124]
+        self.assertEqual(_wave_name(b), "RecordA0")
+        self.assertEqual(_wave_name(b""), "")
+        self.assertEqual(_wave_name(b"\x04\x00" + bytes(122)), "")
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
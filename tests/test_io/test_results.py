@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for columnar export of tool results.
+
+Part of pyNeuroMatic.
+"""
+import csv
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy
+
+from pyneuromatic.core.nm_folder import NMFolder
+from pyneuromatic.io.results import (
+    RESULTS_LEVELS, results_table, toolfolder_table, toolresults_table,
+    write_table,
+)
+from pyneuromatic.tools.nm_tool_folder import NMToolFolder
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def _stats_row(i, func="mean"):
+    return {
+        "data": "folder0.RecordA%d" % i, "func": {"name": func},
+        "i0": 0, "i1": 99, "id": "main", "n": numpy.int64(100),
+        "s": numpy.float64(i), "sunits": "mV", "win": "w0",
+        "xbgn": -numpy.inf, "xend": numpy.inf,
+    }
+
+
+class TestResultsTable(unittest.TestCase):
+
+    def test_stats(self):
+        results = {
+            "w0": [[_stats_row(i)] for i in range(3)],
+            "w1": [[_stats_row(0, "max"),
+                    dict(_stats_row(0, "min"), id="bsln", x=1.5)]],
+        }
+        t = results_table(results, RESULTS_LEVELS["stats"])
+        self.assertEqual(list(t)[:3], ["window", "run", "row"])
+        self.assertEqual(t["window"].tolist(), ["w0"] * 3 + ["w1"] * 2)
+        self.assertEqual(t["run"].tolist(), [0, 1, 2, 0, 0])
+        self.assertEqual(t["row"].tolist(), [0, 0, 0, 0, 1])
+        self.assertEqual(t["func"].tolist(),
+                         ["mean", "mean", "mean", "max", "min"])
+        self.assertEqual(t["n"].dtype, numpy.int64)
+        self.assertEqual(t["s"].tolist(), [0.0, 1.0, 2.0, 0.0, 0.0])
+        self.assertEqual(t["xbgn"].tolist(), [-numpy.inf] * 5)
+        # missing values
+        self.assertEqual(t["x"].dtype, numpy.float64)
+        self.assertTrue(numpy.isnan(t["x"][:4]).all())
+        self.assertEqual(t["x"][4], 1.5)
+        self.assertEqual(t["id"].tolist()[3:], ["main", "bsln"])
+
+    def test_nested_dict(self):
+        t = results_table([{"func": {"name": "level", "ylevel": -20}}])
+        self.assertEqual(t["level0"].tolist(), [0])
+        self.assertEqual(t["func"].tolist(), ["level"])
+        self.assertEqual(t["func.ylevel"].tolist(), [-20])
+
+    def test_spike(self):
+        results = {"E0": numpy.array([1.0, 2.0]), "E1": [3.0],
+                   "E2": numpy.array([])}
+        t = results_table(results, RESULTS_LEVELS["spike"])
+        self.assertEqual(list(t), ["epoch", "index", "value"])
+        self.assertEqual(t["epoch"].tolist(), ["E0", "E0", "E1"])
+        self.assertEqual(t["index"].tolist(), [0, 1, 0])
+        self.assertEqual(t["value"].tolist(), [1.0, 2.0, 3.0])
+
+    def test_event(self):
+        results = {
+            "E%d" % i: {
+                "detect": numpy.array([1.0, 5.0]),
+                "onset": numpy.array([0.9, 4.9]),
+                "peak": numpy.array([1.2, 5.2]),
+                "reject": numpy.array([9.0]),
+            }
+            for i in range(2)
+        }
+        t = results_table(results, RESULTS_LEVELS["event"])
+        events = t["level1"] == ""
+        self.assertEqual(t["epoch"][events].tolist(),
+                         ["E0", "E0", "E1", "E1"])
+        self.assertEqual(t["index"][events].tolist(), [0, 1, 0, 1])
+        self.assertEqual(t["onset"][events].tolist(), [0.9, 4.9] * 2)
+        self.assertEqual(t["level1"][~events].tolist(), ["reject"] * 2)
+        self.assertEqual(t["value"][~events].tolist(), [9.0, 9.0])
+
+    def test_empty(self):
+        self.assertEqual(results_table({}), {})
+        self.assertEqual(results_table([]), {})
+        with self.assertRaises(TypeError):
+            results_table({}, levels="epoch")
+
+    def test_toolresults_table(self):
+        folder = NMFolder(name="folder0")
+        folder.toolresults_save("spike", {"E0": numpy.array([1.0])},
+                                quiet=True)
+        folder.toolresults_save("spike", {"E1": numpy.array([2.0])},
+                                quiet=True)
+        t = toolresults_table(folder, "spike")
+        self.assertEqual(t["epoch"].tolist(), ["E1"])
+        t = toolresults_table(folder, "spike", index=0)
+        self.assertEqual(t["epoch"].tolist(), ["E0"])
+        with self.assertRaises(KeyError):
+            toolresults_table(folder, "stats")
+
+
+class TestToolFolderTable(unittest.TestCase):
+
+    def test_toolfolder_table(self):
+        tf = NMToolFolder(name="Stats0")
+        tf.data.new("ST_w0_data", nparray=numpy.array(["a", "b"],
+                                                      dtype=object))
+        tf.data.new("ST_w0_s", nparray=numpy.array([1.0, 2.0]))
+        tf.data.new("ST_w0_n", nparray=numpy.array([3]))
+        with self.assertRaises(ValueError):
+            toolfolder_table(tf)
+        t = toolfolder_table(tf, names=["ST_w0_data", "ST_w0_s"])
+        self.assertEqual(list(t), ["ST_w0_data", "ST_w0_s"])
+        self.assertEqual(t["ST_w0_data"].tolist(), ["a", "b"])
+        with self.assertRaises(KeyError):
+            toolfolder_table(tf, names=["ST_w1_s"])
+
+
+class TestWriteTable(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        results = {"w0": [[_stats_row(i)] for i in range(3)]}
+        self.table = results_table(results, RESULTS_LEVELS["stats"])
+        self.table["data"][1] = 'a,"b"'  # needs quoting
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_npz(self):
+        path = write_table(self.table, self.tmpdir / "stats.npz")
+        with numpy.load(path) as npz:
+            self.assertEqual(list(npz.files), list(self.table))
+            for k, a in self.table.items():
+                numpy.testing.assert_array_equal(npz[k], a)
+        path = write_table(self.table, self.tmpdir / "stats", fmt="npz")
+        self.assertEqual(path.name, "stats.npz")
+
+    def test_csv(self):
+        path = write_table(self.table, self.tmpdir / "stats.csv")
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], list(self.table))
+        self.assertEqual(len(rows), 4)
+        for i, row in enumerate(rows[1:]):
+            for k, v in zip(rows[0], row):
+                a = self.table[k]
+                if a.dtype.kind == "f":
+                    self.assertEqual(float(v), a[i])
+                elif a.dtype.kind == "i":
+                    self.assertEqual(int(v), a[i])
+                else:
+                    self.assertEqual(v, a[i])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            write_table(self.table, self.tmpdir / "stats.txt")
+        with self.assertRaises(TypeError):
+            write_table(self.table, self.tmpdir / "stats.csv", fmt=1)
+        with self.assertRaises(ValueError):
+            write_table({"a": numpy.zeros(2), "b": numpy.zeros(3)},
+                        self.tmpdir / "t.csv")
+
+    @unittest.skipIf(HAS_PYARROW, "pyarrow is installed")
+    def test_parquet_missing(self):
+        with self.assertRaises(ImportError):
+            write_table(self.table, self.tmpdir / "stats.parquet")
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_parquet(self):
+        import pyarrow.parquet
+
+        path = write_table(self.table, self.tmpdir / "stats.parquet")
+        t = pyarrow.parquet.read_table(path)
+        self.assertEqual(t.column_names, list(self.table))
+        self.assertEqual(t.num_rows, 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
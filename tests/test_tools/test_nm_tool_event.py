@@ -540,6 +540,99 @@ class TestNMToolEventDetectionTemplate(unittest.TestCase):
         self.assertAlmostEqual(detected_ms, event_ms, delta=2.0)
 
 
+# ---------------------------------------------------------------------------
+# Detection: template bank
+# ---------------------------------------------------------------------------
+
+
+class TestNMToolEventTemplateBank(unittest.TestCase):
+    """A template bank assigns each event its best-matching template."""
+
+    def setUp(self):
+        self.tool = NMToolEvent()
+        self.tool.algorithm = "template"
+        self.tool.polarity = "negative"
+        self.tool.onset_search = False
+        self.tool.peak_search = False
+        self.tool.refractory = 20e-3
+        t_tpl = np.arange(200) * _DELTA
+        # fast (1 ms decay) and slow (8 ms decay) EPSC shapes
+        self.tool.templates = [np.exp(-t_tpl / 1e-3), np.exp(-t_tpl / 8e-3)]
+        # slow event at 30 ms, fast event at 70 ms
+        self.data = _make_epsc_data(
+            event_times_ms=[70.0], amplitude=-500.0, decay_ms=1.0,
+            noise_std=5.0,
+        )
+        slow = _make_epsc_data(event_times_ms=[30.0], amplitude=-500.0,
+                               decay_ms=8.0)
+        self.data.nparray = self.data.nparray + slow.nparray
+
+    def test_templates_default(self):
+        self.assertIsNone(NMToolEvent().templates)
+
+    def test_templates_rejects_invalid(self):
+        with self.assertRaises(TypeError):
+            self.tool.templates = np.zeros((2, 10))
+        with self.assertRaises(TypeError):
+            self.tool.templates = [[1.0, 2.0, 3.0]]
+        with self.assertRaises(ValueError):
+            self.tool.templates = [np.zeros((2, 2))]
+        with self.assertRaises(ValueError):
+            self.tool.templates = []
+        self.tool.templates = None
+        self.assertIsNone(self.tool.templates)
+
+    def test_events_assigned_best_template(self):
+        folder = _run(self.tool, [self.data])
+        tf = list(folder.toolfolders.values())[0]
+        ev = tf.data.get("EV_recordA0").nparray
+        self.assertEqual(len(ev), 2)
+        np.testing.assert_allclose(ev * 1000.0, [30.0, 70.0], atol=2.0)
+        np.testing.assert_array_equal(
+            tf.data.get("EV_template_recordA0").nparray, [1.0, 0.0])
+        for k in range(2):
+            tpl = tf.data.get("EV_template%d" % k).nparray
+            self.assertAlmostEqual(float(tpl.max()), 1.0)
+        self.assertIsNone(tf.data.get("EV_template"))
+        crit = tf.data.get("EV_Match_recordA0").nparray
+        self.assertEqual(crit.shape, self.data.nparray.shape)
+        cached = folder.toolresults["event"][0]["results"]["recordA0"]
+        self.assertEqual(cached["template"], [1, 0])
+
+    def test_criterion_cache_templates_changed_in_place(self):
+        crit = self.tool._get_match_criterion(self.data)
+        self.assertEqual(crit.shape[0], 2)
+        self.tool.templates.append(self.tool.templates[0] * 0.5)
+        crit = self.tool._get_match_criterion(self.data)
+        self.assertEqual(crit.shape[0], 3)
+        self.tool.templates[0] = self.tool.templates[1]
+        np.testing.assert_allclose(
+            self.tool._get_match_criterion(self.data)[0], crit[1])
+
+    def test_bank_of_one_matches_single_template(self):
+        tpl = self.tool.templates[1]
+        single = NMToolEvent()
+        for name in ("algorithm", "polarity", "onset_search", "peak_search",
+                     "refractory"):
+            setattr(single, name, getattr(self.tool, name))
+        single.template = tpl
+        self.tool.templates = [tpl]
+        folder = _run(self.tool, [self.data])
+        folder1 = _run(single, [self.data])
+        tf = list(folder.toolfolders.values())[0]
+        tf1 = list(folder1.toolfolders.values())[0]
+        np.testing.assert_allclose(tf.data.get("EV_recordA0").nparray,
+                                   tf1.data.get("EV_recordA0").nparray)
+        np.testing.assert_allclose(tf.data.get("EV_Match_recordA0").nparray,
+                                   tf1.data.get("EV_Match_recordA0").nparray,
+                                   rtol=1e-10, atol=1e-10)
+
+    def test_find_next_event(self):
+        res = self.tool.find_next_event(self.data, 50e-3)
+        self.assertTrue(res["accepted"])
+        self.assertEqual(res["template_index"], 0)
+
+
 # ---------------------------------------------------------------------------
 # Onset and peak search
 # ---------------------------------------------------------------------------
@@ -18,6 +18,7 @@ from pyneuromatic.tools.nm_main_op import (
     NMMainOp,
     NMMainOpAccumulate,
     _epochs_repr,
+    _stack_rows,
     NMMainOpArithmetic,
     NMMainOpArithmeticByArray,
     NMMainOpAverage,
@@ -128,6 +129,54 @@ class TestEpochsRepr(unittest.TestCase):
         self.assertEqual(_epochs_repr([1, 2, 3]), "list(range(1, 4))")
 
 
+# ===========================================================================
+# TestStackRows
+# ===========================================================================
+
+class TestStackRows(unittest.TestCase):
+    def setUp(self):
+        self.m = np.arange(20, dtype=float).reshape(4, 5)
+
+    def test_matrix_rows_no_copy(self):
+        stack = _stack_rows([self.m[1], self.m[2], self.m[3]], 5)
+        self.assertTrue(np.shares_memory(stack, self.m))
+        np.testing.assert_array_equal(stack, self.m[1:])
+
+    def test_matrix_rows_truncated(self):
+        stack = _stack_rows([self.m[0], self.m[1]], 3)
+        self.assertTrue(np.shares_memory(stack, self.m))
+        np.testing.assert_array_equal(stack, self.m[:2, :3])
+
+    def test_evenly_spaced_rows_no_copy(self):
+        stack = _stack_rows([self.m[0], self.m[2]], 5)
+        self.assertTrue(np.shares_memory(stack, self.m))
+        np.testing.assert_array_equal(stack, self.m[[0, 2]])
+
+    def test_unevenly_spaced_rows_copied(self):
+        stack = _stack_rows([self.m[0], self.m[2], self.m[3]], 5)
+        self.assertFalse(np.shares_memory(stack, self.m))
+        np.testing.assert_array_equal(stack, self.m[[0, 2, 3]])
+
+    def test_separate_arrays(self):
+        stack = _stack_rows([np.ones(4), np.zeros(3)], 3)
+        np.testing.assert_array_equal(stack, [[1, 1, 1], [0, 0, 0]])
+
+    def test_average_channel_matrix(self):
+        folder = NMFolder(name="folder0")
+        matches = {}
+        for ep, v in enumerate([2.0, 4.0, 6.0]):
+            d = folder.data.new("RecordA%d" % ep, nparray=np.full(3, v))
+            matches[("A", ep)] = d
+        folder.build_dataseries("Record", matches)
+        m = folder.dataseries["Record"].channels["A"].matrix_build()
+        op = NMMainOpAverage()
+        op.run_all([(folder.data["RecordA%d" % ep], "A") for ep in range(3)],
+                   folder)
+        out = folder.data.get("Avg_RecordA")
+        np.testing.assert_array_almost_equal(out.nparray, [4.0, 4.0, 4.0])
+        self.assertFalse(np.shares_memory(out.nparray, m))
+
+
 # ===========================================================================
 # TestNMMainOpAverage
 # ===========================================================================
@@ -83,6 +83,9 @@ class TestNMToolSpikeDefaults(unittest.TestCase):
     def test_func_name_default(self):
         self.assertEqual(self.tool.func_name, "level+")
 
+    def test_refractory_default(self):
+        self.assertEqual(self.tool.refractory, 0.0)
+
     def test_ignore_nans_default(self):
         self.assertTrue(self.tool.ignore_nans)
 
@@ -136,6 +139,19 @@ class TestNMToolSpikeProperties(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.tool.func_name = 1
 
+    # refractory
+    def test_refractory_accepts_int(self):
+        self.tool.refractory = 2
+        self.assertEqual(self.tool.refractory, 2.0)
+
+    def test_refractory_rejects_bool(self):
+        with self.assertRaises(TypeError):
+            self.tool.refractory = True
+
+    def test_refractory_rejects_negative(self):
+        with self.assertRaises(ValueError):
+            self.tool.refractory = -1.0
+
 class TestNMToolSpikeDetection(unittest.TestCase):
     """run_all detection behaviour."""
 
@@ -167,6 +183,15 @@ class TestNMToolSpikeDetection(unittest.TestCase):
         count_arr = f.data.get("SP_count")
         self.assertEqual(int(count_arr.nparray[0]), 2*_CYCLES)
 
+    def test_refractory_suppresses_crossings(self):
+        # rising and falling crossings alternate every 2.5 ms; a 4 ms
+        # refractory period keeps every other one
+        self.tool.func_name = "level"
+        self.tool.refractory = 0.004
+        folder = _run(self.tool, [_sine_data()])
+        f = folder.toolfolders.get("Spike_0")
+        self.assertEqual(int(f.data.get("SP_count").nparray[0]), _CYCLES)
+
     def test_xbgn_xend_window_restricts_detection(self):
         # 200 Hz sine → 20 rising crossings over 0.1 s (1000 samples at 10 kHz).
         # Window [0.002, 0.048] avoids boundary ambiguity (crossings fall exactly